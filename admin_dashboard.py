@@ -1,17 +1,29 @@
 import streamlit as st
 import streamlit as st
 import os
-import pdfplumber
-import docx
-import openpyxl
 import json
 import tempfile
-from groq import Groq
+import time
 import traceback
 import re 
 from dotenv import load_dotenv 
-from datetime import date 
+from datetime import date, timedelta
 from streamlit.runtime.uploaded_file_manager import UploadedFile
+from resume_ingestion import ingest_zip_archive, content_hash, DEFAULT_MAX_WORKERS
+from data_store import get_repository, resume_row_fields, ADMIN_OWNER
+from search_index import get_search_index
+from rerun_timing import timed_fragment, rerun_panel
+from blob_store import offload_fields, load_field, has_field
+from report_view import match_report_list
+import document_extraction
+from document_extraction import get_client, get_file_type, extract_content, parse_resume_bytes
+from session_memory import enforce_session_cap, list_heaviest_sessions, format_bytes, SESSION_STATE_CAP_BYTES
+
+VENDOR_STATUSES = ["Pending Review", "Approved", "Rejected"]
+
+# Large fields kept in the blob store; session state and the store only hold references
+RESUME_BLOB_FIELDS = ('full_text', 'parsed')
+MATCH_RESULT_BLOB_FIELDS = ('full_analysis',)
 
 # -------------------------
 # CONFIGURATION & API SETUP (Necessary for standalone functions)
@@ -22,154 +34,22 @@ GROQ_MODEL = "llama-3.1-8b-instant"
 load_dotenv()
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 
-# Initialize Groq Client or Mock Client (Must be present for function definitions)
-if not GROQ_API_KEY:
-    class MockGroqClient:
-        def chat(self):
-            class Completions:
-                def create(self, **kwargs):
-                    raise ValueError("GROQ_API_KEY not set. AI functions disabled.")
-            return Completions()
-    client = MockGroqClient()
-else:
-    client = Groq(api_key=GROQ_API_KEY)
-
 # --- Utility Functions (Only necessary ones for Admin) ---
 
 def go_to(page_name):
     """Changes the current page in Streamlit's session state."""
     st.session_state.page = page_name
 
-def get_file_type(file_path):
-    """Identifies the file type based on its extension."""
-    ext = os.path.splitext(file_path)[1].lower().strip('.')
-    if ext == 'pdf': return 'pdf'
-    elif ext == 'docx': return 'docx'
-    elif ext == 'xlsx': return 'xlsx'
-    else: return 'txt' 
-
-def extract_content(file_type, file_path):
-    """Extracts text content from various file types (Simplified for admin context)."""
-    text = ''
-    try:
-        if file_type == 'pdf':
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + '\n'
-        elif file_type == 'docx':
-            doc = docx.Document(file_path)
-            text = '\n'.join([para.text for para in doc.paragraphs])
-        elif file_type == 'xlsx':
-            workbook = openpyxl.load_workbook(file_path)
-            # Simplified XLSX reading for content
-            for sheet in workbook.sheetnames:
-                ws = workbook[sheet]
-                for row in ws.iter_rows(values_only=True):
-                    row_text = ' | '.join([str(c) for c in row if c is not None])
-                    if row_text.strip():
-                        text += row_text + '\n'
-        else:
-             with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-
-        if not text.strip():
-            return f"Error: {file_type.upper()} content extraction failed."
-        
-        return text
-    
-    except Exception as e:
-        return f"Fatal Extraction Error: Failed to read file content ({file_type}). Error: {e}"
-
-
 @st.cache_data(show_spinner="Extracting JD metadata...")
 def extract_jd_metadata(jd_text):
     """Extracts structured metadata (Role, Job Type, Key Skills) from raw JD text."""
-    if not GROQ_API_KEY:
-        return {"role": "N/A", "job_type": "N/A", "key_skills": []}
-
-    prompt = f"""Analyze the following Job Description and extract the key metadata.
-    
-    Job Description:
-    {jd_text}
-    
-    Provide the output strictly as a JSON object with the following three keys:
-    1.  **role**: The main job title (e.g., 'Data Scientist', 'Senior Software Engineer'). If not clear, default to 'General Analyst'.
-    2.  **job_type**: The employment type (e.g., 'Full-time', 'Contract', 'Internship', 'Remote'). If not clear, default to 'Full-time'.
-    3.  **key_skills**: A list of 5 to 10 most critical hard and soft skills required (e.g., ['Python', 'AWS', 'Teamwork', 'SQL']).
-    
-    Example Output: {{"role": "Software Engineer", "job_type": "Full-time", "key_skills": ["Python", "JavaScript", "React", "AWS", "Agile"]}}
-    """
-    content = ""
-    try:
-        response = client.chat.completions.create(
-            model=GROQ_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.0
-        )
-        content = response.choices[0].message.content.strip()
-
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0).strip()
-            if json_str.startswith('```json'):
-                json_str = json_str[len('```json'):].strip()
-            if json_str.endswith('```'):
-                json_str = json_str[:-len('```')].strip()
-            
-            parsed = json.loads(json_str)
-        else:
-            raise json.JSONDecodeError("Could not isolate a valid JSON structure from LLM response.", content, 0)
-        
-        return {
-            "role": parsed.get("role", "General Analyst"),
-            "job_type": parsed.get("job_type", "Full-time"),
-            "key_skills": [s.strip() for s in parsed.get("key_skills", []) if isinstance(s, str)]
-        }
-
-    except Exception:
-        return {"role": "General Analyst (LLM Error)", "job_type": "Full-time (LLM Error)", "key_skills": ["LLM Error", "Fallback"]}
+    return document_extraction.extract_jd_metadata(jd_text)
 
 
 @st.cache_data(show_spinner="Analyzing content with Groq LLM...")
 def parse_with_llm(text, return_type='json'):
     """Sends resume text to the LLM for structured information extraction (Simplified for admin context)."""
-    if text.startswith("Error") or not GROQ_API_KEY:
-        return {"error": "Parsing error or API key missing.", "raw_output": ""}
-
-    prompt = f"""Extract the following information from the resume in structured JSON.
-    - Name, - Email, - Phone, - Skills, - Education, 
-    - Experience, - Certifications, 
-    - Projects, - Strength, 
-    - Personal Details, - Github, - LinkedIn
-    
-    Also, provide a key called **'summary'** which is a single, brief paragraph (3-4 sentences max) summarizing the candidate's career highlights and most relevant skills.
-    
-    Resume Text: {text}
-    
-    Provide the output strictly as a JSON object.
-    """
-    content = ""
-    parsed = {}
-    try:
-        response = client.chat.completions.create(
-            model=GROQ_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2
-        )
-        content = response.choices[0].message.content.strip()
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0).strip()
-            json_str = json_str.replace('```json', '').replace('```', '').strip()
-            parsed = json.loads(json_str)
-        else:
-            raise json.JSONDecodeError("Could not isolate a valid JSON structure.", content, 0)
-    except Exception as e:
-        parsed = {"error": f"LLM error: {e}", "raw_output": content}
-
-    return parsed
+    return document_extraction.parse_with_llm(text, return_type)
 
 
 def extract_jd_from_linkedin_url(url: str) -> str:
@@ -226,7 +106,7 @@ def evaluate_jd_fit(job_description, parsed_json):
     ...
     """
 
-    response = client.chat.completions.create(
+    response = get_client().chat.completions.create(
         model=GROQ_MODEL, 
         messages=[{"role": "user", "content": prompt}], 
         temperature=0.3
@@ -244,6 +124,12 @@ def parse_and_store_resume(file_input, file_name_key='default', source_type='fil
         if not isinstance(file_input, UploadedFile):
             return {"error": "Invalid file input type passed to parser.", "full_text": ""}
 
+        digest = content_hash(file_input.getbuffer())
+        stored = get_repository().find_resume_by_hash(digest)
+        if stored and has_field(stored, 'parsed'):
+            # Already parsed in an earlier session; skip the LLM call
+            return stored
+
         temp_dir = tempfile.mkdtemp()
         temp_path = os.path.join(temp_dir, file_input.name) 
         with open(temp_path, "wb") as f:
@@ -271,157 +157,317 @@ def parse_and_store_resume(file_input, file_name_key='default', source_type='fil
         "parsed": parsed,
         "full_text": text,
         "excel_data": None, # Removed Excel logic for brevity in this isolated block
-        "name": final_name
+        "name": final_name,
+        "content_hash": digest if source_type == 'file' else content_hash(text)
     }
 
 
-def update_resume_metadata(resume_name, new_status, applied_jd, submitted_date, resume_list_index):
-    """Callback function to update the status and metadata of a specific resume."""
+def loaded_resume_hashes():
+    """
+    Content hashes of the resumes in the admin analysis list, kept in session state next to the list
+    so duplicate checks are set lookups. Rebuilt from the list whenever the key was dropped.
+    """
+    if 'loaded_resume_hashes' not in st.session_state:
+        st.session_state.loaded_resume_hashes = {
+            r['content_hash'] for r in st.session_state.resumes_to_analyze if r.get('content_hash')
+        }
+    return st.session_state.loaded_resume_hashes
+
+
+def add_resume_for_analysis(result, batch=None):
+    """
+    Registers a successfully parsed resume in the admin analysis list with default metadata
+    and persists it (queued on `batch` when given). Returns False if the same file content is already loaded.
+    """
+    digest = result.get('content_hash')
+    seen = loaded_resume_hashes()
+    if digest and digest in seen:
+        return False
+
+    result.setdefault('applied_jd', "N/A (Pending Assignment)")
+    result.setdefault('submitted_date', date.today().strftime("%Y-%m-%d"))
+
+    # Index the full text and build the approval row fields while the parsed JSON is at hand,
+    # then keep only blob references hot
+    get_search_index(get_repository()).add_resume(result)
+    row_fields = resume_row_fields(result)
+    offload_fields(result, RESUME_BLOB_FIELDS)
+
+    st.session_state.resumes_to_analyze.append(result)
+    if digest:
+        seen.add(digest)
+
+    resume_id = result['name']
+    if resume_id not in st.session_state.resume_statuses:
+        st.session_state.resume_statuses[resume_id] = "Pending"
+
+    get_repository().upsert_resume(result, status=st.session_state.resume_statuses[resume_id], batch=batch, row_fields=row_fields)
+    return True
+
+
+def add_admin_jd(jd_item):
+    """Adds a JD to the admin list and persists it."""
+    st.session_state.admin_jd_list.append(jd_item)
+    get_repository().add_jd(ADMIN_OWNER, jd_item)
+
+
+def update_resume_metadata(resume_id, resume_name, new_status, applied_jd, submitted_date):
+    """Callback function to update the status and metadata of a specific resume (resume_id is its document id)."""
     # Update Status
     st.session_state.resume_statuses[resume_name] = new_status
+    get_repository().set_resume_status(resume_id, new_status, applied_jd, submitted_date)
     
     # Update Metadata (Applied JD and Date)
-    if 0 <= resume_list_index < len(st.session_state.resumes_to_analyze):
-        st.session_state.resumes_to_analyze[resume_list_index]['applied_jd'] = applied_jd
-        st.session_state.resumes_to_analyze[resume_list_index]['submitted_date'] = submitted_date
-        st.toast(f"Status for **{resume_name}** updated to **{new_status}**.")
-    else:
-        st.error(f"Error: Could not find resume index {resume_list_index} for metadata update.")
-        
+    for resume_data in st.session_state.resumes_to_analyze:
+        if resume_data['name'] == resume_name:
+            resume_data['applied_jd'] = applied_jd
+            resume_data['submitted_date'] = submitted_date
+    st.toast(f"Status for **{resume_name}** updated to **{new_status}**.")
+
+
+def bulk_update_resume_metadata(rows, new_status, applied_jd=None):
+    """Sets the status (and optionally the applied JD) of several approval rows with a single store write."""
+    selected = {row['name'] for row in rows}
+    for resume_data in st.session_state.resumes_to_analyze:
+        if resume_data['name'] in selected and applied_jd is not None:
+            resume_data['applied_jd'] = applied_jd
+    for name in selected:
+        st.session_state.resume_statuses[name] = new_status
+
+    # Submitted dates are left as stored; only the status (and JD when chosen) change
+    updates = [(row['_id'], new_status, applied_jd, None) for row in rows]
+    get_repository().set_resume_statuses(updates)
+    st.toast(f"Status for **{len(updates)}** candidate(s) updated to **{new_status}**.")
+
 # --- Approval Tab Content Functions (Used within admin_dashboard) ---
 
+@timed_fragment("admin:approval_row")
+def candidate_approval_row(resume_data, idx, jd_options):
+    """One Candidate Approval row; its buttons rerun only this row."""
+    repo = get_repository()
+    resume_id = resume_data['_id']
+    resume_name = resume_data['name']
+    current_status = resume_data.get('status', "Pending")
+    
+    # --- Denormalized row fields (the parsed JSON is not read for listing) ---
+    row_fields = resume_data.get('row', {})
+    candidate_email = row_fields.get('email', 'N/A')
+    candidate_phone = row_fields.get('phone', 'N/A')
+    university_info = row_fields.get('education_head', 'N/A')
+    brief_summary = row_fields.get('summary') or 'AI summary pending or failed during parsing.'
+    
+    # --- Current Metadata (Used for display and form defaults) ---
+    current_applied_jd = resume_data.get('applied_jd', 'N/A (Pending Assignment)')
+    current_submitted_date = resume_data.get('submitted_date', date.today().strftime("%Y-%m-%d"))
+
+    # --- Display and Action Block for Individual Candidate ---
+    with st.container(border=True):
+        st.markdown(f"### **Candidate:** {resume_name} (Status: **{current_status}**)")
+        
+        # Contact Info & Education
+        col_contact, col_education = st.columns(2)
+        with col_contact:
+            st.markdown(f"**📧 Email:** `{candidate_email}`")
+            st.markdown(f"**📱 Phone:** `{candidate_phone}`")
+        with col_education:
+            st.markdown(f"**🎓 Education:** `{university_info}`")
+            st.markdown(f"**Applied JD:** `{current_applied_jd}`")
+            
+        st.markdown("---")
+        st.markdown(f"**Brief Resume Info:** *{brief_summary}*")
+
+        # Heavy fields are only fetched while the row is expanded
+        if st.toggle("Show full resume", key=f"expand_resume_{resume_name}_{idx}"):
+            detail = repo.get_resume_detail(resume_id)
+            st.json(detail.get('parsed', {}), expanded=False)
+            st.text_area("Full Text", detail.get('full_text', ''), height=200, disabled=True, key=f"full_text_{resume_name}_{idx}")
+        st.markdown("---")
+        
+        # NEW: JD Selection and Date Input Block (No generic status selector/updater)
+        col_jd_select, col_date_input = st.columns([1, 1])
+        
+        with col_jd_select:
+            try:
+                default_value = current_applied_jd if current_applied_jd != "N/A (Pending Assignment)" else "Select JD"
+                jd_default_index = jd_options.index(default_value)
+            except ValueError:
+                jd_default_index = 0
+                
+            new_applied_jd = st.selectbox(
+                "Applied for JD Title", 
+                options=jd_options,
+                index=jd_default_index,
+                key=f"jd_select_{resume_name}_{idx}",
+            )
+            
+        with col_date_input:
+            try:
+                date_obj = date.fromisoformat(current_submitted_date)
+            except (ValueError, TypeError):
+                date_obj = date.today()
+                
+            new_submitted_date = st.date_input(
+                "Submitted Date", 
+                value=date_obj,
+                key=f"date_input_{resume_name}_{idx}"
+            )
+        
+        st.markdown("---")
+        
+        # Dedicated Approve/Reject/Pending Buttons for Quick Actions
+        col_quick_approve, col_quick_reject, col_quick_pending, _ = st.columns([1, 1, 1, 5])
+        
+        jd_to_save = new_applied_jd if new_applied_jd != "Select JD" else "N/A (Pending Assignment)"
+        date_to_save = new_submitted_date.strftime("%Y-%m-%d")
+
+        # Function to run status update and RERUN
+        def run_update_and_rerun(status_to_set):
+            update_resume_metadata(
+                resume_id,
+                resume_name, 
+                status_to_set, 
+                jd_to_save, 
+                date_to_save
+            )
+            # Refresh this row in place; only the row's fragment reruns
+            resume_data.update(status=status_to_set, applied_jd=jd_to_save, submitted_date=date_to_save)
+            rerun_panel()
+
+        with col_quick_approve:
+            # Approve button
+            if st.button("✅ Approve", key=f"quick_approve_{resume_name}_{idx}", use_container_width=True):
+                run_update_and_rerun("Approved")
+
+        with col_quick_reject:
+            # Reject button
+            if st.button("❌ Reject", key=f"quick_reject_{resume_name}_{idx}", use_container_width=True):
+                run_update_and_rerun("Rejected")
+
+        with col_quick_pending:
+             # Pending button
+            if st.button("🟡 Pending", key=f"quick_pending_{resume_name}_{idx}", use_container_width=True):
+                run_update_and_rerun("Pending")
+
+
+
 def candidate_approval_tab_content():
     st.header("👤 Candidate Approval")
     st.markdown("### Review and Set Status for Submitted Resumes")
     
-    if "resumes_to_analyze" not in st.session_state or not st.session_state.resumes_to_analyze:
+    repo = get_repository()
+    if repo.count_resumes() == 0:
         st.info("No resumes have been uploaded and parsed in the 'Resume Analysis' tab yet.")
         return
         
     jd_options = [item['name'].replace("--- Simulated JD for: ", "") for item in st.session_state.admin_jd_list]
     jd_options.insert(0, "Select JD") 
 
-    for idx, resume_data in enumerate(st.session_state.resumes_to_analyze):
-        resume_name = resume_data['name']
-        current_status = st.session_state.resume_statuses.get(resume_name, "Pending")
-        
-        # --- Extract details from parsed JSON ---
-        parsed_data = resume_data.get('parsed', {})
-        candidate_email = parsed_data.get('email', 'N/A')
-        candidate_phone = parsed_data.get('phone', 'N/A')
-        
-        # Find highest education/university
-        education_list = parsed_data.get('education', [])
-        university_info = "N/A"
-        if education_list:
-            # Simple heuristic: take the first item, often the highest degree or most recent
-            university_info = education_list[0] 
-            # Trim if too long
-            if len(university_info) > 60:
-                 university_info = university_info[:57] + "..."
-
-        brief_summary = parsed_data.get('summary', 'AI summary pending or failed during parsing.')
-        
-        # --- Current Metadata (Used for display and form defaults) ---
-        current_applied_jd = resume_data.get('applied_jd', 'N/A (Pending Assignment)')
-        current_submitted_date = resume_data.get('submitted_date', date.today().strftime("%Y-%m-%d"))
+    # --- Filter / Sort / Page (evaluated in the store; only one page of rows is fetched) ---
+    col_status_filter, col_jd_filter, col_name_filter, col_sort = st.columns([1, 1, 1, 1])
+    with col_status_filter:
+        status_filter = st.selectbox("Status", ["All", "Pending", "Approved", "Rejected"], key="approval_filter_status_admin")
+    with col_jd_filter:
+        jd_filter = st.selectbox("Applied JD", ["All"] + jd_options[1:] + ["N/A (Pending Assignment)"], key="approval_filter_jd_admin")
+    with col_name_filter:
+        name_filter = st.text_input("Name contains", key="approval_filter_name_admin")
+    with col_sort:
+        sort_choice = st.selectbox("Sort by", list(repo.RESUME_PAGE_SORTS), key="approval_sort_admin")
+
+    col_page_size, col_page, _ = st.columns([1, 1, 2])
+    with col_page_size:
+        page_size = st.selectbox("Rows per page", [10, 20, 50], key="approval_page_size_admin")
+
+    query = {
+        "status": None if status_filter == "All" else status_filter,
+        "applied_jd": None if jd_filter == "All" else jd_filter,
+        "name_query": name_filter.strip() or None,
+    }
+    total_matching = repo.count_resumes(**query)
+    page_count = max(1, -(-total_matching // page_size))
+    with col_page:
+        page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key="approval_page_admin")
+    page_index = min(int(page_number), page_count) - 1
+
+    page_rows = repo.list_resume_page(**query, sort=sort_choice, page=page_index, page_size=page_size)
+    st.caption(f"Showing {len(page_rows)} of {total_matching} matching candidate(s) — page {page_index + 1} of {page_count}.")
+
+    # --- Bulk Status Update (rows of the current page; one store write and one rerun for the selection) ---
+    rows_by_id = {str(row['_id']): row for row in page_rows}
+    with st.expander("⚡ Bulk Status Update"):
+        with st.form("bulk_status_form_admin"):
+            bulk_selection = st.multiselect(
+                "Candidates (current page)",
+                options=list(rows_by_id),
+                format_func=lambda row_id: rows_by_id[row_id]['name'],
+                # A new page or filter offers different rows, so it starts with an empty selection
+                key=f"bulk_status_candidates_admin_{hash(tuple(rows_by_id))}"
+            )
+            col_bulk_status, col_bulk_jd = st.columns(2)
+            with col_bulk_status:
+                bulk_status = st.selectbox("Set Status To", ["Approved", "Rejected", "Pending"], key="bulk_status_value_admin")
+            with col_bulk_jd:
+                bulk_jd = st.selectbox("Applied for JD Title", jd_options, key="bulk_status_jd_admin", help="'Select JD' keeps each candidate's current JD.")
+            bulk_submitted = st.form_submit_button("Apply to Selected", use_container_width=True)
+
+        if bulk_submitted:
+            if bulk_selection:
+                bulk_update_resume_metadata([rows_by_id[row_id] for row_id in bulk_selection], bulk_status, bulk_jd if bulk_jd != "Select JD" else None)
+                st.rerun()
+            else:
+                st.warning("Select at least one candidate.")
 
-        # --- Display and Action Block for Individual Candidate ---
-        with st.container(border=True):
-            st.markdown(f"### **Candidate:** {resume_name} (Status: **{current_status}**)")
-            
-            # Contact Info & Education
-            col_contact, col_education = st.columns(2)
-            with col_contact:
-                st.markdown(f"**📧 Email:** `{candidate_email}`")
-                st.markdown(f"**📱 Phone:** `{candidate_phone}`")
-            with col_education:
-                st.markdown(f"**🎓 Education:** `{university_info}`")
-                st.markdown(f"**Applied JD:** `{current_applied_jd}`")
-                
-            st.markdown("---")
-            st.markdown(f"**Brief Resume Info:** *{brief_summary}*")
-            st.markdown("---")
-            
-            # NEW: JD Selection and Date Input Block (No generic status selector/updater)
-            col_jd_select, col_date_input = st.columns([1, 1])
-            
-            with col_jd_select:
-                try:
-                    default_value = current_applied_jd if current_applied_jd != "N/A (Pending Assignment)" else "Select JD"
-                    jd_default_index = jd_options.index(default_value)
-                except ValueError:
-                    jd_default_index = 0
-                    
-                new_applied_jd = st.selectbox(
-                    "Applied for JD Title", 
-                    options=jd_options,
-                    index=jd_default_index,
-                    key=f"jd_select_{resume_name}_{idx}",
-                )
-                
-            with col_date_input:
-                try:
-                    date_obj = date.fromisoformat(current_submitted_date)
-                except (ValueError, TypeError):
-                    date_obj = date.today()
-                    
-                new_submitted_date = st.date_input(
-                    "Submitted Date", 
-                    value=date_obj,
-                    key=f"date_input_{resume_name}_{idx}"
-                )
+    for offset, resume_data in enumerate(page_rows):
+        candidate_approval_row(resume_data, page_index * page_size + offset, jd_options)
             
-            st.markdown("---")
-            
-            # Dedicated Approve/Reject/Pending Buttons for Quick Actions
-            col_quick_approve, col_quick_reject, col_quick_pending, _ = st.columns([1, 1, 1, 5])
+    st.markdown("---")
             
-            jd_to_save = new_applied_jd if new_applied_jd != "Select JD" else "N/A (Pending Assignment)"
-            date_to_save = new_submitted_date.strftime("%Y-%m-%d")
-
-            # Function to run status update and RERUN
-            def run_update_and_rerun(status_to_set):
-                update_resume_metadata(
-                    resume_name, 
-                    status_to_set, 
-                    jd_to_save, 
-                    date_to_save,
-                    idx
-                )
-                st.rerun()
+    # --- Summary of All Resumes (read from the store only while the toggle is on) ---
+    if st.toggle("Show summary of all resumes", key="approval_summary_toggle_admin"):
+        summary_data = [
+            {
+                "Resume": doc['name'],
+                "Applied JD": doc.get('applied_jd', 'N/A'),
+                "Submitted Date": doc.get('submitted_date', 'N/A'),
+                "Status": doc.get('status', "Pending"),
+            }
+            for doc in repo.list_resume_summary()
+        ]
+        st.dataframe(summary_data, use_container_width=True)
 
-            with col_quick_approve:
-                # Approve button
-                if st.button("✅ Approve", key=f"quick_approve_{resume_name}_{idx}", use_container_width=True):
-                    run_update_and_rerun("Approved")
 
-            with col_quick_reject:
-                # Reject button
-                if st.button("❌ Reject", key=f"quick_reject_{resume_name}_{idx}", use_container_width=True):
-                    run_update_and_rerun("Rejected")
+def candidate_search_tab_content():
+    st.header("🔎 Candidate Search")
+    st.caption('Keyword search over resume text and parsed fields. All terms must match; use OR for alternatives, "quotes" for phrases and * for prefixes (e.g. `kubernetes "5 years" python OR golang`).')
 
-            with col_quick_pending:
-                 # Pending button
-                if st.button("🟡 Pending", key=f"quick_pending_{resume_name}_{idx}", use_container_width=True):
-                    run_update_and_rerun("Pending")
+    repo = get_repository()
+    index = get_search_index(repo)
 
-            
-    st.markdown("---")
-            
-    # --- Summary of All Resumes (Updated to reflect latest status) ---
-    summary_data = []
-    for resume_data in st.session_state.resumes_to_analyze:
-        name = resume_data['name']
-        summary_data.append({
-            "Resume": name, 
-            "Applied JD": resume_data.get('applied_jd', 'N/A'),
-            "Submitted Date": resume_data.get('submitted_date', 'N/A'),
-            "Status": st.session_state.resume_statuses.get(name, "Pending")
-        })
-        
-    st.subheader("Summary of All Resumes")
-    st.dataframe(summary_data, use_container_width=True)
+    col_query, col_limit = st.columns([4, 1])
+    with col_query:
+        search_query = st.text_input("Search resumes", key="candidate_search_query_admin", placeholder='kubernetes "5 years"')
+    with col_limit:
+        result_limit = st.selectbox("Results", [10, 25, 50, 100], index=1, key="candidate_search_limit_admin")
+
+    if not search_query.strip():
+        st.info(f"{index.count()} resume(s) indexed.")
+        return
+
+    started = time.perf_counter()
+    results, error = index.search(search_query, limit=result_limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if error:
+        st.error(error)
+        return
+    if not results:
+        st.warning("No resumes match this search.")
+        return
+
+    st.caption(f"{len(results)} result(s) in {elapsed_ms:.0f} ms, best match first.")
+    for rank, result in enumerate(results, start=1):
+        with st.container(border=True):
+            st.markdown(f"**{rank}. {result['name']}** · relevance `{result['score']}`")
+            st.markdown(f"> {result['snippet']}")
 
 
 def vendor_approval_tab_content():
@@ -465,7 +511,7 @@ def vendor_approval_tab_content():
         with col7:
             initial_status = st.selectbox(
                 "Set Status", 
-                ["Pending Review", "Approved", "Rejected"],
+                VENDOR_STATUSES,
                 index=0, 
                 key="new_vendor_status_select"
             )
@@ -494,6 +540,7 @@ def vendor_approval_tab_content():
                     }
                     st.session_state.vendors.append(new_vendor)
                     st.session_state.vendor_statuses[vendor_id] = initial_status
+                    get_repository().add_vendor(vendor_id, new_vendor, initial_status)
                     st.success(f"Vendor **{vendor_name}** added successfully with status **{initial_status}**. Fields are now clear for the next entry.")
                     st.session_state['vendor_added_flag'] = True # Set flag
 
@@ -508,73 +555,81 @@ def vendor_approval_tab_content():
 
     st.markdown("---")
     
-    st.markdown("### 2. Update Existing Vendor Status")
-    
-    if not st.session_state.vendors:
+    st.markdown("### 2. Review and Update Vendor Status")
+    vendor_status_grid()
+
+
+@timed_fragment("admin:vendor_grid")
+def vendor_status_grid():
+    """Paginated vendor status grid; paging and saving rerun only this panel."""
+    repo = get_repository()
+    if not repo.count_vendors():
         st.info("No vendors have been added yet.")
-    else:
-        # Loop through vendors to display and allow status update
-        for idx, vendor in enumerate(st.session_state.vendors):
-            vendor_name = vendor['name']
-            vendor_id = vendor_name 
-            current_status = st.session_state.vendor_statuses.get(vendor_id, "Unknown")
-            
-            with st.container(border=True):
-                
-                # --- Display Vendor Info ---
-                st.markdown(f"### **{vendor_name}** (Code: `{vendor['code']}`) - **Current Status:** **{current_status}**")
-                
-                col_domain, col_contact_info = st.columns(2)
-                
-                with col_domain:
-                    st.markdown(f"**Domain:** {vendor['domain']}")
-                    st.markdown(f"**Address:** *{vendor['address'].replace('\n', ', ')}*")
-                    st.markdown(f"**Submitted:** {vendor['submitted_date']}")
-                    
-                with col_contact_info:
-                    st.markdown(f"**Contact Person:** {vendor['contact_person']}")
-                    st.markdown(f"**Email:** `{vendor['email']}`")
-                    st.markdown(f"**Phone:** `{vendor['phone']}`")
-                    
-                st.markdown("---")
-                
-                # --- Status Update Controls ---
-                col_status_input, col_update_btn = st.columns([3, 1])
-                
-                with col_status_input:
-                    new_status = st.selectbox(
-                        "Set New Status",
-                        ["Pending Review", "Approved", "Rejected"],
-                        index=["Pending Review", "Approved", "Rejected"].index(current_status),
-                        key=f"vendor_status_select_{idx}",
-                    )
+        return
 
-                with col_update_btn:
-                    st.markdown("##") # Space out button
-                    if st.button("Update Status", key=f"vendor_update_btn_{idx}", use_container_width=True):
-                        
-                        st.session_state.vendor_statuses[vendor_id] = new_status
-                        
-                        st.success(f"Status for **{vendor_name}** updated to **{new_status}**.")
-                        st.rerun()
-                        
-        st.markdown("---")
-        
-        summary_data = []
-        for vendor in st.session_state.vendors:
-            name = vendor['name']
-            summary_data.append({
-                "Vendor Name": name,
-                "Vendor ID / Code": vendor['code'],
-                "Domain": vendor['domain'],
-                "Contact Person": vendor['contact_person'],
-                "Email ID": vendor['email'],
-                "Submitted Date": vendor['submitted_date'],
-                "Status": st.session_state.vendor_statuses.get(name, "Unknown")
-            })
-        
-        st.subheader("Summary of All Vendors")
-        st.dataframe(summary_data, use_container_width=True)
+    col_vendor_filter, col_vendor_page_size, col_vendor_page = st.columns([2, 1, 1])
+    with col_vendor_filter:
+        vendor_status_filter = st.selectbox("Status", ["All"] + VENDOR_STATUSES, key="vendor_filter_status_admin")
+    with col_vendor_page_size:
+        vendor_page_size = st.selectbox("Rows per page", [25, 50, 100], key="vendor_page_size_admin")
+
+    status_query = None if vendor_status_filter == "All" else vendor_status_filter
+    vendor_total = repo.count_vendors(status_query)
+    vendor_page_count = max(1, -(-vendor_total // vendor_page_size))
+    with col_vendor_page:
+        vendor_page_number = st.number_input("Page", min_value=1, max_value=vendor_page_count, value=1, step=1, key="vendor_page_admin")
+    vendor_page_index = min(int(vendor_page_number), vendor_page_count) - 1
+
+    page_vendors = repo.list_vendor_page(status_query, vendor_page_index, vendor_page_size)
+    grid_rows = [
+        {
+            "Vendor ID": vendor['vendor_id'],
+            "Vendor Name": vendor.get('name', vendor['vendor_id']),
+            "Code": vendor.get('code', 'N/A'),
+            "Domain": vendor.get('domain', ''),
+            "Contact Person": vendor.get('contact_person', ''),
+            "Email ID": vendor.get('email', ''),
+            "Phone": vendor.get('phone', 'N/A'),
+            "Address": vendor.get('address', 'N/A').replace('\n', ', '),
+            "Submitted Date": vendor.get('submitted_date', 'N/A'),
+            "Status": vendor.get('status', 'Pending Review'),
+        }
+        for vendor in page_vendors
+    ]
+    st.caption(f"Showing {len(grid_rows)} of {vendor_total} vendor(s) — page {vendor_page_index + 1} of {vendor_page_count}. Edit the Status column, then save once.")
+
+    # Edits inside the form do not rerun the app; all changes are committed by one Save.
+    # The editor's edits are stored by row position, so each save starts a new editor generation
+    # (otherwise old edits would be applied to whichever vendors now sit at those rows).
+    grid_generation = st.session_state.setdefault("vendor_status_grid_generation", 0)
+    with st.form("vendor_status_grid_form"):
+        edited_rows = st.data_editor(
+            grid_rows,
+            column_config={
+                "Status": st.column_config.SelectboxColumn("Status", options=VENDOR_STATUSES, required=True),
+            },
+            disabled=[column for column in grid_rows[0] if column != "Status"] if grid_rows else True,
+            hide_index=True,
+            use_container_width=True,
+            key=f"vendor_status_grid_{vendor_status_filter}_{vendor_page_index}_{vendor_page_size}_{grid_generation}",
+        )
+        save_vendor_statuses = st.form_submit_button("💾 Save Status Changes", use_container_width=True)
+
+    if save_vendor_statuses:
+        original_statuses = {row["Vendor ID"]: row["Status"] for row in grid_rows}
+        status_changes = {
+            row["Vendor ID"]: row["Status"]
+            for row in edited_rows
+            if row["Status"] != original_statuses.get(row["Vendor ID"])
+        }
+        if status_changes:
+            st.session_state.vendor_statuses.update(status_changes)
+            repo.set_vendor_statuses(status_changes)
+            st.session_state.vendor_status_grid_generation = grid_generation + 1
+            st.toast(f"Updated the status of **{len(status_changes)}** vendor(s).")
+            rerun_panel()
+        else:
+            st.info("No status changes to save.")
 
 
 def admin_dashboard(go_to): 
@@ -611,9 +666,10 @@ def admin_dashboard(go_to):
         
     
     # --- TAB ORDER ---
-    tab_jd, tab_analysis, tab_user_mgmt, tab_statistics = st.tabs([
+    tab_jd, tab_analysis, tab_search, tab_user_mgmt, tab_statistics = st.tabs([
         "📄 JD Management", 
         "📊 Resume Analysis", 
+        "🔎 Candidate Search",
         "🛠️ User Management", 
         "📈 Statistics" 
     ])
@@ -646,7 +702,7 @@ def admin_dashboard(go_to):
                             metadata = extract_jd_metadata(jd_text) 
                         
                         name_base = url.split('/jobs/view/')[-1].split('/')[0] if '/jobs/view/' in url else f"URL {count+1}"
-                        st.session_state.admin_jd_list.append({"name": f"JD from URL: {name_base}", "content": jd_text, **metadata}) 
+                        add_admin_jd({"name": f"JD from URL: {name_base}", "content": jd_text, **metadata})
                         if not jd_text.startswith("[Error"):
                             count += 1
                             
@@ -671,7 +727,7 @@ def admin_dashboard(go_to):
                             if not name_base: name_base = f"Pasted JD {len(st.session_state.admin_jd_list) + i + 1}"
                             
                             metadata = extract_jd_metadata(text)
-                            st.session_state.admin_jd_list.append({"name": name_base, "content": text, **metadata}) 
+                            add_admin_jd({"name": name_base, "content": text, **metadata})
                     st.success(f"✅ {len(texts)} JD(s) added successfully!")
 
         # Upload File
@@ -702,7 +758,7 @@ def admin_dashboard(go_to):
                         
                         if not jd_text.startswith("Error"):
                             metadata = extract_jd_metadata(jd_text)
-                            st.session_state.admin_jd_list.append({"name": file.name, "content": jd_text, **metadata}) 
+                            add_admin_jd({"name": file.name, "content": jd_text, **metadata})
                             count += 1
                         else:
                             st.error(f"Error extracting content from {file.name}: {jd_text}")
@@ -725,6 +781,8 @@ def admin_dashboard(go_to):
                 if st.button("🗑️ Clear All JDs", key="clear_jds_admin", use_container_width=True, help="Removes all currently loaded JDs."):
                     st.session_state.admin_jd_list = []
                     st.session_state.admin_match_results = [] 
+                    get_repository().clear_jds(ADMIN_OWNER)
+                    get_repository().replace_match_results(ADMIN_OWNER, [])
                     st.success("All JDs and associated match results have been cleared.")
                     st.rerun() 
 
@@ -746,39 +804,67 @@ def admin_dashboard(go_to):
         # 1. Resume Upload
         st.markdown("#### 1. Upload Resumes")
         
-        resume_upload_type = st.radio("Upload Type", ["Single Resume", "Multiple Resumes"], key="resume_upload_type_admin")
+        resume_upload_type = st.radio("Upload Type", ["Single Resume", "Multiple Resumes", "ZIP Archive (Bulk)"], key="resume_upload_type_admin")
+        is_zip_upload = resume_upload_type == "ZIP Archive (Bulk)"
 
         uploaded_files = st.file_uploader(
-            "Choose files to analyze",
-            type=["pdf", "docx", "txt", "json", "rtf"], 
+            "Choose files to analyze" if not is_zip_upload else "Choose a ZIP archive of resumes",
+            type=["pdf", "docx", "txt", "json", "rtf"] if not is_zip_upload else ["zip"], 
             accept_multiple_files=(resume_upload_type == "Multiple Resumes"),
             key="resume_file_uploader_admin"
         )
+
+        if is_zip_upload:
+            max_workers = st.slider(
+                "Parallel parsing jobs", min_value=1, max_value=8, value=DEFAULT_MAX_WORKERS,
+                key="zip_ingest_workers_admin", help="Upper bound on resumes parsed concurrently."
+            )
         
         col_parse, col_clear = st.columns([3, 1])
         
         with col_parse:
             if st.button("Load and Parse Resume(s) for Analysis", key="parse_resumes_admin", use_container_width=True):
-                if uploaded_files:
+                if uploaded_files and is_zip_upload:
+                    progress_bar = st.progress(0.0, text=f"Reading {uploaded_files.name}...")
+
+                    def show_progress(done, total, file_name):
+                        fraction = done / total if total else 1.0
+                        progress_bar.progress(min(fraction, 1.0), text=f"Processed {done}/{total}: {file_name}")
+
+                    uploaded_files.seek(0)
+                    # Resumes already in the store (from any session) are skipped before parsing, like single uploads
+                    report, parsed_results = ingest_zip_archive(
+                        uploaded_files,
+                        parse_resume_bytes,
+                        seen_hashes=loaded_resume_hashes() | get_repository().resume_hashes(),
+                        max_workers=max_workers,
+                        on_progress=show_progress
+                    )
+
+                    # Persist the whole archive with batched bulk writes instead of one write per resume
+                    with get_repository().batch() as batch:
+                        for row, result in parsed_results:
+                            if not add_resume_for_analysis(result, batch=batch):
+                                row['status'], row['detail'] = "skipped", "Duplicate of an already loaded resume."
+
+                    st.session_state.admin_zip_ingest_report = report
+                    if parsed_results:
+                        st.rerun()
+
+                elif uploaded_files:
                     files_to_process = uploaded_files if isinstance(uploaded_files, list) else ([uploaded_files] if uploaded_files else [])
                     
                     count = 0
-                    with st.spinner("Parsing resume(s)... This may take a moment."):
+                    with st.spinner("Parsing resume(s)... This may take a moment."), get_repository().batch() as batch:
                         for file in files_to_process:
                             if file: 
                                 result = parse_and_store_resume(file, file_name_key='admin_analysis', source_type='file')
                                 
                                 if "error" not in result:
-                                    result['applied_jd'] = "N/A (Pending Assignment)"
-                                    result['submitted_date'] = date.today().strftime("%Y-%m-%d")
-                                    
-                                    st.session_state.resumes_to_analyze.append(result)
-                                    
-                                    resume_id = result['name']
-                                    if resume_id not in st.session_state.resume_statuses:
-                                        st.session_state.resume_statuses[resume_id] = "Pending"
-                                    
-                                    count += 1
+                                    if add_resume_for_analysis(result, batch=batch):
+                                        count += 1
+                                    else:
+                                        st.info(f"{file.name} is already loaded; skipped.")
                                 else:
                                     st.error(f"Failed to parse {file.name}: {result['error']}")
 
@@ -793,17 +879,44 @@ def admin_dashboard(go_to):
         with col_clear:
             if st.button("🗑️ Clear All Resumes", key="clear_resumes_admin", use_container_width=True, help="Removes all currently loaded resumes and match results."):
                 st.session_state.resumes_to_analyze = []
+                st.session_state.loaded_resume_hashes = set()
                 st.session_state.admin_match_results = []
                 st.session_state.resume_statuses = {} 
+                get_repository().clear_resumes()
+                get_repository().replace_match_results(ADMIN_OWNER, [])
+                get_search_index().clear()
+                st.session_state.admin_zip_ingest_report = []
                 st.success("All resumes and associated match results have been cleared.")
                 st.rerun() 
 
+        # Per-file report of the last ZIP ingestion run
+        if st.session_state.get('admin_zip_ingest_report'):
+            report = st.session_state.admin_zip_ingest_report
+            parsed_count = sum(1 for row in report if row['status'] == 'parsed')
+            skipped_count = sum(1 for row in report if row['status'] == 'skipped')
+            failed_count = sum(1 for row in report if row['status'] == 'failed')
+            with st.expander(f"Last ZIP ingestion: {parsed_count} parsed, {skipped_count} skipped, {failed_count} failed"):
+                st.dataframe(
+                    [{"File": row['file'], "Status": row['status'].title(), "Detail": row['detail']} for row in report],
+                    use_container_width=True
+                )
+
 
         st.markdown("---")
 
         # 2. JD Selection and Analysis
         st.markdown("#### 2. Select JD and Run Analysis")
 
+        stored_count = get_repository().count_resumes()
+        if not st.session_state.resumes_to_analyze and stored_count:
+            # Stored resumes are only pulled into the session when the admin asks for them
+            if st.button(f"Load {stored_count} stored resume(s) for matching", key="load_stored_resumes_admin"):
+                stored = get_repository().list_resumes()
+                st.session_state.resumes_to_analyze = stored
+                st.session_state.pop('loaded_resume_hashes', None)
+                st.session_state.resume_statuses.update(get_repository().resume_statuses(r['name'] for r in stored))
+                st.rerun()
+
         if not st.session_state.resumes_to_analyze:
             st.info("Upload and parse resumes first to enable analysis.")
             if not st.session_state.admin_jd_list: return
@@ -846,7 +959,7 @@ def admin_dashboard(go_to):
                 for resume_data in resumes_to_match: 
                     
                     resume_name = resume_data['name']
-                    parsed_json = resume_data['parsed']
+                    parsed_json = load_field(resume_data, 'parsed', {})
 
                     try:
                         fit_output = evaluate_jd_fit(selected_jd_content, parsed_json)
@@ -894,7 +1007,10 @@ def admin_dashboard(go_to):
                         })
                 
                 results_with_score.sort(key=lambda x: x['numeric_score'], reverse=True)
+                for item in results_with_score:
+                    offload_fields(item, MATCH_RESULT_BLOB_FIELDS)
                 st.session_state.admin_match_results = results_with_score
+                get_repository().replace_match_results(ADMIN_OWNER, results_with_score)
 
             st.success("Analysis complete!")
 
@@ -919,14 +1035,26 @@ def admin_dashboard(go_to):
             st.dataframe(display_data, use_container_width=True)
 
             st.markdown("##### Detailed Reports")
-            for item in results_df:
+
+            def report_header(item):
                 status = st.session_state.resume_statuses.get(item["resume_name"], 'Pending') 
-                header_text = f"Report for **{item['resume_name']}** against {item['jd_name']} (Score: **{item['overall_score']}/10** | S: **{item.get('skills_percent', 'N/A')}%** | E: **{item.get('experience_percent', 'N/A')}%** | Edu: **{item.get('education_percent', 'N/A')}%**) - Current Status: {status}"
-                with st.expander(header_text):
-                    st.markdown(item['full_analysis'])
+                return f"Report for **{item['resume_name']}** against {item['jd_name']} (Score: **{item['overall_score']}/10** | S: **{item.get('skills_percent', 'N/A')}%** | E: **{item.get('experience_percent', 'N/A')}%** | Edu: **{item.get('education_percent', 'N/A')}%**) - Current Status: {status}"
+
+            # The report blob is only read once its toggle is on
+            match_report_list(
+                results_df,
+                "admin_match",
+                report_header,
+                lambda item: load_field(item, 'full_analysis', "Report is no longer available."),
+                item_key_fn=lambda item: item['resume_name']
+            )
 
-                    
-    # --- TAB 3: User Management (Parent Tab) ---
+
+    # --- TAB 3: Candidate Search ---
+    with tab_search:
+        candidate_search_tab_content()
+
+    # --- TAB 4: User Management (Parent Tab) ---
     with tab_user_mgmt:
         st.header("🛠️ User Management")
         
@@ -942,14 +1070,17 @@ def admin_dashboard(go_to):
             vendor_approval_tab_content() 
             
 
-    # --- TAB 4: Statistics (UPDATED) ---
+    # --- TAB 5: Statistics (UPDATED) ---
     with tab_statistics:
         st.header("System Statistics")
         st.markdown("---")
 
-        total_candidates = len(st.session_state.resumes_to_analyze)
-        total_jds = len(st.session_state.admin_jd_list)
-        total_vendors = len(st.session_state.vendors)
+        # Counters are maintained by the store on every add/remove/status change, so this tab
+        # reads a handful of small documents instead of recounting every resume and vendor.
+        stats = get_repository().get_stats()
+        total_candidates = stats['resumes']['total']
+        total_jds = stats['jds']
+        total_vendors = stats['vendors']['total']
         no_of_applications = total_candidates 
         
         # --- Top-Level Metrics ---
@@ -973,11 +1104,7 @@ def admin_dashboard(go_to):
         # --- Candidate Status Breakdown ---
         st.subheader("Candidate Status Breakdown (Resumes)")
         
-        candidate_status_counts = {}
-        for status in st.session_state.resume_statuses.values():
-            # Standardizing status names for display
-            display_status = status.replace(' ', '') 
-            candidate_status_counts[display_status] = candidate_status_counts.get(display_status, 0) + 1
+        candidate_status_counts = {status.replace(' ', ''): count for status, count in stats['resumes']['by_status'].items() if count > 0}
             
         status_cols_cand = st.columns(max(len(candidate_status_counts), 1))
         
@@ -996,11 +1123,7 @@ def admin_dashboard(go_to):
         # --- Vendor Status Breakdown (NEW) ---
         st.subheader("Vendor Status Breakdown")
         
-        vendor_status_counts = {}
-        for status in st.session_state.vendor_statuses.values():
-            # Standardizing status names for display
-            display_status = status.replace(' ', '')
-            vendor_status_counts[display_status] = vendor_status_counts.get(display_status, 0) + 1
+        vendor_status_counts = {status.replace(' ', ''): count for status, count in stats['vendors']['by_status'].items() if count > 0}
             
         status_cols_vend = st.columns(max(len(vendor_status_counts), 1))
         
@@ -1013,6 +1136,54 @@ def admin_dashboard(go_to):
         else:
             st.info("No vendors added to calculate status breakdown.")
 
+        st.markdown("---")
+
+        # --- Submission Trends (daily rollups by submitted date, status and applied JD) ---
+        st.subheader("Submission Trends")
+
+        trend_days = st.selectbox("Period", [7, 30, 90, 365], index=1, format_func=lambda d: f"Last {d} days", key="stats_trend_days_admin")
+        since = (date.today() - timedelta(days=trend_days)).strftime("%Y-%m-%d")
+        rollups = get_repository().list_daily_rollups(since=since)
+
+        if rollups:
+            statuses = sorted({r['status'] for r in rollups})
+            by_date = {}
+            by_jd = {}
+            for r in rollups:
+                by_date.setdefault(r['submitted_date'], dict.fromkeys(statuses, 0))[r['status']] += r['count']
+                by_jd.setdefault(r['applied_jd'], dict.fromkeys(statuses, 0))[r['status']] += r['count']
+
+            dates = sorted(by_date)
+            trend_data = {"Submitted Date": dates}
+            for status in statuses:
+                trend_data[status] = [by_date[d][status] for d in dates]
+            st.bar_chart(trend_data, x="Submitted Date", y=statuses)
+
+            st.markdown("**By Applied JD**")
+            st.dataframe(
+                [{"Applied JD": jd, **counts, "Total": sum(counts.values())} for jd, counts in sorted(by_jd.items())],
+                use_container_width=True
+            )
+        else:
+            st.info(f"No resumes submitted in the last {trend_days} days.")
+
+        st.markdown("---")
+
+        # --- Session Memory (sessions served by this process) ---
+        st.subheader("Heaviest Sessions")
+        st.caption(
+            f"Live session state per session, measured at the end of its last run. Cold values above "
+            f"{format_bytes(SESSION_STATE_CAP_BYTES)} per session are spilled to disk."
+        )
+        heaviest_sessions = list_heaviest_sessions(limit=10)
+        if heaviest_sessions:
+            st.dataframe(heaviest_sessions, use_container_width=True, hide_index=True)
+        else:
+            st.info("No sessions recorded yet.")
+
+    # Record this session's state size for the Heaviest Sessions table (admin state is never spilled)
+    enforce_session_cap()
+
 
 # --- Session State & Main Function Initialization (Required for execution) ---
 if __name__ == '__main__':
@@ -0,0 +1,120 @@
+import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from resume_retrieval import tokenize
+
+# -------------------------
+# ANSWER CACHE CONFIGURATION
+# -------------------------
+
+# Minimum token-set (Jaccard) similarity for a differently worded question to reuse an answer
+ANSWER_CACHE_SIMILARITY = float(os.getenv('PRAGYAN_ANSWER_CACHE_SIMILARITY', '0.75'))
+ANSWER_CACHE_MAX_DOCS = int(os.getenv('PRAGYAN_ANSWER_CACHE_MAX_DOCS', '500'))
+ANSWER_CACHE_PER_DOC = 200
+# Write answers through to the portal store so other server processes (and restarts) reuse them
+ANSWER_CACHE_STORE = os.getenv('PRAGYAN_ANSWER_CACHE_STORE', '1') == '1'
+
+# Words that do not change what is being asked
+QUESTION_FILLER = {"please", "can", "could", "would", "will", "kindly", "there", "mentioned", "specified", "given"}
+QUESTION_SYNONYMS = {
+    "pay": "salary", "compensation": "salary", "ctc": "salary", "package": "salary", "stipend": "salary",
+    "wage": "salary", "wfh": "remote", "yr": "year", "yrs": "year", "exp": "experience",
+}
+
+
+def document_key(kind, text):
+    """Cache key of the document a question is about, e.g. ('jd', jd text)."""
+    return f"{kind}:{hashlib.sha256((text or '').encode('utf-8')).hexdigest()}"
+
+
+def normalize_question(question):
+    """Returns the question as a frozenset of meaningful tokens ("Salary?" and "what is the salary" agree)."""
+    text = re.sub(r"\bwork(?:ing)? from home\b", "remote", (question or "").lower())
+    tokens = (QUESTION_SYNONYMS.get(token, token) for token in tokenize(text))
+    return frozenset(token for token in tokens if token not in QUESTION_FILLER)
+
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+# --------------------------------------------------
+# SHARED ANSWER CACHE
+# --------------------------------------------------
+
+class AnswerCache:
+    """
+    Process-wide cache of chat answers per document, shared by all sessions. Lookups try the
+    exact normalized question first, then the most similar cached question of the same document.
+    """
+
+    def __init__(self, repo=None):
+        self.repo = repo
+        self._docs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entries(self, doc_key):
+        """Returns the doc's {question key: entry} map, loading it from the store on first use. Caller holds the lock."""
+        entries = self._docs.get(doc_key)
+        if entries is None:
+            entries = OrderedDict()
+            if self.repo is not None:
+                for doc in self.repo.list_cached_answers(doc_key):
+                    tokens = frozenset(doc['question_key'].split())
+                    entries[doc['question_key']] = {"tokens": tokens, "question": doc['question'], "answer": doc['answer']}
+            self._docs[doc_key] = entries
+            while len(self._docs) > ANSWER_CACHE_MAX_DOCS:
+                self._docs.popitem(last=False)
+        self._docs.move_to_end(doc_key)
+        return entries
+
+    def get(self, doc_key, question):
+        """Returns a cached answer for the question (or a near-duplicate of it), or None."""
+        tokens = normalize_question(question)
+        if not tokens:
+            return None
+        key = " ".join(sorted(tokens))
+        with self._lock:
+            entries = self._entries(doc_key)
+            entry = entries.get(key)
+            if entry is None:
+                best = max(entries.values(), key=lambda e: _jaccard(tokens, e["tokens"]), default=None)
+                if best is None or _jaccard(tokens, best["tokens"]) < ANSWER_CACHE_SIMILARITY:
+                    return None
+                entry = best
+            return entry["answer"]
+
+    def put(self, doc_key, question, answer):
+        tokens = normalize_question(question)
+        if not tokens or not answer:
+            return
+        key = " ".join(sorted(tokens))
+        with self._lock:
+            entries = self._entries(doc_key)
+            entries[key] = {"tokens": tokens, "question": question, "answer": answer}
+            entries.move_to_end(key)
+            while len(entries) > ANSWER_CACHE_PER_DOC:
+                entries.popitem(last=False)
+        if self.repo is not None:
+            self.repo.put_cached_answer(doc_key, key, question, answer)
+
+
+# --- Cache Access ---
+
+_answer_cache = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache():
+    global _answer_cache
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                repo = None
+                if ANSWER_CACHE_STORE:
+                    from data_store import get_repository
+                    repo = get_repository()
+                _answer_cache = AnswerCache(repo)
+    return _answer_cache
@@ -0,0 +1,120 @@
+import os
+import gzip
+import json
+import hashlib
+import logging
+import tempfile
+from functools import lru_cache
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# -------------------------
+# BLOB STORE CONFIGURATION
+# -------------------------
+
+BLOB_DIR = os.getenv('PRAGYAN_BLOB_DIR', os.path.join('.pragyan', 'blobs'))
+# Values smaller than this stay inline; the reference would not save anything
+OFFLOAD_MIN_BYTES = int(os.getenv('PRAGYAN_BLOB_MIN_BYTES', '1024'))
+BLOB_CODEC = "zst" if zstandard is not None else "gz"
+
+# What a missing, truncated or corrupt blob can raise while it is read, decompressed and decoded
+# (json and UTF-8 decode errors are ValueErrors)
+BLOB_READ_ERRORS = (OSError, EOFError, RuntimeError, ValueError) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+logger = logging.getLogger(__name__)
+
+
+# --- Compression ---
+
+def _compress(data, codec):
+    if codec == "zst":
+        return zstandard.ZstdCompressor(level=6).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data, codec):
+    if codec == "zst":
+        if zstandard is None:
+            raise RuntimeError("Blob was written with zstd but the 'zstandard' package is not installed.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _blob_path(key):
+    # Two-level fan-out keeps directories small with many blobs
+    return os.path.join(BLOB_DIR, key[:2], key)
+
+
+# --- Content-Addressed Blobs ---
+
+def put_blob(data):
+    """Stores bytes compressed under their SHA-256 and returns the blob key. Identical content is stored once."""
+    key = f"{hashlib.sha256(data).hexdigest()}.{BLOB_CODEC}"
+    path = _blob_path(key)
+    if os.path.exists(path):
+        return key
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_compress(data, BLOB_CODEC))
+        # Atomic, so concurrent writers of the same content never expose a partial file
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return key
+
+
+@lru_cache(maxsize=128)
+def get_blob(key):
+    """Returns the decompressed bytes of a blob (recently read blobs are cached in memory)."""
+    with open(_blob_path(key), 'rb') as f:
+        return _decompress(f.read(), key.rsplit('.', 1)[-1])
+
+
+# --- Hot/Cold Field Helpers ---
+
+def offload_fields(doc, fields, min_bytes=OFFLOAD_MIN_BYTES):
+    """
+    Moves large fields of a dict to the blob store in place, replacing each with a
+    '<field>_ref' entry ({'blob', 'format', 'size'}). Returns the same dict.
+    """
+    for field in fields:
+        if field not in doc or doc[field] is None:
+            continue
+
+        value = doc[field]
+        is_text = isinstance(value, str)
+        data = (value if is_text else json.dumps(value, default=str)).encode('utf-8')
+        if len(data) < min_bytes:
+            continue
+
+        doc[f"{field}_ref"] = {"blob": put_blob(data), "format": "text" if is_text else "json", "size": len(data)}
+        del doc[field]
+    return doc
+
+
+def load_field(doc, field, default=None):
+    """Returns doc[field], loading it from the blob store if it was offloaded."""
+    if field in doc:
+        return doc[field]
+
+    ref = doc.get(f"{field}_ref")
+    if not ref:
+        return default
+    try:
+        text = get_blob(ref['blob']).decode('utf-8')
+        return json.loads(text) if ref.get('format') == 'json' else text
+    except BLOB_READ_ERRORS as e:
+        logger.warning("Could not load '%s' from blob %s: %s", field, ref['blob'], e)
+        return default
+
+
+def has_field(doc, field):
+    return field in doc or bool(doc.get(f"{field}_ref"))
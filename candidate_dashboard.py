@@ -1,14 +1,54 @@
 import streamlit as st
 import os
-import pdfplumber
-import docx
+import time
+import threading
 import json
 import traceback
 import re 
 from dotenv import load_dotenv 
-from io import BytesIO 
-import pandas as pd
-import base64 
+from session_memory import (
+    acquire_upload_buffer,
+    release_upload_buffer,
+    open_buffer_stream,
+    buffer_to_text,
+    session_memory_report,
+    format_bytes,
+    restore_spilled_values,
+    enforce_session_cap,
+)
+from data_store import get_repository
+from rerun_timing import record_timing, timed_fragment, rerun_panel
+from report_view import match_report_list
+from resume_retrieval import get_resume_index
+from answer_cache import get_answer_cache, document_key
+from interview_scoring import (
+    score_answers,
+    build_scoring_prompt,
+    heuristic_feedback,
+    aggregate_scores,
+    format_question_feedback,
+    format_summary,
+    compose_report,
+)
+from cover_letters import (
+    COVER_LETTER_STYLES,
+    FAILED_LETTER_PREFIXES,
+    resume_digest,
+    generate_letter_cached,
+    generate_letters,
+    build_letters_zip,
+    letters_results_key,
+)
+from course_plans import get_gap_course_plan, build_fragment_prompt, parse_fragments
+from question_bank import get_question_bank, question_bank_key, QUESTION_BANK_PREFETCH
+from chat_memory import (
+    new_chat_memory,
+    format_chat_context,
+    update_chat_memory,
+    extractive_summary,
+    is_follow_up,
+    last_user_message,
+)
 
 # --- CONFIGURATION & API SETUP ---
 
@@ -16,6 +56,8 @@ GROQ_MODEL = "llama-3.1-8b-instant"
 # Load environment variables (e.g., GROQ_API_KEY)
 load_dotenv()
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
+# Prepared download files kept per process (cached on their content)
+DOWNLOAD_CACHE_ENTRIES = int(os.getenv('PRAGYAN_DOWNLOAD_CACHE_ENTRIES', '64'))
 
 # --- Default/Mock Data for Filtering ---
 DEFAULT_ROLES = ["Data Scientist", "Cloud Engineer", "Software Engineer", "AI/ML Engineer"]
@@ -267,25 +309,38 @@ class MockGroqClient:
 
         return FitCompletions()
 
-# Initialize the Groq client or the Mock client based on the environment variable
-try:
-    from groq import Groq
-    
-    if GROQ_API_KEY:
-        client = Groq(api_key=GROQ_API_KEY)
-        # Custom flag to indicate a successful connection attempt to the real client
-        class GroqPlaceholder(Groq): 
-             def __init__(self, api_key): 
-                 super().__init__(api_key=api_key)
-                 self.client_ready = True
-        client = GroqPlaceholder(api_key=GROQ_API_KEY)
-    else:
-        # Fallback if key is missing but Groq is installed
-        raise ValueError("GROQ_API_KEY not set. Using Mock Client.")
-        
-except (ImportError, ValueError, NameError) as e:
-    # Fallback to Mock Client if import fails or key is missing
-    client = MockGroqClient()
+# The Groq client (or the Mock client) is built on first use, so importing this module
+# does not import groq or open an HTTP client.
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Returns the Groq client, or the Mock client if groq is missing or the key is not set."""
+    global _client
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is not None:
+            return _client
+        try:
+            from groq import Groq
+
+            if not GROQ_API_KEY:
+                # Fallback if key is missing but Groq is installed
+                raise ValueError("GROQ_API_KEY not set. Using Mock Client.")
+
+            # Custom flag to indicate a successful connection attempt to the real client
+            class GroqPlaceholder(Groq):
+                def __init__(self, api_key):
+                    super().__init__(api_key=api_key)
+                    self.client_ready = True
+            _client = GroqPlaceholder(api_key=GROQ_API_KEY)
+
+        except (ImportError, ValueError, NameError):
+            # Fallback to Mock Client if import fails or key is missing
+            _client = MockGroqClient()
+    return _client
     
 # --- END API SETUP ---
 
@@ -303,6 +358,10 @@ def clear_interview_state(mode):
         if 'interview_qa_jd' in st.session_state: del st.session_state['interview_qa_jd']
         if 'evaluation_report_jd' in st.session_state: del st.session_state['evaluation_report_jd']
     
+    # The selected question bank is loaded again (with empty answers) on the next render
+    st.session_state.pop(f'iq_bank_loaded_{mode}', None)
+    st.session_state.pop(f'interview_scores_{mode}', None)
+
     # Also clear the gap analysis plan when interview state is cleared (as it's derived from the match)
     if 'gap_analysis_plan' in st.session_state: del st.session_state['gap_analysis_plan']
 
@@ -318,41 +377,45 @@ def get_file_type(file_name):
     else: return 'unknown' 
 
 def extract_content(file_type, file_content_bytes, file_name):
-    """Extracts text content from uploaded file content (bytes)."""
+    """Extracts text content from uploaded file content (bytes or a zero-copy memoryview)."""
     text = ''
     excel_data = None
     try:
+        # Parser libraries (and pandas) are imported on first use of each file type
         if file_type == 'pdf':
-            with pdfplumber.open(BytesIO(file_content_bytes)) as pdf:
+            import pdfplumber
+            with pdfplumber.open(open_buffer_stream(file_content_bytes)) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
                     if page_text:
                         text += page_text + '\n'
         
         elif file_type == 'docx':
-            doc = docx.Document(BytesIO(file_content_bytes))
+            import docx
+            doc = docx.Document(open_buffer_stream(file_content_bytes))
             text = '\n'.join([para.text for para in doc.paragraphs])
         
         elif file_type == 'txt':
             try:
                 # Try UTF-8 first, fallback to Latin-1
-                text = file_content_bytes.decode('utf-8')
+                text = buffer_to_text(file_content_bytes, 'utf-8')
             except UnicodeDecodeError:
-                 text = file_content_bytes.decode('latin-1')
+                 text = buffer_to_text(file_content_bytes, 'latin-1')
         
         elif file_type == 'json':
             try:
-                text = file_content_bytes.decode('utf-8')
+                text = buffer_to_text(file_content_bytes, 'utf-8')
                 text = "--- JSON Content Start ---\n" + text + "\n--- JSON Content End ---"
             except UnicodeDecodeError:
                 return f"[Error] JSON content extraction failed: Unicode Decode Error.", None
         
         elif file_type == 'excel':
             try:
+                import pandas as pd
                 if file_name.endswith('.csv'):
-                    df = pd.read_csv(BytesIO(file_content_bytes))
+                    df = pd.read_csv(open_buffer_stream(file_content_bytes))
                 else: 
-                    xls = pd.ExcelFile(BytesIO(file_content_bytes))
+                    xls = pd.ExcelFile(open_buffer_stream(file_content_bytes))
                     all_sheets_data = {}
                     for sheet_name in xls.sheet_names:
                         df = pd.read_excel(xls, sheet_name=sheet_name)
@@ -405,9 +468,9 @@ def parse_resume_with_llm(text):
         except json.JSONDecodeError:
             return {"name": get_fallback_name(), "error": f"LLM Input Error: Could not decode uploaded JSON content into a valid structure."}
             
-    if isinstance(client, MockGroqClient) or not GROQ_API_KEY:
+    if isinstance(get_client(), MockGroqClient) or not GROQ_API_KEY:
         try:
-            completion = client.chat().create(model=GROQ_MODEL, messages=[{}])
+            completion = get_client().chat().create(model=GROQ_MODEL, messages=[{}])
             content = completion.choices[0].message.content.strip()
             parsed_data = json.loads(content)
             
@@ -438,7 +501,7 @@ def parse_resume_with_llm(text):
     json_str = ""
     
     try:
-        response = client.chat.completions.create( 
+        response = get_client().chat.completions.create( 
             model=GROQ_MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.2,
@@ -487,9 +550,17 @@ def parse_and_store_resume(content_source, file_name_key, source_type):
         uploaded_file = content_source
         file_name = uploaded_file.name
         file_type = get_file_type(file_name)
-        uploaded_file.seek(0) 
         st.session_state.current_parsing_source_name = file_name 
-        extracted_text, excel_data = extract_content(file_type, uploaded_file.getvalue(), file_name)
+
+        # Read the upload through a memoryview (no copy) and release it as soon as text is extracted
+        buffer, budget_error = acquire_upload_buffer(uploaded_file)
+        if budget_error:
+            extracted_text = f"[Error] {budget_error}"
+        else:
+            try:
+                extracted_text, excel_data = extract_content(file_type, buffer, file_name)
+            finally:
+                release_upload_buffer(uploaded_file, buffer)
     elif source_type == 'text':
         extracted_text = content_source.strip()
         file_name = "Pasted_Text"
@@ -519,6 +590,9 @@ def parse_and_store_resume(content_source, file_name_key, source_type):
 
     # Ensure final_name uses the parsed name
     final_name = parsed_data.get('name', 'Unknown_Candidate').replace(' ', '_') 
+
+    # Build the Q&A chunk index now, so chat turns only score chunks
+    get_resume_index(compiled_text)
     
     return {
         "parsed": parsed_data, 
@@ -527,9 +601,11 @@ def parse_and_store_resume(content_source, file_name_key, source_type):
         "name": final_name
     }
 
-def get_download_link(data, filename, file_format, title="Parsed Data"):
+@st.cache_data(show_spinner=False, max_entries=DOWNLOAD_CACHE_ENTRIES)
+def build_download_artifact(data, filename, file_format, title="Parsed Data"):
     """
-    Generates a base64 encoded download link for the given data and format.
+    Encodes a download as (bytes, mime type). Cached on the content, so preparing the same
+    document again (or re-opening the tab) does not rebuild it.
     """
     mime_type = "application/octet-stream"
     
@@ -570,53 +646,42 @@ def get_download_link(data, filename, file_format, title="Parsed Data"):
         data_bytes = html_content.encode('utf-8')
         mime_type = "text/html"
     else:
-        return "" 
-
-    b64 = base64.b64encode(data_bytes).decode()
-    
-    # Return the full data URI
-    return f"data:{mime_type};base64,{b64}"
-
-def render_download_button(data_uri, filename, label, color):
-    """Renders an HTML button that triggers a file download."""
-    
-    if color == 'json':
-        bg_color = "#4CAF50" # Green
-        icon = "💾"
-    elif color == 'markdown':
-        bg_color = "#008CBA" # Blue
-        icon = "⬇️"
-    elif color == 'html':
-        bg_color = "#f44336" # Red
-        icon = "📄"
-    elif color == 'cover':
-        bg_color = "#FFC300" # Yellow/Orange
-        icon = "✉️"
+        return b"", mime_type
+
+    return data_bytes, mime_type
+
+def _reset_prepared_download(prepared_key):
+    st.session_state.pop(prepared_key, None)
+
+def render_download_button(key, make_data, filename, label, file_format, title="Parsed Data"):
+    """
+    Two-step download. A 'Prepare' button builds the file only when clicked (make_data is not
+    called before that), then st.download_button serves it from Streamlit's media endpoint
+    rather than embedding it in the page as a base64 data URI. Downloading resets the button.
+    For 'zip', make_data must return the archive bytes from its own cache, since it runs on
+    every rerun while the button is prepared.
+    """
+    prepared_key = f"download_prepared_{key}"
+    if not st.session_state.get(prepared_key):
+        if not st.button(label.replace("Download", "Prepare", 1), key=f"prepare_{key}", help=filename, use_container_width=True):
+            return
+        st.session_state[prepared_key] = True
+
+    if file_format == 'zip':
+        # make_data returns the finished (already cached) archive
+        data_bytes, mime_type = make_data(), "application/zip"
     else:
-        bg_color = "#555555"
-        icon = ""
-        
-    st.markdown(
-        f"""
-        <a href="{data_uri}" download="{filename}" style="text-decoration: none;">
-            <button style="
-                background-color: {bg_color}; 
-                color: white; 
-                border: none; 
-                padding: 10px 10px; 
-                text-align: center; 
-                text-decoration: none; 
-                display: inline-block; 
-                font-size: 14px; 
-                margin: 4px 0; 
-                cursor: pointer; 
-                border-radius: 4px;
-                width: 100%;">
-                {icon} {label}
-            </button>
-        </a>
-        """, 
-        unsafe_allow_html=True
+        data_bytes, mime_type = build_download_artifact(make_data(), filename, file_format, title)
+    st.download_button(
+        label=label,
+        data=data_bytes,
+        file_name=filename,
+        mime=mime_type,
+        key=f"download_{key}",
+        on_click=_reset_prepared_download,
+        args=(prepared_key,),
+        type="primary",
+        use_container_width=True
     )
     
 # --- END HELPER FUNCTIONS ---
@@ -661,14 +726,14 @@ def evaluate_jd_fit(job_description, parsed_json):
     Evaluates how well a resume fits a given job description, 
     including section-wise scores, by calling the Groq LLM API.
     """
-    global client, GROQ_MODEL, GROQ_API_KEY
+    global GROQ_MODEL, GROQ_API_KEY
     
     if parsed_json.get('error') is not None: 
          return f"Cannot evaluate due to resume parsing errors: {parsed_json['error']}"
 
-    if isinstance(client, MockGroqClient) or not GROQ_API_KEY:
+    if isinstance(get_client(), MockGroqClient) or not GROQ_API_KEY:
          # Mock Client is hardcoded to return a structured output including Gaps.
-         response = client.chat().create(model=GROQ_MODEL, messages=[{"role": "user", "content": f"Evaluate how well the following resume content matches the provided job description: {job_description}"}])
+         response = get_client().chat().create(model=GROQ_MODEL, messages=[{"role": "user", "content": f"Evaluate how well the following resume content matches the provided job description: {job_description}"}])
          return response.choices[0].message.content.strip()
 
     if not job_description.strip(): return "Please paste a job description."
@@ -714,7 +779,7 @@ def evaluate_jd_fit(job_description, parsed_json):
     """
 
     try:
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model=GROQ_MODEL, 
             messages=[{"role": "user", "content": prompt}], 
             temperature=0.3
@@ -724,26 +789,12 @@ def evaluate_jd_fit(job_description, parsed_json):
         error_output = f"AI Evaluation Error: Failed to connect or receive response from LLM. Error: {e}\n{traceback.format_exc()}"
         return error_output
 
-def generate_cover_letter_llm(jd_content, parsed_json, preferred_style="Standard"):
+def write_cover_letter(jd_content, digest, jd_role, preferred_style="Standard"):
     """
-    Generates a cover letter based on JD and parsed resume data.
+    Writes one cover letter from a resume digest (see cover_letters.resume_digest). Safe to run
+    off the script thread (no st.* calls), so batch generation can run several at once.
     """
-    global client, GROQ_MODEL, GROQ_API_KEY
-    
-    if parsed_json.get('error') is not None: 
-         return f"Cannot generate cover letter due to resume parsing errors: {parsed_json['error']}"
-
-    if not jd_content.strip(): return "Please provide a Job Description to generate the letter."
-
-    candidate_name = parsed_json.get('name', 'The Candidate')
-    candidate_email = parsed_json.get('email', '[Candidate Email]')
-    # Ensure list items are strings before joining
-    candidate_skills = ", ".join([str(s) for s in parsed_json.get('skills', [])])
-    candidate_experience = "\n".join([str(e) for e in parsed_json.get('experience', [])])
-    
-    jd_metadata = extract_jd_metadata(jd_content)
-    # Safely get the role from metadata (which is now guaranteed to be a dict)
-    jd_role = jd_metadata.get('role', 'the position')
+    global GROQ_MODEL, GROQ_API_KEY
 
     prompt = f"""
     You are an expert cover letter generator. Your task is to write a highly professional, engaging, and concise cover letter 
@@ -757,10 +808,10 @@ def generate_cover_letter_llm(jd_content, parsed_json, preferred_style="Standard
     5.  **Output Format:** Output the letter text only, using double newlines for paragraph separation. Include placeholders like [Date], [Hiring Manager Name/Title, if known], and [Company Name] where necessary. Use bold formatting for the job title.
     
     --- Candidate Information ---
-    Candidate Name: {candidate_name}
-    Candidate Contact: {candidate_email}
-    Key Skills: {candidate_skills}
-    Relevant Experience: {candidate_experience}
+    Candidate Name: {digest['name']}
+    Candidate Contact: {digest['email']}
+    Key Skills: {digest['skills']}
+    Relevant Experience: {digest['experience']}
     
     --- Job Description Information ---
     Job Description Role: {jd_role}
@@ -768,12 +819,12 @@ def generate_cover_letter_llm(jd_content, parsed_json, preferred_style="Standard
     {jd_content}
     """
     
-    if isinstance(client, MockGroqClient) or not GROQ_API_KEY:
-         response = client.chat().create(model=GROQ_MODEL, messages=[{"role": "user", "content": prompt}])
+    if isinstance(get_client(), MockGroqClient) or not GROQ_API_KEY:
+         response = get_client().chat().create(model=GROQ_MODEL, messages=[{"role": "user", "content": prompt}])
          return response.choices[0].message.content.strip()
 
     try:
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model=GROQ_MODEL, 
             messages=[{"role": "user", "content": prompt}], 
             temperature=0.7 
@@ -783,18 +834,64 @@ def generate_cover_letter_llm(jd_content, parsed_json, preferred_style="Standard
         error_output = f"AI Generation Error: Failed to connect or receive response from LLM. Error: {e}\n{traceback.format_exc()}"
         return error_output
 
+def generate_cover_letter_llm(jd_content, parsed_json, preferred_style="Standard", jd_role=None):
+    """
+    Generates a cover letter based on JD and parsed resume data.
+    Pass the JD's stored role as jd_role to skip re-extracting the JD metadata.
+    """
+    if parsed_json.get('error') is not None: 
+         return f"Cannot generate cover letter due to resume parsing errors: {parsed_json['error']}"
+
+    if not jd_content.strip(): return "Please provide a Job Description to generate the letter."
+
+    if not jd_role:
+        # Safely get the role from metadata (which is now guaranteed to be a dict)
+        jd_role = extract_jd_metadata(jd_content).get('role', 'the position')
+
+    jd = {"content": jd_content, "role": jd_role}
+    letter, _ = generate_letter_cached(write_cover_letter, resume_digest(parsed_json), jd, preferred_style)
+    return letter
+
 def generate_gap_course_plan(gap_analysis_text, jd_role, candidate_skills):
     """
     Generates a detailed course plan and certification suggestions to fill identified gaps.
+    Plans are shared across candidates: the gaps are reduced to canonical skills (see course_plans.py)
+    and the plan is cached per (role, gap set), or composed from cached per-skill fragments.
     """
-    global client, GROQ_MODEL, GROQ_API_KEY
-    
     if not gap_analysis_text.strip() or "No significant gaps" in gap_analysis_text:
         return "No specific gaps were identified in the match analysis. Focus on advanced skills in your core area."
-        
-    if isinstance(client, MockGroqClient) or not GROQ_API_KEY:
+
+    try:
+        plan, _ = get_gap_course_plan(
+            gap_analysis_text, jd_role,
+            generate_fragments_fn=generate_gap_skill_fragments,
+            generate_plan_fn=lambda text: generate_full_gap_course_plan(text, jd_role, candidate_skills),
+            # The mock client's canned plan must not be shared as a real one
+            cache_text_plans=not (isinstance(get_client(), MockGroqClient) or not GROQ_API_KEY)
+        )
+        return plan
+    except Exception as e:
+        return f"AI Generation Error: Failed to connect or receive response from LLM for course plan. Error: {e}\n{traceback.format_exc()}"
+
+def generate_gap_skill_fragments(jd_role, skills):
+    """Per-skill plan fragments for skills not cached yet, in one model call ({} keeps the local templates)."""
+    if isinstance(get_client(), MockGroqClient) or not GROQ_API_KEY:
+        return {}
+
+    response = get_client().chat.completions.create(
+        model=GROQ_MODEL,
+        messages=[{"role": "user", "content": build_fragment_prompt(jd_role, skills)}],
+        temperature=0.4
+    )
+    return parse_fragments(response.choices[0].message.content, skills)
+
+def generate_full_gap_course_plan(gap_analysis_text, jd_role, candidate_skills):
+    """Whole-plan generation, for gap text that names no skill from the ontology."""
+    global GROQ_MODEL, GROQ_API_KEY
+
+    if isinstance(get_client(), MockGroqClient) or not GROQ_API_KEY:
          # Mock client returns a hardcoded, structured plan (see MockGroqClient)
-         response = client.chat().create(model=GROQ_MODEL, messages=[{"role": "user", "content": f"Generate a detailed course plan and suggest relevant certifications for Gaps Identified: {gap_analysis_text}"}])
+         response = get_client().chat().create(model=GROQ_MODEL, messages=[{"role": "user", "content": f"Generate a detailed course plan and suggest relevant certifications for Gaps Identified: {gap_analysis_text}"}])
          return response.choices[0].message.content.strip()
 
     prompt = f"""
@@ -815,7 +912,7 @@ def generate_gap_course_plan(gap_analysis_text, jd_role, candidate_skills):
     """
 
     try:
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model=GROQ_MODEL, 
             messages=[{"role": "user", "content": prompt}], 
             temperature=0.6 
@@ -833,7 +930,7 @@ def generate_interview_questions(source_data, source_type, identifier):
     source_type can be 'resume' (source_data is parsed_json) or 'jd' (source_data is jd_content string).
     identifier is the section name (e.g., 'Skills') or JD name.
     """
-    global client, GROQ_MODEL
+    global GROQ_MODEL
     
     if source_type == 'resume':
         target_section_display = identifier
@@ -893,10 +990,10 @@ def generate_interview_questions(source_data, source_type, identifier):
     """
 
     try:
-        if isinstance(client, MockGroqClient) or not GROQ_API_KEY:
-             response = client.chat().create(model=GROQ_MODEL, messages=[{"role": "user", "content": prompt}])
+        if isinstance(get_client(), MockGroqClient) or not GROQ_API_KEY:
+             response = get_client().chat().create(model=GROQ_MODEL, messages=[{"role": "user", "content": prompt}])
         else:
-            response = client.chat.completions.create(
+            response = get_client().chat.completions.create(
                 model=GROQ_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.8
@@ -904,62 +1001,24 @@ def generate_interview_questions(source_data, source_type, identifier):
         return response.choices[0].message.content.strip()
             
     except Exception as e:
+        # No st.* here: question banks call this from background threads; callers show the error
         error_msg = f"AI Question Generation Error: {e}\nTrace: {traceback.format_exc()}"
-        st.error(error_msg)
         return f"Error generating questions: {error_msg}"
 
 
-def evaluate_interview_answers(qa_list, resume_context):
-    """
-    Evaluates a list of candidate's recorded answers based on the questions and resume context.
-    The output is a full markdown report.
-    """
-    global client, GROQ_MODEL
-    
-    # Format Q&A for LLM
-    qa_exchange = "\n\n--- Candidate Answers ---\n\n"
-    for i, item in enumerate(qa_list):
-        # Ensure question and answer are strings
-        question = str(item['question'].replace(f"({item['level']})", '').strip())
-        answer = str(item['answer'])
-        qa_exchange += f"Q{i+1} ({item['level']}): {question}\n"
-        qa_exchange += f"Answer {i+1}: {answer}\n"
-        qa_exchange += "---"
+def score_interview_answer(number, item, excerpts):
+    """Scores one recorded answer against only the resume/JD excerpts relevant to it."""
+    if isinstance(get_client(), MockGroqClient) or not GROQ_API_KEY:
+        return heuristic_feedback(item, excerpts)
 
-    prompt = f"""
-    You are an expert interviewer evaluating a candidate's recorded answers.
-    
-    **Evaluation Task:**
-    Evaluate the candidate's answers based on the provided questions and their resume/JD context.
-    
-    **Instructions for Report:**
-    1.  Provide an **Overall Score (X/10)** at the beginning of the report.
-    2.  Give a **Summary** of the candidate's performance (e.g., strength in technical depth, weakness in behavioral structure).
-    3.  For **each question** answered, provide specific, actionable, constructive feedback. Use markdown headings (e.g., **Q1 Feedback**).
-    4.  Ensure the report is professional and directly addresses consistency with the context.
-    
-    --- Context Used for Interview ---
-    {resume_context}
-    
-    --- Interview Exchange ---
-    {qa_exchange}
-    
-    ---
-    **Output the evaluation report clearly using markdown.**
-    """
+    response = get_client().chat.completions.create(
+        model=GROQ_MODEL,
+        messages=[{"role": "user", "content": build_scoring_prompt(number, item, excerpts)}],
+        temperature=0.3,
+        max_tokens=300
+    )
+    return response.choices[0].message.content.strip()
 
-    try:
-        if isinstance(client, MockGroqClient) or not GROQ_API_KEY:
-             response = client.chat().create(model=GROQ_MODEL, messages=[{"role": "user", "content": prompt}])
-        else:
-            response = client.chat.completions.create(
-                model=GROQ_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.5
-            )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        return f"Evaluation Error: Failed to connect to LLM for scoring. Error: {e}"
 
 # --- END ADAPTED LLM Functions ---
 
@@ -1002,17 +1061,21 @@ def resume_parsing_tab():
         
         file_to_parse = None
         if uploaded_file is not None:
-            if not st.session_state.candidate_uploaded_resumes or st.session_state.candidate_uploaded_resumes[0].name != uploaded_file.name:
-                st.session_state.candidate_uploaded_resumes = [uploaded_file] 
+            # Only lightweight metadata is kept in session state; the upload buffer stays owned by the widget
+            if not st.session_state.candidate_uploaded_resumes or st.session_state.candidate_uploaded_resumes[0]['name'] != uploaded_file.name:
+                st.session_state.candidate_uploaded_resumes = [{"name": uploaded_file.name, "size": uploaded_file.size}] 
                 st.session_state.pasted_cv_text = "" 
                 st.toast("Resume file uploaded successfully.")
-            file_to_parse = st.session_state.candidate_uploaded_resumes[0]
+            file_to_parse = uploaded_file
         elif st.session_state.candidate_uploaded_resumes and uploaded_file is None:
             st.session_state.candidate_uploaded_resumes = []
-            st.session_state.parsed = {}
-            st.session_state.full_text = ""
-            st.session_state.excel_data = None
-            st.toast("Upload cleared.")
+            # In lazy navigation the uploader is unmounted while another view is open and comes back
+            # empty; that is not the user removing the file, so the parsed resume is kept.
+            if not st.session_state.get('candidate_view_changed'):
+                st.session_state.parsed = {}
+                st.session_state.full_text = ""
+                st.session_state.excel_data = None
+                st.toast("Upload cleared.")
         
         st.markdown("### 2. Parse Uploaded File")
         
@@ -1113,6 +1176,15 @@ def resume_parsing_tab():
                     st.session_state.excel_data = result['excel_data'] 
             
     st.markdown("---")
+
+    # --- Session Memory Usage ---
+    memory_report = session_memory_report()
+    with st.expander(f"Session memory: {format_bytes(memory_report['total_bytes'])} ({format_bytes(memory_report['spilled_bytes'])} on disk)"):
+        st.caption(f"Upload bytes processed this session: {format_bytes(st.session_state.get('upload_bytes_processed', 0))}")
+        st.dataframe(
+            [{"Session Key": key, "Size": format_bytes(size)} for key, size in memory_report['by_key'][:15]],
+            use_container_width=True, hide_index=True
+        )
 # ----------next tab cv management-----------------------------------        
 def convert_to_json(data):
     """Converts the structured CV data dictionary into a formatted JSON string."""
@@ -1290,7 +1362,7 @@ def cv_management_tab():
     st.subheader("6. Strengths")
     st.session_state.cv_data['strengths_raw'] = st.text_area(
         "Enter your key strengths (one per line)",
-        value=st.session_state.cv_data['strengths_raw'],
+        value=st.session_state.cv_data.get('strengths_raw', ''),
         key='cv_strengths_input',
         height=150
     )
@@ -1396,6 +1468,12 @@ def cv_management_tab():
         st.rerun()
         
 # --- JD Management Tab Function ---
+
+def add_candidate_jd(jd_item):
+    """Adds a JD to the candidate's list and persists it under the logged-in user."""
+    st.session_state.candidate_jd_list.append(jd_item)
+    if st.session_state.get('user_email'):
+        get_repository().add_jd(st.session_state.user_email, jd_item)
         
 def jd_management_tab_candidate():
     """JD Management Tab."""
@@ -1478,7 +1556,7 @@ def jd_management_tab_candidate():
                             
                         name = f"JD for {metadata.get('role', 'Unknown Role')}"
                         # Store metadata directly into the list item
-                        st.session_state.candidate_jd_list.append({"name": name, "content": jd_text, **metadata})
+                        add_candidate_jd({"name": name, "content": jd_text, **metadata})
                         count += 1
                             
                     if count > 0:
@@ -1504,7 +1582,7 @@ def jd_management_tab_candidate():
                                 
                             name_base = metadata.get('role', f"Pasted JD {len(st.session_state.candidate_jd_list) + i + 1}")
                             # Store metadata directly into the list item
-                            st.session_state.candidate_jd_list.append({"name": name_base, "content": text, **metadata})
+                            add_candidate_jd({"name": name_base, "content": text, **metadata})
                             count += 1
                     
                     if count > 0:
@@ -1536,8 +1614,14 @@ def jd_management_tab_candidate():
                     if file:
                         with st.spinner(f"Extracting content from {file.name}..."):
                             file_type = get_file_type(file.name)
-                            file.seek(0)
-                            jd_text, _ = extract_content(file_type, file.getvalue(), file.name)
+                            buffer, budget_error = acquire_upload_buffer(file)
+                            if budget_error:
+                                jd_text = f"[Error] {budget_error}"
+                            else:
+                                try:
+                                    jd_text, _ = extract_content(file_type, buffer, file.name)
+                                finally:
+                                    release_upload_buffer(file, buffer)
                             
                         if not jd_text.startswith("[Error"):
                             metadata = extract_jd_metadata(jd_text)
@@ -1550,7 +1634,7 @@ def jd_management_tab_candidate():
                                 continue
                                 
                             # Store metadata directly into the list item
-                            st.session_state.candidate_jd_list.append({"name": file.name, "content": jd_text, **metadata})
+                            add_candidate_jd({"name": file.name, "content": jd_text, **metadata})
                             count += 1
                         else:
                             st.error(f"Error extracting content from {file.name}: {jd_text}")
@@ -1571,6 +1655,8 @@ def jd_management_tab_candidate():
         with col_clear_button:
             if st.button("🗑️ Clear All JDs", key="clear_jds_candidate", use_container_width=True, help="Removes all currently loaded JDs."):
                 st.session_state.candidate_jd_list = []
+                if st.session_state.get('user_email'):
+                    get_repository().clear_jds(st.session_state.user_email)
                 if 'candidate_match_results' in st.session_state: del st.session_state['candidate_match_results']
                 if 'jd_chatbot_history' in st.session_state: del st.session_state['jd_chatbot_history']
                 if 'gap_analysis_plan' in st.session_state: del st.session_state['gap_analysis_plan']
@@ -1609,7 +1695,7 @@ def jd_batch_match_tab():
     )
     
     # Check if we are running in Mock Mode
-    is_mock_mode = isinstance(client, MockGroqClient) and not GROQ_API_KEY
+    is_mock_mode = isinstance(get_client(), MockGroqClient) and not GROQ_API_KEY
     
     if not is_resume_parsed:
         st.warning("⚠️ Please **upload and parse your resume** in the 'Resume Parsing' tab first.")
@@ -1627,7 +1713,7 @@ def jd_batch_match_tab():
         st.info("ℹ️ Running in **Mock LLM Mode** for fit evaluation. Results are simulated for consistency, but a valid GROQ_API_KEY is recommended for real AI analysis.")
         
     else:
-        if not hasattr(client, 'client_ready') or not client.client_ready:
+        if not hasattr(get_client(), 'client_ready') or not get_client().client_ready:
             st.warning("⚠️ LLM client setup failed or key is missing. Match analysis may not be accurate or available.")
 
 
@@ -1780,12 +1866,19 @@ def jd_batch_match_tab():
          st.markdown("---")
          st.subheader("Detailed Breakdown")
          
-         for item in st.session_state.candidate_match_results:
-             with st.expander(f"Rank {item.get('rank', 'N/A')}: {item['jd_name']}"):
-                 st.markdown(f"**Overall Score:** **{item['overall_score']}/10** | **Education:** {item['education_percent']}% | **Experience:** {item['experience_percent']}% | **Skills:** {item['skills_percent']}%")
-                 st.markdown("---")
-                 st.markdown("##### Full AI Analysis")
-                 st.markdown(item['full_analysis'])
+         def report_summary(item):
+             st.markdown(f"**Overall Score:** **{item['overall_score']}/10** | **Education:** {item['education_percent']}% | **Experience:** {item['experience_percent']}% | **Skills:** {item['skills_percent']}%")
+             st.markdown("---")
+             st.markdown("##### Full AI Analysis")
+
+         match_report_list(
+             st.session_state.candidate_match_results,
+             "candidate_match",
+             lambda item: f"Rank {item.get('rank', 'N/A')}: {item['jd_name']}",
+             lambda item: item['full_analysis'],
+             summary_fn=report_summary,
+             item_key_fn=lambda item: item['jd_name']
+         )
 
     else:
          st.markdown("---")
@@ -1953,17 +2046,10 @@ def parsed_data_tab():
             source_display = source_key.replace('_', ' ').replace('-', ' ') 
 
         base_filename = f"{candidate_name.replace(' ', '_')}_Parsed_Resume"
-        parsed_json_data = json.dumps(st.session_state.parsed, indent=4)
-        parsed_markdown_data = st.session_state.full_text
-        
         json_filename = f"{base_filename}.json"
         md_filename = f"{base_filename}.md"
         html_filename = f"{base_filename}.html"
         
-        json_data_uri = get_download_link(parsed_json_data, json_filename, 'json', title="Parsed Resume Data")
-        md_data_uri = get_download_link(parsed_markdown_data, md_filename, 'markdown', title="Parsed Resume Data")
-        html_data_uri = get_download_link(parsed_markdown_data.replace('\n', '<br>').replace('##', '<h2>'), html_filename, 'html', title="Parsed Resume Data") 
-        
         
         tab_markdown, tab_json, tab_download = st.tabs([
             "📄 Markdown View", 
@@ -1985,10 +2071,12 @@ def parsed_data_tab():
             st.markdown("---")
             st.markdown("##### Download Markdown Data")
             render_download_button(
-                md_data_uri, 
+                "parsed_md",
+                lambda: st.session_state.full_text,
                 md_filename, 
                 f"⬇️ Download Markdown (.md)", 
-                'markdown'
+                'markdown',
+                title="Parsed Resume Data"
             )
 
 
@@ -2002,10 +2090,12 @@ def parsed_data_tab():
             st.markdown("---")
             st.markdown("##### Download JSON Data")
             render_download_button(
-                json_data_uri, 
+                "parsed_json",
+                lambda: json.dumps(st.session_state.parsed, indent=4),
                 json_filename, 
                 f"💾 Download JSON (.json)", 
-                'json'
+                'json',
+                title="Parsed Resume Data"
             )
 
         with tab_download:
@@ -2018,10 +2108,12 @@ def parsed_data_tab():
             with col_html:
                 st.markdown(f"**{html_filename.replace('.html', '.pdf/html')}**", help="Viewable document format.")
                 render_download_button(
-                    html_data_uri, 
+                    "parsed_html",
+                    lambda: st.session_state.full_text.replace('\n', '<br>').replace('##', '<h2>'),
                     html_filename, 
                     f"📄 Download HTML (PDF Sim.)", 
-                    'html'
+                    'html',
+                    title="Parsed Resume Data"
                 )
                 
             st.markdown("---")
@@ -2035,6 +2127,7 @@ def parsed_data_tab():
 
 # --- Cover Letter Generation Tab (unchanged logic, just re-check for clarity) ---
 
+@timed_fragment("candidate:cover_letter")
 def generate_cover_letter_tab():
     """Cover Letter Tab. Ensures resume is taken from parsed data."""
     st.header("✉️ Generate Cover Letter")
@@ -2075,7 +2168,7 @@ def generate_cover_letter_tab():
     with col_style:
         style = st.selectbox(
             "Select Letter Style/Tone",
-            options=["Standard", "Enthusiastic", "Professional", "Concise"],
+            options=COVER_LETTER_STYLES,
             key="cl_style"
         )
         
@@ -2088,11 +2181,12 @@ def generate_cover_letter_tab():
                 letter_text = generate_cover_letter_llm(
                     jd_content=selected_jd.get('content', ''), 
                     parsed_json=st.session_state.parsed, # RESUME IS TAKEN FROM HERE
-                    preferred_style=style
+                    preferred_style=style,
+                    jd_role=selected_jd.get('role')
                 )
                 st.session_state.generated_cover_letter = letter_text
                 st.session_state.cl_jd_name = selected_jd_name 
-                st.rerun()
+                rerun_panel()
                 
     st.markdown("---")
     
@@ -2120,39 +2214,107 @@ def generate_cover_letter_tab():
         html_filename = f"{base_filename}.html"
         txt_filename = f"{base_filename}.txt"
         
-        html_data_uri = get_download_link(
-            final_letter_text, 
-            html_filename, 
-            'html',
-            title=f"Cover Letter for {jd_role}"
-        )
-        txt_data_uri = get_download_link(
-            final_letter_text, 
-            txt_filename, 
-            'text',
-            title=f"Cover Letter for {jd_role}"
-        )
-        
         col_html_dl, col_txt_dl = st.columns(2)
         
         with col_html_dl:
             render_download_button(
-                html_data_uri, 
+                "cover_html",
+                lambda: final_letter_text,
                 html_filename, 
                 f"📄 Download as HTML (Print to PDF)", 
-                'cover'
+                'html',
+                title=f"Cover Letter for {jd_role}"
             )
             
         with col_txt_dl:
             render_download_button(
-                txt_data_uri, 
+                "cover_txt",
+                lambda: final_letter_text,
                 txt_filename, 
                 f"⬇️ Download as Plain Text (.txt)", 
-                'markdown'
+                'text',
+                title=f"Cover Letter for {jd_role}"
             )
             
     elif "generated_cover_letter" not in st.session_state or not st.session_state.generated_cover_letter:
         st.info("Select a Job Description and click 'Generate Cover Letter' to begin.")
+
+    st.markdown("---")
+    batch_cover_letter_section(jd_names, style)
+
+
+@st.cache_data(show_spinner="Building ZIP archive...", max_entries=DOWNLOAD_CACHE_ENTRIES)
+def build_cover_letters_zip(results_key, candidate_name, _results):
+    """ZIP of a batch of letters, cached on results_key (a hash of the letters) rather than on the letters themselves."""
+    return build_letters_zip(
+        _results, candidate_name,
+        lambda letter, filename, title: build_download_artifact(letter, filename, 'html', title)[0]
+    )
+
+
+def batch_cover_letter_section(jd_names, default_style):
+    """Generates letters for several JDs (and styles) at once and offers them as one ZIP download."""
+    st.subheader("📦 Batch Cover Letters")
+    st.caption("Letters are generated concurrently; combinations generated before are reused.")
+
+    # A kept selection may name a JD that has since been removed
+    if "batch_cl_jds" in st.session_state:
+        st.session_state.batch_cl_jds = [name for name in st.session_state.batch_cl_jds if name in jd_names]
+
+    col_jds, col_styles = st.columns([2, 1])
+    with col_jds:
+        batch_jd_names = st.multiselect("Job Descriptions", options=jd_names, default=jd_names, key="batch_cl_jds")
+    with col_styles:
+        batch_styles = st.multiselect("Styles", options=COVER_LETTER_STYLES, default=[default_style], key="batch_cl_styles")
+
+    job_count = len(batch_jd_names) * len(batch_styles)
+    if st.button(f"✨ Generate {job_count} Cover Letter(s)", key="batch_cl_generate", disabled=job_count == 0, use_container_width=True):
+        jds = [jd for jd in st.session_state.candidate_jd_list if jd.get('name') in batch_jd_names]
+        digest = resume_digest(st.session_state.parsed)
+        progress = st.progress(0.0, text="Generating cover letters...")
+        results = []
+        for result in generate_letters(jds, batch_styles, digest, write_cover_letter):
+            results.append(result)
+            progress.progress(len(results) / job_count, text=f"Generated {len(results)} of {job_count}: {result['jd_name']} ({result['style']})")
+        progress.empty()
+        order = {(name, s): i for i, (name, s) in enumerate((n, s) for n in batch_jd_names for s in batch_styles)}
+        st.session_state.batch_cover_letters = sorted(results, key=lambda r: order.get((r['jd_name'], r['style']), 0))
+        st.session_state.pop("download_prepared_cover_batch_zip", None)
+
+    results = st.session_state.get('batch_cover_letters') or []
+    if not results:
+        return
+
+    failed = [r for r in results if r['letter'].startswith(FAILED_LETTER_PREFIXES)]
+    st.dataframe(
+        [{"Job Description": r['jd_name'], "Style": r['style'],
+          "Status": "❌ Failed" if r in failed else ("Reused" if r['cached'] else "Generated")} for r in results],
+        hide_index=True,
+        use_container_width=True
+    )
+    for r in failed:
+        st.error(f"{r['jd_name']} ({r['style']}): {r['letter'].splitlines()[0]}")
+
+    col_open, col_zip = st.columns(2)
+    with col_open:
+        ok = [r for r in results if r not in failed]
+        labels = [f"{r['jd_name']} ({r['style']})" for r in ok]
+        if labels:
+            picked = st.selectbox("Open a letter in the editor above", options=range(len(ok)), format_func=lambda i: labels[i], key="batch_cl_open")
+            if st.button("✏️ Open in Editor", key="batch_cl_open_btn", use_container_width=True):
+                st.session_state.generated_cover_letter = ok[picked]['letter']
+                st.session_state.cl_jd_name = ok[picked]['jd_name']
+                st.session_state.pop("final_cover_letter_edit", None)
+                rerun_panel()
+    with col_zip:
+        candidate_name = st.session_state.parsed.get('name', 'Candidate').replace(' ', '_')
+        render_download_button(
+            "cover_batch_zip",
+            lambda: build_cover_letters_zip(letters_results_key(results), candidate_name, results),
+            f"{candidate_name}_CoverLetters.zip",
+            "🗜️ Download All (HTML + TXT, .zip)",
+            'zip'
+        )
         
 # --- Interview Preparation Tab (UPDATED) ---
 
@@ -2185,6 +2347,9 @@ def display_evaluation_form(mode, qa_data_list, context_for_eval):
         st.markdown("---")
         st.subheader("2. Practice and Record Answers")
         
+        # Per-answer results of earlier submits; unchanged answers are not scored again
+        current_scores_key = f'interview_scores_{mode}'
+
         with st.form(f"interview_practice_form_{mode}"):
             
             # Use the actual list from session state for mutation
@@ -2211,25 +2376,38 @@ def display_evaluation_form(mode, qa_data_list, context_for_eval):
                 
             submit_button = st.form_submit_button("Submit & Evaluate Answers", use_container_width=True, type="primary")
 
-            if submit_button:
-                
-                if all(item['answer'].strip() for item in current_qa_list):
-                    with st.spinner("Sending answers to AI Evaluator..."):
-                        try:
-                            # Use the adapted evaluation function
-                            report = evaluate_interview_answers(
-                                current_qa_list,
-                                context_for_eval # Full resume text or JD content
-                            )
-                            st.session_state[current_report_key] = report
-                            st.success("Evaluation complete! See the report below.")
-                        except Exception as e:
-                            st.error(f"Evaluation failed: {e}")
-                            st.session_state[current_report_key] = f"Evaluation failed: {e}\n{traceback.format_exc()}"
+        streamed_report = False
+        if submit_button:
+            
+            if all(item['answer'].strip() for item in current_qa_list):
+                st.markdown("---")
+                st.subheader("3. AI Evaluation Report")
+                summary_slot = st.empty()
+                progress = st.progress(0.0, text="Scoring answers...")
+                # One slot per question, filled in as each scoring job finishes
+                feedback_slots = [st.empty() for _ in current_qa_list]
+
+                previous = st.session_state.get(current_scores_key, {})
+                results = []
+                try:
+                    for result in score_answers(current_qa_list, context_for_eval, score_interview_answer, previous):
+                        results.append(result)
+                        feedback_slots[result['index']].markdown(format_question_feedback(result) + "\n\n---")
+                        progress.progress(len(results) / len(current_qa_list), text=f"Scored {len(results)} of {len(current_qa_list)} answers")
+                except Exception as e:
+                    st.error(f"Evaluation failed: {e}")
+                    st.session_state[current_report_key] = f"Evaluation failed: {e}\n{traceback.format_exc()}"
                 else:
-                    st.error("Please answer all generated questions before submitting.")
+                    progress.empty()
+                    summary_slot.markdown(format_summary(aggregate_scores(results)))
+                    st.session_state[current_scores_key] = {r['key']: r for r in results}
+                    st.session_state[current_report_key] = compose_report(results)
+                    st.success("Evaluation complete!")
+                    streamed_report = True
+            else:
+                st.error("Please answer all generated questions before submitting.")
         
-        if st.session_state.get(current_report_key):
+        if st.session_state.get(current_report_key) and not streamed_report:
             st.markdown("---")
             st.subheader("3. AI Evaluation Report")
             st.markdown(st.session_state[current_report_key])
@@ -2240,6 +2418,90 @@ def display_evaluation_form(mode, qa_data_list, context_for_eval):
             st.success("Practice session cleared.")
             st.rerun()
 
+# --- Interview Question Banks (generated in the background, see question_bank.py) ---
+
+INTERVIEW_EXCLUDED_SECTIONS = ('name', 'email', 'phone', 'error', 'linkedin', 'github', 'personal_details')
+
+
+def resume_question_sections(parsed):
+    """{section label: section text} for every non-empty resume section questions can target, sorted by label."""
+    sections = {}
+    for key, value in parsed.items():
+        if key in INTERVIEW_EXCLUDED_SECTIONS or not value or not str(value).strip():
+            continue
+        sections[key.replace('_', ' ').title()] = "\n".join(str(item) for item in value) if isinstance(value, list) else str(value)
+    return dict(sorted(sections.items()))
+
+
+def generate_bank_questions(source_type, label, content):
+    """Question bank generator: a resume section (label, text) or a JD (name, content)."""
+    if source_type == 'resume':
+        return generate_interview_questions({label.lower().replace(' ', '_'): content}, 'resume', label)
+    return generate_interview_questions(label, 'jd', content)
+
+
+def prefetch_interview_question_banks():
+    """
+    Queues question banks for every resume section and loaded JD once they appear (after
+    parsing or adding JDs), so the Interview Preparation selectboxes switch instantly.
+    """
+    if not QUESTION_BANK_PREFETCH:
+        return
+    parsed = st.session_state.get('parsed') or {}
+    jd_list = st.session_state.get('candidate_jd_list') or []
+    # Cheap change check, so unchanged reruns do not rehash section and JD texts
+    signature = (id(parsed), len(parsed), tuple(jd.get('name') for jd in jd_list))
+    if st.session_state.get('question_bank_signature') == signature:
+        return
+    st.session_state.question_bank_signature = signature
+
+    sources = []
+    if parsed.get('name') and parsed.get('error') is None:
+        sources += [('resume', label, content) for label, content in resume_question_sections(parsed).items()]
+    sources += [('jd', jd['name'], jd['content']) for jd in jd_list if jd.get('name') and (jd.get('content') or '').strip()]
+    get_question_bank(generate_bank_questions).prefetch(sources)
+
+
+def load_interview_question_bank(mode, label, content):
+    """
+    Shows the question bank of the selected resume section or JD: waits for it if it is still
+    being generated, or generates it on click when there is none. Switching the selectbox back
+    and forth reuses the banks; a new bank (or another selection) starts a fresh practice session.
+    """
+    source = (mode, label, content)
+    bank = get_question_bank(generate_bank_questions)
+    bank_key = question_bank_key(*source)
+    entry = bank.lookup(bank_key)
+
+    has_questions = entry is not None and entry['status'] == 'ready'
+    button_label = "🔄 Generate New Questions" if has_questions else f"Generate {'Resume' if mode == 'resume' else 'JD'} Questions"
+    regenerate = st.button(button_label, key=f'iq_btn_{mode}_c', use_container_width=True)
+
+    if regenerate or (entry is not None and entry['status'] == 'pending'):
+        with st.spinner(f"Preparing interview questions for {label}..."):
+            entry = bank.result(source, regenerate=regenerate)
+    if entry is None:
+        return
+    if entry['status'] == 'error':
+        st.error(entry['raw'])
+        return
+
+    loaded_key = f'iq_bank_loaded_{mode}'
+    if st.session_state.get(loaded_key) != (bank_key, entry['version']):
+        st.session_state[f'iq_output_{mode}'] = entry['raw']
+        st.session_state[f'interview_qa_{mode}'] = parse_questions_from_raw(entry['raw'])
+        st.session_state[f'evaluation_report_{mode}'] = ""
+        for key in [k for k in st.session_state.keys() if str(k).startswith(f'answer_q_{mode}_')]:
+            del st.session_state[key]
+        st.session_state[loaded_key] = (bank_key, entry['version'])
+
+    question_count = len(st.session_state[f'interview_qa_{mode}'])
+    if question_count:
+        st.caption(f"{question_count} questions based on **{label}**.")
+    else:
+        st.warning("Could not parse any questions from the LLM response.")
+
+
 def interview_preparation_tab():
     """
     Interview Preparation Tab Logic with two sub-tabs: Resume Based and JD Based.
@@ -2256,7 +2518,7 @@ def interview_preparation_tab():
     is_jd_loaded = bool(st.session_state.get('candidate_jd_list'))
 
     # Check if we are running in Mock Mode
-    is_mock_mode = isinstance(client, MockGroqClient) and not GROQ_API_KEY
+    is_mock_mode = isinstance(get_client(), MockGroqClient) and not GROQ_API_KEY
     
     if not GROQ_API_KEY and not is_mock_mode:
         st.error("Cannot use Interview Prep: GROQ_API_KEY is not configured.")
@@ -2287,11 +2549,9 @@ def interview_preparation_tab():
             
             return
 
-        # Generate section options dynamically
-        parsed_keys = st.session_state.parsed.keys()
-        question_section_options = [k.replace('_', ' ').title() for k in parsed_keys if k not in ['name', 'email', 'phone', 'error', 'linkedin', 'github', 'personal_details']]
-        # Only sections with valid content
-        question_section_options = sorted([o for o in question_section_options if o and st.session_state.parsed.get(o.lower().replace(' ', '_')) and str(st.session_state.parsed.get(o.lower().replace(' ', '_'))).strip()])
+        # Every non-empty section has a question bank, pre-generated in the background after parsing
+        resume_sections = resume_question_sections(st.session_state.parsed)
+        question_section_options = list(resume_sections)
 
         if not question_section_options:
             st.error("No relevant sections (Experience, Skills, Projects) found in the parsed resume for question generation.")
@@ -2302,42 +2562,9 @@ def interview_preparation_tab():
         section_choice = st.selectbox(
             "Select Resume Section to Focus On", 
             question_section_options, 
-            key='iq_section_resume_c',
-            on_change=lambda: clear_interview_state('resume')
+            key='iq_section_resume_c'
         )
-        
-        if st.button("Generate Resume Questions", key='iq_btn_resume_c', use_container_width=True):
-            with st.spinner("Generating questions based on resume section..."):
-                try:
-                    # Clear current mode state first
-                    clear_interview_state('resume')
-
-                    # Call the unified generation function (Mode: resume)
-                    raw_questions_response = generate_interview_questions(
-                        source_data=st.session_state.parsed, 
-                        source_type='resume', 
-                        identifier=section_choice
-                    )
-                    
-                    if raw_questions_response.startswith("Error:"):
-                         st.error(raw_questions_response)
-                         st.session_state.iq_output_resume = raw_questions_response
-                         return
-
-                    st.session_state.iq_output_resume = raw_questions_response
-                    q_list = parse_questions_from_raw(raw_questions_response)
-                        
-                    st.session_state.interview_qa_resume = q_list
-                    
-                    if q_list:
-                        st.success(f"Generated {len(q_list)} questions based on your **{section_choice}** section.")
-                    else:
-                        st.warning(f"Could not parse any questions from the LLM response.")
-                    
-                except Exception as e:
-                    st.error(f"Error generating questions: {e}\nTrace: {traceback.format_exc()}")
-                    st.session_state.iq_output_resume = "Error generating questions."
-                    st.session_state.interview_qa_resume = []
+        load_interview_question_bank('resume', section_choice, resume_sections[section_choice])
         
         # Display/Evaluation Logic for Resume Mode
         display_evaluation_form('resume', st.session_state.interview_qa_resume, st.session_state.full_text)
@@ -2356,48 +2583,14 @@ def interview_preparation_tab():
         selected_jd_name = st.selectbox(
             "Select Job Description",
             options=jd_names,
-            key='iq_jd_name_c',
-            on_change=lambda: clear_interview_state('jd')
+            key='iq_jd_name_c'
         )
 
         selected_jd = next((jd for jd in st.session_state.candidate_jd_list if jd.get('name') == selected_jd_name), None)
-        
-        if st.button("Generate JD Questions", key='iq_btn_jd_c', use_container_width=True):
-            if not selected_jd:
-                st.error("Please select a Job Description.")
-                return
-
-            with st.spinner(f"Generating questions based on JD: {selected_jd_name}..."):
-                try:
-                    # Clear current mode state first
-                    clear_interview_state('jd')
-                    
-                    # Call the unified generation function (Mode: jd)
-                    raw_questions_response = generate_interview_questions(
-                        source_data=selected_jd.get('name', 'N/A'), 
-                        source_type='jd', 
-                        identifier=selected_jd.get('content', '')
-                    )
-                    
-                    if raw_questions_response.startswith("Error:"):
-                         st.error(raw_questions_response)
-                         st.session_state.iq_output_jd = raw_questions_response
-                         return
-
-                    st.session_state.iq_output_jd = raw_questions_response
-                    q_list = parse_questions_from_raw(raw_questions_response)
-                        
-                    st.session_state.interview_qa_jd = q_list
-                    
-                    if q_list:
-                        st.success(f"Generated {len(q_list)} questions based on **{selected_jd_name}**.")
-                    else:
-                        st.warning(f"Could not parse any questions from the LLM response.")
-                    
-                except Exception as e:
-                    st.error(f"Error generating questions: {e}\nTrace: {traceback.format_exc()}")
-                    st.session_state.iq_output_jd = "Error generating questions."
-                    st.session_state.interview_qa_jd = []
+        if not selected_jd or not selected_jd.get('content', '').strip():
+            st.error("Please select a Job Description.")
+            return
+        load_interview_question_bank('jd', selected_jd_name, selected_jd['content'])
 
         # Display/Evaluation Logic for JD Mode
         display_evaluation_form('jd', st.session_state.interview_qa_jd, selected_jd.get('content', '') if selected_jd else "")
@@ -2490,15 +2683,15 @@ def gap_analysis_tab():
         
         # Download button for the plan
         plan_filename = f"{st.session_state.parsed['name'].replace(' ', '_')}_GapPlan_{top_jd_item.get('role', 'Job').replace('/', '_').replace(' ', '_')}.md"
-        plan_data_uri = get_download_link(st.session_state.gap_analysis_plan, plan_filename, 'markdown', title="Gap Analysis Course Plan")
-
         col_dl, _ = st.columns([1, 3])
         with col_dl:
             render_download_button(
-                plan_data_uri, 
+                "gap_plan",
+                lambda: st.session_state.gap_analysis_plan,
                 plan_filename, 
                 f"⬇️ Download Course Plan (.md)", 
-                'markdown'
+                'markdown',
+                title="Gap Analysis Course Plan"
             )
     else:
         st.info("Click the 'Generate Course Plan & Certifications' button above to get your personalized study roadmap.")
@@ -2513,11 +2706,48 @@ def gap_analysis_tab():
 # CHATBOT FUNCTIONALITY (unchanged)
 # --------------------------------------------------------------------------------------
 
-def qa_on_resume(question):
-    """Chatbot for Resume (Q&A) using LLM."""
-    global client, GROQ_MODEL, GROQ_API_KEY
+def summarize_chat_turns(previous_summary, messages):
+    """Updates a chat's rolling summary with messages that left the recent window (see chat_memory)."""
+    if isinstance(get_client(), MockGroqClient) or not GROQ_API_KEY:
+        return extractive_summary(previous_summary, messages)
+
+    transcript = "\n".join(
+        f"{'User' if m.get('role') == 'user' else 'Assistant'}: {m.get('content', '')}" for m in messages
+    )
+    prompt = f"""Update the running summary of a Q&A conversation with the new messages below.
+    Keep facts that later questions may refer to (names, companies, numbers, decisions). Reply with the summary only, under 120 words.
+    Current summary: {previous_summary or '(none)'}
+    New messages:
+    {transcript}
+    """
+    response = get_client().chat.completions.create(
+        model=GROQ_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.2,
+        max_tokens=250
+    )
+    return response.choices[0].message.content.strip()
+
+
+def _conversation_block(history, memory, follow_up):
+    """
+    Conversation context for a follow-up question. Other questions are answered without it, since
+    their answers go into the answer cache shared by every session and must not carry this chat.
+    """
+    if not follow_up:
+        return ""
+    conversation = format_chat_context(history or [], memory if memory is not None else new_chat_memory())
+    return f"\n    Conversation so far (use it to resolve follow-up questions):\n    {conversation}\n" if conversation else ""
+
+
+def qa_on_resume(question, history=None, memory=None):
+    """
+    Chatbot for Resume (Q&A) using LLM. `history` is the conversation before this question and
+    `memory` its chat_memory state; they are sent as a rolling summary plus the last few turns.
+    """
+    global GROQ_MODEL, GROQ_API_KEY
     
-    if not GROQ_API_KEY and not isinstance(client, MockGroqClient):
+    if not GROQ_API_KEY and not isinstance(get_client(), MockGroqClient):
         return "AI Chatbot Disabled: GROQ_API_KEY not set."
         
     parsed_json = st.session_state.parsed
@@ -2526,52 +2756,84 @@ def qa_on_resume(question):
     if not parsed_json or parsed_json.get('error') is not None:
          return "Please parse a valid resume first to enable the Q&A feature."
 
-    prompt = f"""Given the following resume information:
-    Resume Text: {full_text}
-    Parsed Resume Data (JSON): {json.dumps(parsed_json, indent=2)}
+    # Follow-ups ("how long was he there?") are retrieved together with the previous question
+    # and never answered from the shared cache, since their meaning depends on this conversation
+    follow_up = is_follow_up(question, history)
+
+    # Identical resumes share answers across sessions; near-duplicate questions reuse them too.
+    # The cache is checked first, so a hit costs no retrieval
+    doc_key = document_key("resume", full_text)
+    cached_answer = None if follow_up else get_answer_cache().get(doc_key, question)
+    if cached_answer is not None:
+        return cached_answer
+
+    # Only the resume sections most relevant to the question are sent (within a token budget),
+    # instead of the full text plus the same data again as JSON
+    retrieval_query = f"{last_user_message(history)} {question}" if follow_up else question
+    excerpts = get_resume_index(full_text).select_context(retrieval_query)
+    resume_context = "\n\n".join(excerpts)
+
+    prompt = f"""Given the following excerpts from the resume of {parsed_json.get('name', 'the candidate')} (the sections most relevant to the question):
+    {resume_context}
+    {_conversation_block(history, memory, follow_up)}
     Answer the following question about the resume concisely and directly.
     If the information is not present, state that clearly and briefly (e.g., 'Information not found on the resume.').
     Question: {question}
     """
     
     try:
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model=GROQ_MODEL, 
             messages=[{"role": "user", "content": prompt}], 
             temperature=0.4
         )
-        return response.choices[0].message.content.strip()
+        answer = response.choices[0].message.content.strip()
+        if not follow_up:
+            get_answer_cache().put(doc_key, question, answer)
+        return answer
     except Exception as e:
         return f"AI Chatbot Error: Failed to get response from LLM. Error: {e}"
 
 
-def qa_on_jd(question, jd_content):
-    """Chatbot for Job Description (Q&A) using LLM."""
-    global client, GROQ_MODEL, GROQ_API_KEY
+def qa_on_jd(question, jd_content, history=None, memory=None):
+    """Chatbot for Job Description (Q&A) using LLM, with the same conversation memory as qa_on_resume."""
+    global GROQ_MODEL, GROQ_API_KEY
     
-    if not GROQ_API_KEY and not isinstance(client, MockGroqClient):
+    if not GROQ_API_KEY and not isinstance(get_client(), MockGroqClient):
         return "AI Chatbot Disabled: GROQ_API_KEY not set."
 
     if not jd_content or not jd_content.strip():
         return "Please select a valid Job Description to chat about."
 
+    # Popular JDs answer repeated questions ("Salary?", "what is the salary") without an LLM call
+    follow_up = is_follow_up(question, history)
+    doc_key = document_key("jd", jd_content)
+    cached_answer = None if follow_up else get_answer_cache().get(doc_key, question)
+    if cached_answer is not None:
+        return cached_answer
+
     prompt = f"""Given the following Job Description (JD) text:
     Job Description Text: {jd_content}
+    {_conversation_block(history, memory, follow_up)}
     Answer the following question about the Job Description concisely and directly.
     If the information is not present, state that clearly and briefly (e.g., 'The JD does not specify that information.').
     Question: {question}
     """
     
     try:
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model=GROQ_MODEL, 
             messages=[{"role": "user", "content": prompt}], 
             temperature=0.4
         )
-        return response.choices[0].message.content.strip()
+        answer = response.choices[0].message.content.strip()
+        if not follow_up:
+            get_answer_cache().put(doc_key, question, answer)
+        return answer
     except Exception as e:
         return f"AI Chatbot Error: Failed to get response from LLM. Error: {e}"
 
+@timed_fragment("candidate:resume_chat")
 def resume_qa_content():
     """Content for the Resume Q&A sub-tab."""
     st.subheader("👤 Resume Q&A Chatbot")
@@ -2597,26 +2859,31 @@ def resume_qa_content():
             st.markdown(message["content"])
 
     if prompt := st.chat_input("Ask a question about the resume...", key="resume_qa_input"):
-        st.session_state.resume_chatbot_history.append({"role": "user", "content": prompt})
+        history = st.session_state.resume_chatbot_history
+        memory = st.session_state.setdefault('resume_chat_memory', new_chat_memory())
+        history.append({"role": "user", "content": prompt})
         
         with st.chat_message("user"):
             st.markdown(prompt)
         
         with st.spinner("Thinking..."):
-            ai_response = qa_on_resume(prompt)
+            ai_response = qa_on_resume(prompt, history[:-1], memory)
 
         with st.chat_message("assistant"):
             st.markdown(ai_response)
             
-        st.session_state.resume_chatbot_history.append({"role": "assistant", "content": ai_response})
-        st.rerun()
+        history.append({"role": "assistant", "content": ai_response})
+        update_chat_memory(history, memory, summarize_chat_turns)
+        rerun_panel()
 
     if st.session_state.resume_chatbot_history:
         st.markdown("---")
         if st.button("🗑️ Clear Resume Chat History", key="clear_resume_chatbot_history"):
             st.session_state.resume_chatbot_history = []
-            st.rerun()
+            st.session_state.resume_chat_memory = new_chat_memory()
+            rerun_panel()
 
+@timed_fragment("candidate:jd_chat")
 def jd_qa_content():
     """Content for the JD Q&A sub-tab."""
     st.subheader("💼 JD Q&A Chatbot")
@@ -2649,25 +2916,28 @@ def jd_qa_content():
             st.markdown(message["content"])
 
     if prompt := st.chat_input(f"Ask about the requirements of: {selected_jd_name}...", key="jd_qa_input"):
+        memory = st.session_state.setdefault('jd_chat_memory', {}).setdefault(selected_jd_name, new_chat_memory())
         current_jd_history.append({"role": "user", "content": prompt})
         
         with st.chat_message("user"):
             st.markdown(prompt)
         
         with st.spinner("Thinking..."):
-            ai_response = qa_on_jd(prompt, jd_content)
+            ai_response = qa_on_jd(prompt, jd_content, current_jd_history[:-1], memory)
 
         with st.chat_message("assistant"):
             st.markdown(ai_response)
             
         current_jd_history.append({"role": "assistant", "content": ai_response})
-        st.rerun()
+        update_chat_memory(current_jd_history, memory, summarize_chat_turns)
+        rerun_panel()
 
     if current_jd_history:
         st.markdown("---")
         if st.button(f"🗑️ Clear Chat History for {selected_jd_name}", key="clear_jd_chatbot_history"):
             st.session_state.jd_chatbot_history[selected_jd_name] = []
-            st.rerun()
+            st.session_state.setdefault('jd_chat_memory', {}).pop(selected_jd_name, None)
+            rerun_panel()
 
 def chatbot_tab_content():
     """Main Content for the Chatbot Tab with sub-tabs."""
@@ -2690,6 +2960,93 @@ def chatbot_tab_content():
 # CANDIDATE DASHBOARD FUNCTION 
 # -------------------------
 
+# --- Navigation ---
+
+# "lazy" runs only the selected view on each rerun; "tabs" keeps the original st.tabs layout,
+# where every tab function runs on every rerun.
+CANDIDATE_NAV_MODE = os.getenv('PRAGYAN_CANDIDATE_NAV', 'lazy')
+
+CANDIDATE_VIEWS = [
+    ("📄 Resume Parsing", resume_parsing_tab),
+    ("📝 CV Management", cv_management_tab),
+    ("✨ Parsed Data View", parsed_data_tab),
+    ("📚 JD Management", jd_management_tab_candidate),
+    ("🎯 Batch JD Match", jd_batch_match_tab),
+    ("🔍 Filter JD", filter_jd_tab_content),
+    ("🤖 Chatbot", chatbot_tab_content),
+    ("✉️ Generate Cover Letter", generate_cover_letter_tab),
+    ("🎤 Interview Preparation", interview_preparation_tab),
+    ("💡 Gap Analysis & Course Plan", gap_analysis_tab),
+]
+
+# Keyed value widgets whose state must survive while their view is not rendered. Streamlit
+# drops the state of widgets missing from a run unless the key is written back in that run.
+# Buttons, uploaders and chat inputs cannot be set through session state and are left out.
+CANDIDATE_PERSISTENT_WIDGET_KEYS = {
+    "📄 Resume Parsing": ("parsing_input_method", "pasted_cv_text_input"),
+    "📝 CV Management": (
+        "cv_name", "cv_email", "cv_phone", "cv_strengths_input",
+        "edu_degree", "edu_uni", "edu_fy", "edu_ty",
+        "exp_company", "exp_role", "exp_ctc", "exp_fy", "exp_ty", "exp_desc",
+        "proj_name", "proj_link", "proj_tools", "proj_desc",
+        "cert_title", "cert_given_by", "cert_received_by", "cert_date",
+    ),
+    "📚 JD Management": ("jd_type_candidate", "jd_add_method_candidate", "url_list_candidate", "text_list_candidate"),
+    "🎯 Batch JD Match": ("candidate_batch_jd_select",),
+    "🔍 Filter JD": ("candidate_filter_skills_multiselect", "filter_job_type_select", "filter_role_select"),
+    "🤖 Chatbot": ("selected_jd_for_qa",),
+    "✉️ Generate Cover Letter": (
+        "selected_jd_for_cl", "cl_style", "final_cover_letter_edit", "batch_cl_jds", "batch_cl_styles", "batch_cl_open",
+    ),
+    "🎤 Interview Preparation": ("iq_section_resume_c", "iq_jd_name_c", "answer_q_*"),
+}
+
+INTERVIEW_STATE_KEYS = (
+    "iq_output_resume", "interview_qa_resume", "evaluation_report_resume", "interview_scores_resume",
+    "iq_output_jd", "interview_qa_jd", "evaluation_report_jd", "interview_scores_jd",
+)
+
+# Large session values each view reads or writes (directly or through helpers). When the session
+# is over its memory cap, listed values of the other views may be spilled to disk at the end of a
+# run; the active view's values stay live for its fragment reruns. Every spilled value is restored
+# at the start of the next full run, so a key missing here is only never spilled, not unreadable.
+CANDIDATE_VIEW_STATE_KEYS = {
+    "📄 Resume Parsing": (
+        "full_text", "excel_data", "candidate_uploaded_resumes", "form_cv_text", "gap_analysis_plan",
+        *INTERVIEW_STATE_KEYS,
+    ),
+    "📝 CV Management": ("form_cv_text",),
+    "✨ Parsed Data View": ("full_text", "excel_data"),
+    "📚 JD Management": (
+        "candidate_match_results", "excel_data", "gap_analysis_plan", "jd_chatbot_history",
+        *INTERVIEW_STATE_KEYS,
+    ),
+    "🎯 Batch JD Match": ("candidate_match_results", "gap_analysis_plan"),
+    "🔍 Filter JD": (),
+    "🤖 Chatbot": ("full_text", "resume_chatbot_history", "jd_chatbot_history"),
+    "✉️ Generate Cover Letter": ("generated_cover_letter", "batch_cover_letters"),
+    "🎤 Interview Preparation": ("full_text", "gap_analysis_plan", *INTERVIEW_STATE_KEYS),
+    "💡 Gap Analysis & Course Plan": ("candidate_match_results", "gap_analysis_plan"),
+}
+SPILLABLE_SESSION_KEYS = tuple(sorted({key for keys in CANDIDATE_VIEW_STATE_KEYS.values() for key in keys}))
+
+
+def persist_candidate_widget_state(active_view):
+    """
+    Re-assigns the widget keys of every view except the active one, so switching views does
+    not reset them. (Writing an active widget's key would make Streamlit warn about a value
+    set both by the widget and the Session State API.)
+    """
+    for view, keys in CANDIDATE_PERSISTENT_WIDGET_KEYS.items():
+        if view == active_view:
+            continue
+        exact = {k for k in keys if not k.endswith('*')}
+        prefixes = tuple(k[:-1] for k in keys if k.endswith('*'))
+        for key in list(st.session_state.keys()):
+            if key in exact or (prefixes and str(key).startswith(prefixes)):
+                st.session_state[key] = st.session_state[key]
+
+
 def candidate_dashboard(go_to): # <-- ADD 'go_to' HERE 
     
     # 1. Define the Logout Callback Function
@@ -2701,6 +3058,9 @@ def candidate_dashboard(go_to): # <-- ADD 'go_to' HERE
 
     # Set page config once at the start (usually done in the main app file)
     st.set_page_config(layout="wide", page_title="PragyanAI Candidate Dashboard")
+
+    # Values spilled to disk at the end of the previous run are loaded back before anything reads them
+    restore_spilled_values()
     
     # --- Dashboard Header and Logout Button ---
     col_title, col_logout = st.columns([10, 1])
@@ -2762,51 +3122,40 @@ def candidate_dashboard(go_to): # <-- ADD 'go_to' HERE
     if 'candidate_job_types' not in st.session_state: 
         st.session_state.candidate_job_types = DEFAULT_JOB_TYPES 
 
-    # --- Main Content with Tabs (Rearranged, new tab added) ---
-    tab_parsing, tab_cv_management, tab_data_view, tab_jd, tab_batch_match, tab_filter_jd, tab_chatbot, tab_cover_letter, tab_interview_prep, tab_gap_analysis = st.tabs(
-        [
-            "📄 Resume Parsing", 
-            "📝 CV Management", # NEW TAB
-            "✨ Parsed Data View", 
-            "📚 JD Management", 
-            "🎯 Batch JD Match", 
-            "🔍 Filter JD", 
-            "🤖 Chatbot", 
-            "✉️ Generate Cover Letter", 
-            "🎤 Interview Preparation",
-            "💡 Gap Analysis & Course Plan" 
-        ]
-    )
-    
-    with tab_parsing:
-        resume_parsing_tab()
-        
-    with tab_cv_management:
-        cv_management_tab() # NEW TAB FUNCTION
-        
-    with tab_data_view:
-        parsed_data_tab()
-        
-    with tab_jd:
-        jd_management_tab_candidate()
-        
-    with tab_batch_match:
-        jd_batch_match_tab() # UPDATED
-        
-    with tab_filter_jd:
-        filter_jd_tab_content()
-        
-    with tab_chatbot:
-        chatbot_tab_content()
-        
-    with tab_cover_letter:
-        generate_cover_letter_tab() 
-        
-    with tab_interview_prep:
-        interview_preparation_tab() 
-        
-    with tab_gap_analysis:
-        gap_analysis_tab() 
+    # --- Main Content (lazy single-view navigation, or the legacy tabs) ---
+    nav_mode = st.session_state.get('candidate_nav_mode', CANDIDATE_NAV_MODE)
+    started = time.perf_counter()
+
+    if nav_mode == "tabs":
+        st.session_state.candidate_view_changed = False
+        active_state_keys = SPILLABLE_SESSION_KEYS
+        for tab, (_, view_fn) in zip(st.tabs([label for label, _ in CANDIDATE_VIEWS]), CANDIDATE_VIEWS):
+            with tab:
+                view_fn()
+        active_view = "all tabs"
+    else:
+        # The radio's new value is already in session state when a rerun starts
+        persist_candidate_widget_state(st.session_state.get('candidate_active_view', CANDIDATE_VIEWS[0][0]))
+        active_view = st.radio(
+            "Navigate",
+            [label for label, _ in CANDIDATE_VIEWS],
+            horizontal=True,
+            key="candidate_active_view",
+            label_visibility="collapsed"
+        )
+        st.session_state.candidate_view_changed = active_view != st.session_state.get('candidate_prev_view', active_view)
+        st.session_state.candidate_prev_view = active_view
+        st.markdown("---")
+
+        # Only the active view's function runs on this rerun
+        active_state_keys = CANDIDATE_VIEW_STATE_KEYS.get(active_view, SPILLABLE_SESSION_KEYS)
+        dict(CANDIDATE_VIEWS)[active_view]()
+
+    prefetch_interview_question_banks()
+
+    # Spill other views' large values if the session is over its cap (fragment reruns skip this)
+    enforce_session_cap(SPILLABLE_SESSION_KEYS, active_state_keys)
+    record_timing(f"candidate:{nav_mode}:{active_view}", time.perf_counter() - started)
 
 
 # -------------------------
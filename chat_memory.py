@@ -0,0 +1,128 @@
+import os
+import re
+import logging
+from resume_retrieval import tokenize
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# CHAT MEMORY CONFIGURATION
+# -------------------------
+
+# Question/answer pairs always sent verbatim. Older turns are folded into the rolling summary in
+# batches once more than twice this many are unsummarized, so between N and 2N turns are sent.
+CHAT_RECENT_TURNS = int(os.getenv('PRAGYAN_CHAT_RECENT_TURNS', '3'))
+CHAT_SUMMARY_MAX_CHARS = int(os.getenv('PRAGYAN_CHAT_SUMMARY_MAX_CHARS', '800'))
+# Long answers are cut when quoted back as context
+CHAT_MESSAGE_MAX_CHARS = int(os.getenv('PRAGYAN_CHAT_MESSAGE_MAX_CHARS', '600'))
+
+# Words that refer back to the conversation ("how long was he there?")
+FOLLOW_UP_WORDS = {
+    "it", "its", "that", "this", "those", "these", "there", "them", "above", "previous", "earlier", "same",
+}
+# Openings that continue the previous question ("and the salary?", "why?", "tell me more")
+FOLLOW_UP_OPENINGS = ("and", "also", "then", "so", "why", "what about", "how about", "tell me more", "more", "elaborate")
+# Words that carry no subject of their own; a question made only of these (and the words above)
+# cannot be understood alone. Pronouns for the candidate ("he", "she") are not follow-ups.
+GENERIC_QUESTION_WORDS = {
+    "how", "long", "much", "many", "why", "more", "else", "also", "then", "so", "again", "exactly",
+    "explain", "elaborate", "detail", "details", "expand", "mean", "did", "does", "do", "were", "can",
+    "could", "would", "please", "like", "example", "examples", "one", "ones", "him", "her", "hi", "ok",
+}
+
+def new_chat_memory():
+    """Per-conversation memory: the rolling summary and how many history messages it covers."""
+    return {"summary": "", "summarized": 0}
+
+
+def _clip(text, limit):
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def _valid_memory(history, memory):
+    # A cleared or replaced history invalidates the summary
+    if memory.get("summarized", 0) > len(history):
+        memory.update(new_chat_memory())
+    return memory
+
+
+def is_follow_up(question, history):
+    """
+    True when the question cannot be understood without the conversation, so it cannot be answered
+    (or cached) alone: it refers back or continues the last question, and names no subject of its own.
+    "how long was he there?" and "why?" are follow-ups; "is it remote?" is not.
+    """
+    if not history:
+        return False
+    text = " ".join(re.findall(r"[a-z']+", (question or "").lower()))
+    words = set(text.split())
+    refers_back = bool(words & FOLLOW_UP_WORDS) or any(
+        text == opening or text.startswith(opening + " ") for opening in FOLLOW_UP_OPENINGS
+    )
+    content = [t for t in tokenize(text) if t not in FOLLOW_UP_WORDS and t not in GENERIC_QUESTION_WORDS]
+    return refers_back and not content
+
+
+def last_user_message(history):
+    return next((m["content"] for m in reversed(history) if m.get("role") == "user"), "")
+
+
+def format_chat_context(history, memory):
+    """
+    Returns the conversation context for a prompt: the rolling summary plus the unsummarized
+    recent messages (each clipped), or "" for a new conversation. `history` excludes the
+    question being asked. Its size is bounded by the settings above, not by the chat length.
+    """
+    memory = _valid_memory(history, memory)
+    recent = history[memory["summarized"]:]
+    if not memory["summary"] and not recent:
+        return ""
+
+    lines = []
+    if memory["summary"]:
+        lines.append(f"Summary of the earlier conversation: {memory['summary']}")
+    if recent:
+        lines.append("Most recent messages:")
+        for message in recent:
+            speaker = "User" if message.get("role") == "user" else "Assistant"
+            lines.append(f"{speaker}: {_clip(message.get('content'), CHAT_MESSAGE_MAX_CHARS)}")
+    return "\n".join(lines)
+
+
+def extractive_summary(previous_summary, messages):
+    """Fallback summary without an LLM: the previous summary plus a clipped line per question and answer."""
+    parts = [previous_summary] if previous_summary else []
+    for message in messages:
+        speaker = "Q" if message.get("role") == "user" else "A"
+        parts.append(f"{speaker}: {_clip(message.get('content'), 160)}")
+    # Keep the newest information when over the limit
+    return " | ".join(parts)[-CHAT_SUMMARY_MAX_CHARS:]
+
+
+def update_chat_memory(history, memory, summarize_fn=None):
+    """
+    Folds messages that left the recent window into the rolling summary. This runs only when more than
+    2 * CHAT_RECENT_TURNS turns are unsummarized, so most turns make no summary call.
+    summarize_fn(previous_summary, messages) returns the new summary. Without one, or if it fails,
+    the extractive summary is used.
+    """
+    memory = _valid_memory(history, memory)
+    unsummarized = len(history) - memory["summarized"]
+    if unsummarized <= 4 * CHAT_RECENT_TURNS:
+        return memory
+
+    fold_until = len(history) - 2 * CHAT_RECENT_TURNS
+    to_fold = history[memory["summarized"]:fold_until]
+    summary = None
+    if summarize_fn is not None:
+        try:
+            summary = summarize_fn(memory["summary"], to_fold)
+        except Exception as e:
+            logger.warning("Summary update failed, using the extractive summary: %s", e)
+    if not summary:
+        summary = extractive_summary(memory["summary"], to_fold)
+
+    memory["summary"] = _clip(summary, CHAT_SUMMARY_MAX_CHARS)
+    memory["summarized"] = fold_until
+    return memory
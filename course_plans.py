@@ -0,0 +1,322 @@
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from resume_retrieval import tokenize
+
+# -------------------------
+# COURSE PLAN CONFIGURATION
+# -------------------------
+
+COURSE_PLAN_CACHE_ENTRIES = int(os.getenv('PRAGYAN_COURSE_PLAN_CACHE_ENTRIES', '2000'))
+# Write plans and skill fragments through to the portal store so other processes (and restarts) reuse them
+COURSE_PLAN_STORE = os.getenv('PRAGYAN_COURSE_PLAN_STORE', '1') == '1'
+
+# Plan phases, in study order
+SKILL_CATEGORIES = ["Programming", "Data", "Machine Learning", "Cloud", "DevOps", "Practices"]
+
+# Canonical skill -> (category, aliases). Gap text is reduced to the canonical skills it mentions,
+# so "no AWS/Amazon Web Services exposure" and "lacks AWS" share one cached plan.
+SKILL_ONTOLOGY = {
+    "Python": ("Programming", ["python"]),
+    "Java": ("Programming", ["java"]),
+    "JavaScript": ("Programming", ["javascript", "js", "typescript", "node.js", "nodejs"]),
+    "React": ("Programming", ["react", "react.js", "reactjs"]),
+    "Go": ("Programming", ["golang"]),
+    "SQL": ("Data", ["sql", "mysql", "postgresql", "postgres", "relational database", "relational databases"]),
+    "NoSQL": ("Data", ["nosql", "mongodb", "cassandra", "dynamodb"]),
+    "Spark": ("Data", ["spark", "pyspark", "apache spark", "databricks"]),
+    "Data Engineering": ("Data", ["etl", "data pipeline", "data pipelines", "airflow", "data engineering"]),
+    "Data Visualization": ("Data", ["data visualization", "visualization", "tableau", "power bi", "dashboards"]),
+    "Statistics": ("Data", ["statistics", "statistical analysis", "a/b testing", "hypothesis testing"]),
+    "Machine Learning": ("Machine Learning", ["machine learning", "ml", "scikit-learn", "sklearn", "predictive modeling"]),
+    "Deep Learning": ("Machine Learning", ["deep learning", "neural networks", "tensorflow", "pytorch", "keras"]),
+    "NLP": ("Machine Learning", ["nlp", "natural language processing", "text analytics"]),
+    "LLMs": ("Machine Learning", ["llm", "llms", "large language models", "generative ai", "genai", "llm integration", "rag", "prompt engineering"]),
+    "MLOps": ("Machine Learning", ["mlops", "model deployment", "model monitoring", "mlflow", "kubeflow"]),
+    "AWS": ("Cloud", ["aws", "amazon web services", "ec2", "s3", "lambda", "eks"]),
+    "GCP": ("Cloud", ["gcp", "google cloud", "google cloud platform", "bigquery", "gke"]),
+    "Azure": ("Cloud", ["azure", "microsoft azure"]),
+    "Cloud Computing": ("Cloud", ["cloud", "cloud computing", "cloud platforms", "cloud services"]),
+    "Docker": ("DevOps", ["docker", "containerization", "containers", "docker compose"]),
+    "Kubernetes": ("DevOps", ["kubernetes", "k8s", "container orchestration", "helm"]),
+    "Terraform": ("DevOps", ["terraform", "infrastructure as code", "iac", "cloudformation"]),
+    "CI/CD": ("DevOps", ["ci/cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment", "jenkins", "gitlab ci", "github actions"]),
+    "Linux": ("DevOps", ["linux", "shell scripting", "bash"]),
+    "APIs": ("Practices", ["rest api", "rest apis", "restful", "api services", "microservices", "fastapi", "flask"]),
+    "System Design": ("Practices", ["system design", "distributed systems", "scalability", "software architecture"]),
+    "Testing": ("Practices", ["unit testing", "integration testing", "test automation", "pytest"]),
+    "Agile": ("Practices", ["agile", "scrum", "kanban"]),
+    "Leadership": ("Practices", ["leadership", "team lead", "mentoring", "stakeholder management"]),
+    "Communication": ("Practices", ["communication skills", "presentation skills", "technical writing"]),
+}
+
+# Used for locally composed fragments (mock client, or when the model leaves a skill out)
+SKILL_CERTIFICATIONS = {
+    "AWS": "AWS Certified Solutions Architect – Associate",
+    "GCP": "Google Cloud Professional Cloud Architect",
+    "Azure": "Microsoft Certified: Azure Fundamentals (AZ-900)",
+    "Cloud Computing": "AWS Certified Cloud Practitioner",
+    "Kubernetes": "Certified Kubernetes Administrator (CKA)",
+    "Terraform": "HashiCorp Certified: Terraform Associate",
+    "Docker": "Docker Certified Associate",
+    "Machine Learning": "Google Cloud Professional Machine Learning Engineer",
+    "Deep Learning": "TensorFlow Developer Certificate",
+    "MLOps": "AWS Certified Machine Learning – Specialty",
+    "Java": "Oracle Certified Professional: Java SE Developer",
+    "Python": "PCAP – Certified Associate in Python Programming",
+    "Spark": "Databricks Certified Associate Developer for Apache Spark",
+    "Agile": "Professional Scrum Master I (PSM I)",
+}
+
+
+def _alias_pattern():
+    aliases = sorted(
+        ((alias, skill) for skill, (_, names) in SKILL_ONTOLOGY.items() for alias in names),
+        key=lambda item: len(item[0]), reverse=True
+    )
+    pattern = "|".join(re.escape(alias) for alias, _ in aliases)
+    return re.compile(rf"(?<![\w+#/.])({pattern})(?![\w+#/])", re.IGNORECASE), dict(aliases)
+
+
+_ALIAS_RE, _ALIAS_TO_SKILL = _alias_pattern()
+
+
+# Gap reports mix gaps with strengths ("strong Python but lacks AWS"); clauses are split on these
+CLAUSE_SPLIT_RE = re.compile(r"[.;!?\n•*]|\s-\s|\b(?:but|however|while|whereas|although|though)\b", re.IGNORECASE)
+GAP_CUE_RE = re.compile(
+    r"\b(?:lack\w*|missing|no|not|limited|without|need\w*|gaps?|weak\w*|insufficient|little|unfamiliar|improve\w*|require\w*)\b",
+    re.IGNORECASE
+)
+STRENGTH_CUE_RE = re.compile(
+    r"\b(?:strong|solid|proficien\w*|expert\w*|experienced|excellent|good|skilled|demonstrat\w*|has|have)\b",
+    re.IGNORECASE
+)
+
+
+def gap_clauses(gap_text):
+    """Clauses of gap text that describe a gap: those stating a strength (without also stating a gap) are left out."""
+    clauses = [c.strip() for c in CLAUSE_SPLIT_RE.split(gap_text or "") if c and c.strip()]
+    return [c for c in clauses if GAP_CUE_RE.search(c) or not STRENGTH_CUE_RE.search(c)]
+
+
+def extract_skill_gaps(gap_text):
+    """Returns the canonical ontology skills named in the gap clauses, sorted (the cache identity of the gaps)."""
+    skills = set()
+    for clause in gap_clauses(gap_text):
+        skills.update(_ALIAS_TO_SKILL[m.group(1).lower()] for m in _ALIAS_RE.finditer(clause))
+    return tuple(sorted(skills))
+
+
+def normalize_role(role):
+    role = re.sub(r"\((?:mock|llm error)\)", "", str(role or ""), flags=re.IGNORECASE)
+    return " ".join(role.split()).title() or "Target Role"
+
+
+def plan_key(role, gaps):
+    return f"plan|{normalize_role(role).lower()}|{'+'.join(gaps)}"
+
+
+def fragment_key(role, skill):
+    return f"fragment|{normalize_role(role).lower()}|{skill}"
+
+
+def text_plan_key(role, gap_text):
+    """Key for gap text that names no ontology skill: its sorted token set."""
+    digest = hashlib.sha256(" ".join(sorted(set(tokenize(gap_text or "")))).encode('utf-8')).hexdigest()
+    return f"text|{normalize_role(role).lower()}|{digest}"
+
+
+# --------------------------------------------------
+# SHARED PLAN CACHE
+# --------------------------------------------------
+
+class CoursePlanCache:
+    """
+    Process-wide LRU of complete plans (keyed by role and gap set) and per-skill fragments (keyed
+    by role and skill), read through from and written to the portal store when one is given.
+    """
+
+    def __init__(self, repo=None, max_entries=COURSE_PLAN_CACHE_ENTRIES):
+        self.repo = repo
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = self.repo.get_cached_course_plan(key) if self.repo is not None else None
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    def put(self, key, value, role=""):
+        self._remember(key, value)
+        if self.repo is not None:
+            self.repo.put_cached_course_plan(key, key.split("|", 1)[0], normalize_role(role), value)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_course_plan_cache = None
+_course_plan_cache_lock = threading.Lock()
+
+
+def get_course_plan_cache():
+    global _course_plan_cache
+    if _course_plan_cache is None:
+        with _course_plan_cache_lock:
+            if _course_plan_cache is None:
+                repo = None
+                if COURSE_PLAN_STORE:
+                    from data_store import get_repository
+                    repo = get_repository()
+                _course_plan_cache = CoursePlanCache(repo)
+    return _course_plan_cache
+
+
+# --- Skill Fragments ---
+
+def build_fragment_prompt(role, skills):
+    return f"""
+    You are an expert career consultant. For a candidate targeting the role of **{role}**, write a short
+    study plan for EACH of these missing skills: {', '.join(skills)}.
+
+    Reply with JSON only, one key per skill (use the skill names exactly as given):
+    {{"<skill>": {{"weeks": <integer study weeks>, "topics": ["3-4 specific topics, in order"],
+                 "project": "one hands-on project", "certifications": ["0-2 industry-recognized certifications"]}}}}
+    """
+
+
+def parse_fragments(text, skills):
+    """Parses the fragment JSON reply into {skill: fragment} for the requested skills (others are ignored)."""
+    match = re.search(r"\{.*\}", text or "", re.DOTALL)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return {}
+
+    by_name = {skill.lower(): skill for skill in skills}
+    fragments = {}
+    for name, value in data.items() if isinstance(data, dict) else []:
+        skill = by_name.get(str(name).strip().lower())
+        if skill is None or not isinstance(value, dict):
+            continue
+        try:
+            weeks = max(1, int(value.get("weeks", 2)))
+        except (TypeError, ValueError):
+            weeks = 2
+        fragments[skill] = {
+            "weeks": weeks,
+            "topics": [str(t) for t in value.get("topics", []) if t][:5],
+            "project": str(value.get("project", "")),
+            "certifications": [str(c) for c in value.get("certifications", []) if c][:2],
+        }
+    return fragments
+
+
+def local_fragment(skill):
+    """Template fragment without the model."""
+    category = SKILL_ONTOLOGY[skill][0]
+    cert = SKILL_CERTIFICATIONS.get(skill)
+    return {
+        "weeks": 2,
+        "topics": [f"{skill} fundamentals", f"Core {skill} tools and workflows", f"{skill} best practices"],
+        "project": f"Build a small {category.lower()} project that uses {skill} end to end.",
+        "certifications": [cert] if cert else [],
+    }
+
+
+def compose_plan(role, gaps, fragments):
+    """Assembles a course plan from per-skill fragments: one phase per skill category, in study order."""
+    role = normalize_role(role)
+    lines = [f"## 💡 Detailed Course Plan: {role}", "", f"The goal is to cover the identified gaps: **{', '.join(gaps)}**.", ""]
+
+    phase = 0
+    for category in SKILL_CATEGORIES:
+        skills = [s for s in gaps if SKILL_ONTOLOGY[s][0] == category]
+        if not skills:
+            continue
+        phase += 1
+        weeks = sum(fragments[s]["weeks"] for s in skills)
+        lines.append(f"### Phase {phase}: {category} ({weeks} Weeks)")
+        for skill in skills:
+            fragment = fragments[skill]
+            lines.append(f"* **{skill} ({fragment['weeks']} weeks):** {'; '.join(fragment['topics'])}.")
+            if fragment["project"]:
+                lines.append(f"    * *Project:* {fragment['project']}")
+        lines.append("")
+
+    certifications = []
+    for skill in gaps:
+        for cert in fragments[skill]["certifications"]:
+            if cert not in [c for _, c in certifications]:
+                certifications.append((skill, cert))
+    lines += ["---", "", "## 🏅 Suggested Certifications", ""]
+    lines += [f"* **For {skill}:** {cert}" for skill, cert in certifications] or ["* No specific certification is needed; focus on the projects above."]
+    return "\n".join(lines)
+
+
+# --- Plan Lookup ---
+
+def get_gap_course_plan(gap_text, role, generate_fragments_fn=None, generate_plan_fn=None, cache_text_plans=True):
+    """
+    Returns (plan markdown, source) for the gaps of a match report, where source is 'cached',
+    'composed' (built from cached skill fragments) or 'generated'.
+
+    generate_fragments_fn(role, skills) returns {skill: fragment} for skills without a cached
+    fragment; None uses the local templates. Gap text that names no ontology skill is planned
+    by generate_plan_fn(gap_text) and, with cache_text_plans, cached on its token set.
+    A plan that needed a local template is returned but never cached, so it is replaced by a
+    real one once the model provides every fragment.
+    """
+    cache = get_course_plan_cache()
+    gaps = extract_skill_gaps(gap_text)
+
+    if not gaps:
+        key = text_plan_key(role, gap_text)
+        plan = cache.get(key)
+        if plan is not None:
+            return plan, "cached"
+        plan = generate_plan_fn(gap_text)
+        if cache_text_plans and plan and not plan.startswith("AI Generation Error"):
+            cache.put(key, plan, role)
+        return plan, "generated"
+
+    key = plan_key(role, gaps)
+    plan = cache.get(key)
+    if plan is not None:
+        return plan, "cached"
+
+    fragments = {skill: cache.get(fragment_key(role, skill)) for skill in gaps}
+    missing = [skill for skill, fragment in fragments.items() if fragment is None]
+    source = "composed"
+    templated = False
+    if missing:
+        source = "generated"
+        new = generate_fragments_fn(normalize_role(role), missing) if generate_fragments_fn else {}
+        for skill in missing:
+            if skill in new:
+                fragments[skill] = new[skill]
+                cache.put(fragment_key(role, skill), new[skill], role)
+            else:
+                # Left out by the model (or no model): use the template, but do not cache it or the plan
+                fragments[skill] = local_fragment(skill)
+                templated = True
+
+    plan = compose_plan(role, gaps, fragments)
+    if not templated:
+        cache.put(key, plan, role)
+    return plan, source
@@ -0,0 +1,169 @@
+import io
+import os
+import re
+import json
+import zipfile
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# -------------------------
+# COVER LETTER BATCH CONFIGURATION
+# -------------------------
+
+COVER_LETTER_WORKERS = int(os.getenv('PRAGYAN_COVER_LETTER_WORKERS', '4'))
+COVER_LETTER_CACHE_ENTRIES = int(os.getenv('PRAGYAN_COVER_LETTER_CACHE_ENTRIES', '500'))
+COVER_LETTER_STYLES = ["Standard", "Enthusiastic", "Professional", "Concise"]
+
+# Resume digest limits: what a letter can reasonably reference
+DIGEST_MAX_SKILLS = 25
+DIGEST_MAX_EXPERIENCE = 5
+DIGEST_ITEM_MAX_CHARS = 300
+
+# Replies that are reported to the user but never cached
+FAILED_LETTER_PREFIXES = ("Cannot generate", "AI Generation Error", "Please provide")
+
+
+def _clip(text, limit):
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def resume_digest(parsed_json):
+    """
+    Compact resume facts sent with every letter: name, contact, the first skills and the
+    first experience entries (each clipped). Built once per batch instead of per letter.
+    """
+    skills = parsed_json.get('skills') or []
+    experience = parsed_json.get('experience') or []
+    if isinstance(skills, str):
+        skills = [skills]
+    if isinstance(experience, str):
+        experience = [experience]
+    return {
+        "name": parsed_json.get('name', 'The Candidate'),
+        "email": parsed_json.get('email', '[Candidate Email]'),
+        "skills": ", ".join(_clip(s, 60) for s in skills[:DIGEST_MAX_SKILLS]),
+        "experience": "\n".join(_clip(e, DIGEST_ITEM_MAX_CHARS) for e in experience[:DIGEST_MAX_EXPERIENCE]),
+    }
+
+
+def cover_letter_key(digest, jd_content, style):
+    """Cache key: (resume digest hash, JD hash, style)."""
+    resume_hash = hashlib.sha256(json.dumps(digest, sort_keys=True).encode('utf-8')).hexdigest()
+    jd_hash = hashlib.sha256((jd_content or '').encode('utf-8')).hexdigest()
+    return (resume_hash, jd_hash, style)
+
+
+def safe_filename(text):
+    return re.sub(r"[^\w.-]+", "_", str(text)).strip("_") or "Job"
+
+
+# --------------------------------------------------
+# SHARED LETTER CACHE
+# --------------------------------------------------
+
+class CoverLetterCache:
+    """Process-wide LRU of generated letters, so re-running a batch only generates new combinations."""
+
+    def __init__(self, max_entries=COVER_LETTER_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            letter = self._entries.get(key)
+            if letter is not None:
+                self._entries.move_to_end(key)
+            return letter
+
+    def put(self, key, letter):
+        if not letter or letter.startswith(FAILED_LETTER_PREFIXES):
+            return
+        with self._lock:
+            self._entries[key] = letter
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_cover_letter_cache = None
+_cover_letter_cache_lock = threading.Lock()
+
+
+def get_cover_letter_cache():
+    global _cover_letter_cache
+    if _cover_letter_cache is None:
+        with _cover_letter_cache_lock:
+            if _cover_letter_cache is None:
+                _cover_letter_cache = CoverLetterCache()
+    return _cover_letter_cache
+
+
+# --- Batch Generation ---
+
+def generate_letter_cached(generate_fn, digest, jd, style):
+    """Returns (letter, from_cache) for one JD dict ({'name', 'role', 'content'}) and style."""
+    cache = get_cover_letter_cache()
+    key = cover_letter_key(digest, jd.get('content', ''), style)
+    letter = cache.get(key)
+    if letter is not None:
+        return letter, True
+    letter = generate_fn(jd.get('content', ''), digest, jd.get('role') or 'the position', style)
+    cache.put(key, letter)
+    return letter, False
+
+
+def generate_letters(jds, styles, digest, generate_fn, max_workers=COVER_LETTER_WORKERS):
+    """
+    Generates a letter for every (JD, style) pair concurrently and yields results as they complete.
+    generate_fn(jd_content, digest, jd_role, style) returns the letter text; it runs off the script
+    thread, so it must not use st.*. Each result is {'jd_name', 'role', 'style', 'letter', 'cached'}.
+    """
+    jobs = [(jd, style) for jd in jds for style in styles]
+    if not jobs:
+        return
+
+    def run(jd, style):
+        try:
+            letter, cached = generate_letter_cached(generate_fn, digest, jd, style)
+        except Exception as e:
+            letter, cached = f"AI Generation Error: {e}", False
+        return {"jd_name": jd.get('name', 'JD'), "role": jd.get('role') or 'Job', "style": style, "letter": letter, "cached": cached}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+        futures = [pool.submit(run, jd, style) for jd, style in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def letters_results_key(results):
+    """Hash identifying a batch's letters (the ZIP download is cached on it)."""
+    digest = hashlib.sha256()
+    for result in results:
+        digest.update(f"{result['jd_name']}\0{result['style']}\0{result['letter']}\0".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def build_letters_zip(results, candidate_name, render_html_fn):
+    """
+    ZIP archive bytes with an .html and a .txt file per successful letter.
+    render_html_fn(letter, filename, title) returns the HTML document bytes.
+    """
+    buffer = io.BytesIO()
+    used = set()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for result in results:
+            if result['letter'].startswith(FAILED_LETTER_PREFIXES):
+                continue
+            base = safe_filename(f"{candidate_name}_CoverLetter_{result['jd_name']}_{result['style']}")
+            name, n = base, 2
+            while name in used:
+                name, n = f"{base}_{n}", n + 1
+            used.add(name)
+            title = f"Cover Letter for {result['role']}"
+            archive.writestr(f"{name}.html", render_html_fn(result['letter'], f"{name}.html", title))
+            archive.writestr(f"{name}.txt", result['letter'])
+    return buffer.getvalue()
@@ -0,0 +1,1017 @@
+import os
+import re
+import copy
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from blob_store import load_field
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# STORE CONFIGURATION
+# -------------------------
+
+load_dotenv()
+# When MONGODB_URI is not set (or mongod is unreachable) the in-memory stand-in is used, which
+# keeps data for the lifetime of the server process only.
+MONGODB_URI = os.getenv('MONGODB_URI')
+MONGODB_DB = os.getenv('MONGODB_DB', 'pragyan_ai')
+MONGODB_TIMEOUT_MS = int(os.getenv('MONGODB_TIMEOUT_MS', '2000'))
+
+ADMIN_OWNER = "admin"
+
+# Batched writes are sent once this many operations are queued or this many seconds have passed
+# since the last flush (0 disables the interval), and always when the batch is closed.
+STORE_BATCH_SIZE = int(os.getenv('PRAGYAN_STORE_BATCH_SIZE', '100'))
+STORE_BATCH_INTERVAL_S = float(os.getenv('PRAGYAN_STORE_BATCH_INTERVAL_S', '2'))
+
+# Status writes only apply while the document still has the state they were computed from; each
+# write leaves a token in the document's last STATUS_OP_LOG tokens so a bulk write can tell which
+# of its writes matched. A single change that lost a race is retried this many times.
+STATUS_OP_LOG = 16
+STATUS_WRITE_ATTEMPTS = 3
+
+
+# --------------------------------------------------
+# IN-MEMORY STAND-IN (subset of the pymongo collection API)
+# --------------------------------------------------
+
+class DuplicateKeyError(Exception):
+    """Raised by the in-memory stand-in when a unique index is violated."""
+
+
+def _get_path(doc, path):
+    """Resolves a dotted field path; returns (found, value)."""
+    current = doc
+    for part in path.split('.'):
+        if isinstance(current, dict) and part in current:
+            current = current[part]
+        else:
+            return False, None
+    return True, current
+
+
+def _set_path(doc, path, value):
+    parts = path.split('.')
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset_path(doc, path):
+    parts = path.split('.')
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def _match_condition(found, value, condition):
+    if isinstance(condition, dict) and any(k.startswith('$') for k in condition):
+        for op, arg in condition.items():
+            if op == '$in':
+                if not found or not (value in arg or (isinstance(value, list) and any(v in arg for v in value))):
+                    return False
+            elif op == '$nin':
+                if found and value in arg:
+                    return False
+            elif op == '$ne':
+                if found and value == arg:
+                    return False
+            elif op == '$exists':
+                if bool(arg) != found:
+                    return False
+            elif op in ('$gt', '$gte', '$lt', '$lte'):
+                if not found or value is None:
+                    return False
+                try:
+                    if op == '$gt' and not value > arg: return False
+                    if op == '$gte' and not value >= arg: return False
+                    if op == '$lt' and not value < arg: return False
+                    if op == '$lte' and not value <= arg: return False
+                except TypeError:
+                    return False
+            elif op == '$regex':
+                flags = re.IGNORECASE if 'i' in condition.get('$options', '') else 0
+                if not found or not isinstance(value, str) or not re.search(arg, value, flags):
+                    return False
+            elif op == '$options':
+                continue
+            else:
+                raise ValueError(f"Unsupported query operator in in-memory store: {op}")
+        return True
+
+    if condition is None:
+        # Like MongoDB, {field: None} also matches documents without the field
+        return not found or value is None
+    if isinstance(value, list) and not isinstance(condition, list):
+        return found and condition in value
+    return found and value == condition
+
+
+def _matches(doc, query):
+    for key, condition in (query or {}).items():
+        if key == '$and':
+            if not all(_matches(doc, sub) for sub in condition):
+                return False
+        elif key == '$or':
+            if not any(_matches(doc, sub) for sub in condition):
+                return False
+        else:
+            found, value = _get_path(doc, key)
+            if not _match_condition(found, value, condition):
+                return False
+    return True
+
+
+def _project(doc, projection):
+    if not projection:
+        return copy.deepcopy(doc)
+
+    include_id = projection.get('_id', 1)
+    fields = {k: v for k, v in projection.items() if k != '_id'}
+
+    if fields and all(fields.values()):
+        result = {}
+        for path in fields:
+            found, value = _get_path(doc, path)
+            if found:
+                _set_path(result, path, copy.deepcopy(value))
+    else:
+        result = copy.deepcopy(doc)
+        for path in fields:
+            _unset_path(result, path)
+
+    if include_id and '_id' in doc:
+        result['_id'] = doc['_id']
+    else:
+        result.pop('_id', None)
+    return result
+
+
+def _apply_update(doc, update, is_insert=False):
+    for op, changes in update.items():
+        if op == '$set':
+            for path, value in changes.items():
+                _set_path(doc, path, copy.deepcopy(value))
+        elif op == '$setOnInsert':
+            if is_insert:
+                for path, value in changes.items():
+                    _set_path(doc, path, copy.deepcopy(value))
+        elif op == '$unset':
+            for path in changes:
+                _unset_path(doc, path)
+        elif op == '$inc':
+            for path, amount in changes.items():
+                _, current = _get_path(doc, path)
+                _set_path(doc, path, (current or 0) + amount)
+        elif op == '$push':
+            for path, value in changes.items():
+                _, current = _get_path(doc, path)
+                if isinstance(value, dict) and '$each' in value:
+                    items = (current or []) + copy.deepcopy(value['$each'])
+                    limit = value.get('$slice')
+                    if limit is not None:
+                        items = items[limit:] if limit < 0 else items[:limit]
+                else:
+                    items = (current or []) + [copy.deepcopy(value)]
+                _set_path(doc, path, items)
+        else:
+            raise ValueError(f"Unsupported update operator in in-memory store: {op}")
+
+
+def _sort_key(value):
+    # Missing/None sorts first like in MongoDB, then numbers, then everything else by string form
+    if value is None:
+        return (0, 0, '')
+    if isinstance(value, (int, float)):
+        return (1, value, '')
+    return (2, 0, str(value))
+
+
+class _Result:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class InMemoryCursor:
+    """Lazy cursor supporting sort/skip/limit chaining."""
+
+    def __init__(self, docs, projection):
+        self._docs = docs
+        self._projection = projection
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key_or_list, direction=1):
+        keys = [(key_or_list, direction)] if isinstance(key_or_list, str) else list(key_or_list)
+        for field, field_direction in reversed(keys):
+            self._docs.sort(key=lambda d: _sort_key(_get_path(d, field)[1]), reverse=field_direction < 0)
+        return self
+
+    def skip(self, count):
+        self._skip = count
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def __iter__(self):
+        end = self._skip + self._limit if self._limit else None
+        for doc in self._docs[self._skip:end]:
+            yield _project(doc, self._projection)
+
+
+class InMemoryCollection:
+    """Thread-safe in-memory collection implementing the pymongo calls used by PortalRepository."""
+
+    def __init__(self, name):
+        self.name = name
+        self._docs = []
+        self._unique_fields = []
+        self._lock = threading.RLock()
+
+    def create_index(self, keys, unique=False, sparse=False, **kwargs):
+        fields = [keys] if isinstance(keys, str) else [k for k, _ in keys]
+        if unique:
+            self._unique_fields.append((tuple(fields), sparse))
+        return "_".join(fields)
+
+    def _check_unique(self, candidate, ignore=None):
+        for fields, sparse in self._unique_fields:
+            values = tuple(_get_path(candidate, f)[1] for f in fields)
+            if sparse and all(v is None for v in values):
+                continue
+            for doc in self._docs:
+                if doc is ignore:
+                    continue
+                if tuple(_get_path(doc, f)[1] for f in fields) == values:
+                    raise DuplicateKeyError(f"Duplicate key for index {fields}: {values}")
+
+    def insert_one(self, document):
+        with self._lock:
+            doc = copy.deepcopy(document)
+            doc.setdefault('_id', uuid.uuid4().hex)
+            self._check_unique(doc)
+            self._docs.append(doc)
+            document.setdefault('_id', doc['_id'])
+            return _Result(inserted_id=doc['_id'])
+
+    def insert_many(self, documents):
+        return _Result(inserted_ids=[self.insert_one(doc).inserted_id for doc in documents])
+
+    def find(self, filter=None, projection=None):
+        with self._lock:
+            return InMemoryCursor([d for d in self._docs if _matches(d, filter)], projection)
+
+    def find_one(self, filter=None, projection=None):
+        with self._lock:
+            for doc in self._docs:
+                if _matches(doc, filter):
+                    return _project(doc, projection)
+        return None
+
+    def count_documents(self, filter=None):
+        with self._lock:
+            return sum(1 for d in self._docs if _matches(d, filter))
+
+    def distinct(self, field, filter=None):
+        values = []
+        with self._lock:
+            for doc in self._docs:
+                found, value = _get_path(doc, field)
+                if found and _matches(doc, filter) and value not in values:
+                    values.append(value)
+        return values
+
+    def update_one(self, filter, update, upsert=False):
+        with self._lock:
+            for doc in self._docs:
+                if _matches(doc, filter):
+                    updated = copy.deepcopy(doc)
+                    _apply_update(updated, update)
+                    self._check_unique(updated, ignore=doc)
+                    doc.clear()
+                    doc.update(updated)
+                    return _Result(matched_count=1, modified_count=1, upserted_id=None)
+
+            if not upsert:
+                return _Result(matched_count=0, modified_count=0, upserted_id=None)
+
+            new_doc = {k: copy.deepcopy(v) for k, v in (filter or {}).items() if not k.startswith('$') and not isinstance(v, dict)}
+            _apply_update(new_doc, update, is_insert=True)
+            inserted_id = self.insert_one(new_doc).inserted_id
+            return _Result(matched_count=0, modified_count=0, upserted_id=inserted_id)
+
+    def update_many(self, filter, update):
+        with self._lock:
+            matched = [d for d in self._docs if _matches(d, filter)]
+            for doc in matched:
+                _apply_update(doc, update)
+            return _Result(matched_count=len(matched), modified_count=len(matched))
+
+    def replace_one(self, filter, replacement, upsert=False):
+        with self._lock:
+            for doc in self._docs:
+                if _matches(doc, filter):
+                    new_doc = copy.deepcopy(replacement)
+                    new_doc['_id'] = doc['_id']
+                    self._check_unique(new_doc, ignore=doc)
+                    doc.clear()
+                    doc.update(new_doc)
+                    return _Result(matched_count=1, modified_count=1, upserted_id=None)
+            if upsert:
+                return _Result(matched_count=0, modified_count=0, upserted_id=self.insert_one(replacement).inserted_id)
+            return _Result(matched_count=0, modified_count=0, upserted_id=None)
+
+    def delete_one(self, filter):
+        with self._lock:
+            for i, doc in enumerate(self._docs):
+                if _matches(doc, filter):
+                    del self._docs[i]
+                    return _Result(deleted_count=1)
+        return _Result(deleted_count=0)
+
+    def delete_many(self, filter):
+        with self._lock:
+            kept = [d for d in self._docs if not _matches(d, filter)]
+            deleted = len(self._docs) - len(kept)
+            self._docs = kept
+            return _Result(deleted_count=deleted)
+
+    def bulk_write(self, requests, ordered=True):
+        """Applies a list of WriteOps under a single lock acquisition (the stand-in for one round trip)."""
+        with self._lock:
+            results = [op.apply(self) for op in requests]
+            return _Result(
+                acknowledged=True, operation_count=len(requests),
+                matched_count=sum(getattr(r, 'matched_count', 0) for r in results),
+            )
+
+
+class InMemoryDatabase:
+    """Dictionary of InMemoryCollections, standing in for a pymongo Database in tests and offline runs."""
+
+    def __init__(self):
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = InMemoryCollection(name)
+            return self._collections[name]
+
+    def list_collection_names(self):
+        return list(self._collections)
+
+
+# --------------------------------------------------
+# BATCHED WRITES
+# --------------------------------------------------
+
+class WriteOp:
+    """A single queued write, applied directly or sent as part of a bulk_write."""
+
+    def __init__(self, kind, filter=None, document=None, upsert=False):
+        self.kind = kind
+        self.filter = filter
+        self.document = document
+        self.upsert = upsert
+
+    def apply(self, collection):
+        if self.kind == "insert_one":
+            return collection.insert_one(self.document)
+        if self.kind == "update_one":
+            return collection.update_one(self.filter, self.document, upsert=self.upsert)
+        if self.kind == "update_many":
+            return collection.update_many(self.filter, self.document)
+        if self.kind == "delete_many":
+            return collection.delete_many(self.filter)
+        raise ValueError(f"Unsupported write operation: {self.kind}")
+
+    def to_request(self):
+        """Converts the operation to the equivalent pymongo bulk request."""
+        from pymongo import InsertOne, UpdateOne, UpdateMany, DeleteMany
+        if self.kind == "insert_one":
+            return InsertOne(self.document)
+        if self.kind == "update_one":
+            return UpdateOne(self.filter, self.document, upsert=self.upsert)
+        if self.kind == "update_many":
+            return UpdateMany(self.filter, self.document)
+        if self.kind == "delete_many":
+            return DeleteMany(self.filter)
+        raise ValueError(f"Unsupported write operation: {self.kind}")
+
+
+class BatchWriter:
+    """
+    Queues repository writes and sends them as one bulk_write per collection.
+    Use as a context manager; anything still queued is flushed when the block exits.
+    """
+
+    def __init__(self, repo, flush_size=None, flush_interval=None):
+        self.repo = repo
+        self.flush_size = STORE_BATCH_SIZE if flush_size is None else flush_size
+        self.flush_interval = STORE_BATCH_INTERVAL_S if flush_interval is None else flush_interval
+        self.flush_count = 0
+        self._pending = {}
+        self._queued = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, collection_name, op):
+        with self._lock:
+            self._pending.setdefault(collection_name, []).append(op)
+            self._queued += 1
+            due = (self.flush_size and self._queued >= self.flush_size) or (
+                self.flush_interval and time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Sends all queued writes; returns the number of operations written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            written, self._queued = self._queued, 0
+            self._last_flush = time.monotonic()
+
+        for collection_name, ops in pending.items():
+            self.repo.bulk_apply(collection_name, ops)
+        if 'resumes' in pending:
+            self.repo._bump_pipeline_version()
+        if written:
+            self.flush_count += 1
+        return written
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Writes queued before an error are still persisted
+        self.flush()
+        return False
+
+
+# --------------------------------------------------
+# REPOSITORY LAYER
+# --------------------------------------------------
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _resume_state(doc):
+    """The fields the statistics counters and daily rollups are keyed on."""
+    return (
+        doc.get('status') or "Pending",
+        doc.get('submitted_date') or "unknown",
+        doc.get('applied_jd') or "N/A (Pending Assignment)",
+    )
+
+
+def resume_row_fields(resume):
+    """
+    Denormalized fields shown on a Candidate Approval row, so listing never reads the parsed JSON.
+    Build them before the parsed JSON is offloaded; afterwards this reads the blob back.
+    """
+    parsed = load_field(resume, 'parsed') or {}
+    education = parsed.get('education') or []
+    education_head = str(education[0]) if education else "N/A"
+    if len(education_head) > 60:
+        education_head = education_head[:57] + "..."
+    return {
+        "email": parsed.get('email', 'N/A'),
+        "phone": parsed.get('phone', 'N/A'),
+        "education_head": education_head,
+        "summary": parsed.get('summary'),
+    }
+
+
+class PortalRepository:
+    """Persistence for JDs, resumes, match results, statuses and vendors (MongoDB or the in-memory stand-in)."""
+
+    # Store-only bookkeeping fields are left out of the dicts handed back to session state
+    SESSION_RESUME_PROJECTION = {"_id": 0, "created_at": 0, "status": 0, "status_updated_at": 0, "status_ops": 0, "row": 0}
+    # Only what a Candidate Approval row renders; full_text and parsed are fetched on expand.
+    # The document id is kept so row actions address exactly that resume, not every resume of the same name.
+    RESUME_ROW_PROJECTION = {"_id": 1, "name": 1, "status": 1, "applied_jd": 1, "submitted_date": 1, "row": 1}
+    RESUME_PAGE_SORTS = {
+        "Newest first": ("created_at", -1),
+        "Oldest first": ("created_at", 1),
+        "Name (A-Z)": ("name", 1),
+        "Submitted date (latest)": ("submitted_date", -1),
+    }
+    SESSION_VENDOR_PROJECTION = {"_id": 0, "vendor_id": 0, "status": 0, "created_at": 0, "status_updated_at": 0, "status_ops": 0}
+
+    def __init__(self, db, backend="memory"):
+        self.db = db
+        self.backend = backend
+        self.jds = db['jds']
+        self.resumes = db['resumes']
+        self.match_results = db['match_results']
+        self.vendors = db['vendors']
+        self.meta = db['meta']
+        self.stats = db['stats']
+        self.daily_rollups = db['daily_rollups']
+        self.answer_cache = db['answer_cache']
+        self.course_plans = db['course_plans']
+        self.ensure_indexes()
+        self.backfill_row_fields()
+        if self.stats.find_one({"_id": "resumes"}) is None:
+            self.rebuild_stats()
+
+    def ensure_indexes(self):
+        self.jds.create_index([("owner", 1), ("name", 1)])
+        self.resumes.create_index("content_hash", unique=True, sparse=True)
+        self.resumes.create_index("name")
+        self.resumes.create_index("status")
+        self.resumes.create_index("applied_jd")
+        self.resumes.create_index("submitted_date")
+        self.resumes.create_index("created_at")
+        self.match_results.create_index([("owner", 1), ("numeric_score", -1)])
+        self.vendors.create_index("vendor_id", unique=True)
+        self.vendors.create_index("status")
+        self.daily_rollups.create_index("submitted_date")
+        self.answer_cache.create_index("doc_key")
+
+    # --- Batched Writes ---
+
+    def batch(self, flush_size=None, flush_interval=None):
+        """Returns a BatchWriter; pass it as batch= to the write methods below."""
+        return BatchWriter(self, flush_size, flush_interval)
+
+    def bulk_apply(self, collection_name, ops):
+        """Sends a list of WriteOps to one collection in a single round trip; returns the bulk result."""
+        if not ops:
+            return None
+        collection = self.db[collection_name]
+        if isinstance(collection, InMemoryCollection):
+            return collection.bulk_write(ops)
+        return collection.bulk_write([op.to_request() for op in ops], ordered=True)
+
+    def _write(self, collection_name, op, batch=None):
+        if batch is not None:
+            batch.add(collection_name, op)
+            return
+        op.apply(self.db[collection_name])
+        if collection_name == 'resumes':
+            self._bump_pipeline_version()
+
+    # --- Job Descriptions ---
+
+    def list_jds(self, owner):
+        return list(self.jds.find({"owner": owner}, {"_id": 0, "owner": 0, "created_at": 0}).sort("created_at", 1))
+
+    def list_jd_names(self, owner):
+        return [doc['name'] for doc in self.jds.find({"owner": owner}, {"_id": 0, "name": 1}).sort("created_at", 1)]
+
+    def add_jd(self, owner, jd_item):
+        self.jds.insert_one({**jd_item, "owner": owner, "created_at": _now()})
+        self._write('stats', WriteOp("update_one", {"_id": f"jds:{owner}"}, {"$inc": {"total": 1}}, upsert=True))
+
+    def clear_jds(self, owner):
+        self.jds.delete_many({"owner": owner})
+        self.stats.delete_one({"_id": f"jds:{owner}"})
+
+    # --- Resumes & Statuses ---
+
+    def list_resumes(self):
+        return list(self.resumes.find({}, self.SESSION_RESUME_PROJECTION).sort("created_at", 1))
+
+    def resume_hashes(self):
+        """Content hashes of every stored resume (bulk ingestion skips these before parsing)."""
+        return {digest for digest in self.resumes.distinct("content_hash") if digest}
+
+    def find_resume_by_hash(self, digest):
+        if not digest:
+            return None
+        return self.resumes.find_one({"content_hash": digest}, self.SESSION_RESUME_PROJECTION)
+
+    def upsert_resume(self, resume, status="Pending", batch=None, row_fields=None):
+        """
+        Inserts or updates a parsed resume, keyed by content hash when known, else by name.
+        Pass row_fields (see resume_row_fields) when the parsed JSON has already been offloaded.
+        """
+        key = {"content_hash": resume['content_hash']} if resume.get('content_hash') else {"name": resume['name']}
+        fields = {k: v for k, v in resume.items() if k not in ('_id', 'status') and not (k == 'content_hash' and v is None)}
+        fields['row'] = row_fields if row_fields is not None else resume_row_fields(resume)
+        update = {"$set": fields, "$setOnInsert": {"status": status, "created_at": _now()}}
+
+        existing = self.resumes.find_one(key, self.RESUME_STATE_PROJECTION)
+        before = _resume_state(existing) if existing else None
+        after = _resume_state({**(existing or {"status": status}), **fields})
+
+        self._write('resumes', WriteOp("update_one", key, update, upsert=True), batch)
+        self._track_resume_transition(before, after, batch)
+
+    def backfill_row_fields(self):
+        """Adds the denormalized row fields to resumes stored before they existed."""
+        for doc in self.resumes.find({"row": {"$exists": False}}, {"_id": 1, "parsed": 1, "parsed_ref": 1}):
+            self.resumes.update_one({"_id": doc['_id']}, {"$set": {"row": resume_row_fields(doc)}})
+
+    @staticmethod
+    def _resume_page_query(status=None, applied_jd=None, name_query=None):
+        query = {}
+        if status:
+            query["status"] = status
+        if applied_jd:
+            query["applied_jd"] = applied_jd
+        if name_query:
+            query["name"] = {"$regex": re.escape(name_query), "$options": "i"}
+        return query
+
+    def count_resumes(self, status=None, applied_jd=None, name_query=None):
+        return self.resumes.count_documents(self._resume_page_query(status, applied_jd, name_query))
+
+    def list_resume_page(self, status=None, applied_jd=None, name_query=None, sort="Newest first", page=0, page_size=20):
+        """Returns one page of compact approval rows, filtered, sorted and sliced in the store."""
+        sort_field, direction = self.RESUME_PAGE_SORTS.get(sort, ("created_at", -1))
+        return list(
+            self.resumes.find(self._resume_page_query(status, applied_jd, name_query), self.RESUME_ROW_PROJECTION)
+            .sort([(sort_field, direction), ("name", 1)])
+            .skip(page * page_size)
+            .limit(page_size)
+        )
+
+    def get_resume_detail(self, resume_id):
+        """Loads the heavy fields (parsed JSON and full text) of a single resume, by document id."""
+        doc = self.resumes.find_one(
+            {"_id": resume_id}, {"_id": 0, "parsed": 1, "full_text": 1, "parsed_ref": 1, "full_text_ref": 1}
+        ) or {}
+        return {"parsed": load_field(doc, 'parsed', {}), "full_text": load_field(doc, 'full_text', "")}
+
+    def iter_resumes_for_index(self):
+        """Streams the fields the full-text search index needs (offloaded blobs are resolved by the index)."""
+        return self.resumes.find(
+            {}, {"_id": 0, "name": 1, "content_hash": 1, "parsed": 1, "full_text": 1, "parsed_ref": 1, "full_text_ref": 1}
+        )
+
+    def list_resume_summary(self):
+        return list(self.resumes.find(
+            {}, {"_id": 0, "name": 1, "applied_jd": 1, "submitted_date": 1, "status": 1}
+        ).sort("created_at", 1))
+
+    def clear_resumes(self):
+        self.resumes.delete_many({})
+        self.stats.delete_one({"_id": "resumes"})
+        self.daily_rollups.delete_many({})
+        self._bump_pipeline_version()
+
+    def resume_statuses(self, resume_names=None):
+        """{name: status}, for every resume or only the given names."""
+        query = {} if resume_names is None else {"name": {"$in": list(resume_names)}}
+        return {doc['name']: doc.get('status', 'Pending') for doc in self.resumes.find(query, {"name": 1, "status": 1})}
+
+    @staticmethod
+    def _resume_status_changes(status, applied_jd=None, submitted_date=None):
+        changes = {"status": status, "status_updated_at": _now()}
+        if applied_jd is not None:
+            changes["applied_jd"] = applied_jd
+        if submitted_date is not None:
+            changes["submitted_date"] = submitted_date
+        return changes
+
+    def _conditional_status_writes(self, collection_name, key_field, state_fields, items):
+        """
+        Writes [(doc, changes)] in one round trip, each only if the document still has the state read
+        into `doc` (key_field plus state_fields). Returns the items that were applied, so counters are
+        moved once per real transition even when another session changed the same document meanwhile.
+        """
+        ops, tokens = [], []
+        for doc, changes in items:
+            token = uuid.uuid4().hex
+            tokens.append(token)
+            state = {key_field: doc[key_field], **{field: doc.get(field) for field in state_fields}}
+            ops.append(WriteOp("update_one", state, {
+                "$set": changes,
+                "$push": {"status_ops": {"$each": [token], "$slice": -STATUS_OP_LOG}},
+            }))
+        if not ops:
+            return []
+
+        result = self.bulk_apply(collection_name, ops)
+        if result.matched_count == len(ops):
+            return list(items)
+        # Some documents changed after they were read: the tokens tell which writes matched
+        written = set()
+        for doc in self.db[collection_name].find({key_field: {"$in": [doc[key_field] for doc, _ in items]}}, {"status_ops": 1}):
+            written.update(doc.get('status_ops') or [])
+        return [item for item, token in zip(items, tokens) if token in written]
+
+    def _apply_resume_statuses(self, items):
+        """Conditionally writes [(doc, changes)] and moves the applied ones between counters; returns those."""
+        applied = self._conditional_status_writes('resumes', '_id', ('status', 'submitted_date', 'applied_jd'), items)
+        if applied:
+            self._bump_pipeline_version()
+            with self.batch(flush_size=0, flush_interval=0) as batch:
+                for doc, changes in applied:
+                    self._track_resume_transition(_resume_state(doc), _resume_state({**doc, **changes}), batch)
+        return applied
+
+    def set_resume_status(self, resume_id, status, applied_jd=None, submitted_date=None):
+        """Updates the status (and optionally applied JD and date) of one resume, by document id."""
+        changes = self._resume_status_changes(status, applied_jd, submitted_date)
+        for _ in range(STATUS_WRITE_ATTEMPTS):
+            doc = self.resumes.find_one({"_id": resume_id}, self.RESUME_STATE_PROJECTION_WITH_ID)
+            if doc is None or self._apply_resume_statuses([(doc, changes)]):
+                return
+
+    def set_resume_statuses(self, updates):
+        """
+        Applies several (resume id, status, applied_jd, submitted_date) transitions: the prior states
+        are read with one query and all writes are sent in one round trip. Resumes changed by another
+        session in between are retried one by one from their new state.
+        """
+        # Last change per resume wins
+        latest = {update[0]: update for update in updates}
+        docs = {
+            doc['_id']: doc
+            for doc in self.resumes.find({"_id": {"$in": list(latest)}}, self.RESUME_STATE_PROJECTION_WITH_ID)
+        }
+        items = [
+            (docs[resume_id], self._resume_status_changes(status, applied_jd, submitted_date))
+            for resume_id, status, applied_jd, submitted_date in latest.values() if resume_id in docs
+        ]
+        applied = {doc['_id'] for doc, _ in self._apply_resume_statuses(items)}
+        for resume_id, status, applied_jd, submitted_date in latest.values():
+            if resume_id in docs and resume_id not in applied:
+                self.set_resume_status(resume_id, status, applied_jd, submitted_date)
+
+    # --- Shared Candidate Pipeline ---
+
+    def pipeline_version(self):
+        """Monotonic counter bumped on every resume add/clear/status change (any session)."""
+        doc = self.meta.find_one({"_id": "pipeline"}, {"version": 1})
+        return doc.get('version', 0) if doc else 0
+
+    def _bump_pipeline_version(self):
+        self.meta.update_one({"_id": "pipeline"}, {"$inc": {"version": 1}}, upsert=True)
+
+    def list_candidates_by_status(self, status):
+        """Index-backed lookup of the compact pipeline rows for one status."""
+        return list(self.resumes.find(
+            {"status": status},
+            {"_id": 0, "name": 1, "applied_jd": 1, "submitted_date": 1, "status_updated_at": 1}
+        ).sort("status_updated_at", 1))
+
+    # --- Match Results ---
+
+    def list_match_results(self, owner):
+        return list(self.match_results.find({"owner": owner}, {"_id": 0, "owner": 0}).sort("numeric_score", -1))
+
+    def replace_match_results(self, owner, results):
+        ops = [WriteOp("delete_many", {"owner": owner})]
+        ops += [WriteOp("insert_one", document={**copy.deepcopy(r), "owner": owner}) for r in results or []]
+        self.bulk_apply('match_results', ops)
+
+    # --- Chat Answer Cache (see answer_cache.py) ---
+
+    def list_cached_answers(self, doc_key):
+        return list(self.answer_cache.find({"doc_key": doc_key}, {"_id": 0}).sort("updated_at", 1))
+
+    def put_cached_answer(self, doc_key, question_key, question, answer):
+        self.answer_cache.update_one(
+            {"_id": f"{doc_key}|{question_key}"},
+            {"$set": {"doc_key": doc_key, "question_key": question_key, "question": question, "answer": answer, "updated_at": _now()}},
+            upsert=True
+        )
+
+    # --- Gap Course Plan Cache (see course_plans.py) ---
+
+    def get_cached_course_plan(self, plan_key):
+        doc = self.course_plans.find_one({"_id": plan_key}, {"value": 1})
+        return doc['value'] if doc else None
+
+    def put_cached_course_plan(self, plan_key, kind, role, value):
+        self.course_plans.update_one(
+            {"_id": plan_key},
+            {"$set": {"kind": kind, "role": role, "value": value, "updated_at": _now()}},
+            upsert=True
+        )
+
+    # --- Vendors ---
+
+    def list_vendors(self):
+        return list(self.vendors.find({}, self.SESSION_VENDOR_PROJECTION).sort("created_at", 1))
+
+    def vendor_statuses(self):
+        return {doc['vendor_id']: doc.get('status', 'Pending Review') for doc in self.vendors.find({}, {"vendor_id": 1, "status": 1})}
+
+    def add_vendor(self, vendor_id, vendor, status):
+        self.vendors.insert_one({**vendor, "vendor_id": vendor_id, "status": status, "created_at": _now()})
+        self._track_vendor_transition(None, status)
+
+    def _apply_vendor_statuses(self, items):
+        """Conditionally writes [(doc, changes)] and moves the applied ones between counters; returns those."""
+        applied = self._conditional_status_writes('vendors', 'vendor_id', ('status',), items)
+        with self.batch(flush_size=0, flush_interval=0) as batch:
+            for doc, changes in applied:
+                self._track_vendor_transition(doc.get('status', 'Pending Review'), changes['status'], batch)
+        return applied
+
+    def set_vendor_status(self, vendor_id, status):
+        for _ in range(STATUS_WRITE_ATTEMPTS):
+            doc = self.vendors.find_one({"vendor_id": vendor_id}, {"_id": 0, "vendor_id": 1, "status": 1})
+            if doc is None or self._apply_vendor_statuses([(doc, {"status": status, "status_updated_at": _now()})]):
+                return
+
+    def set_vendor_statuses(self, changes):
+        """
+        Applies {vendor_id: status} changes: one query reads the prior statuses and one round trip
+        writes them. Vendors changed by another session in between are retried one by one.
+        """
+        docs = {
+            doc['vendor_id']: doc
+            for doc in self.vendors.find({"vendor_id": {"$in": list(changes)}}, {"_id": 0, "vendor_id": 1, "status": 1})
+        }
+        items = [
+            (docs[vendor_id], {"status": status, "status_updated_at": _now()})
+            for vendor_id, status in changes.items() if vendor_id in docs
+        ]
+        applied = {doc['vendor_id'] for doc, _ in self._apply_vendor_statuses(items)}
+        for vendor_id, status in changes.items():
+            if vendor_id in docs and vendor_id not in applied:
+                self.set_vendor_status(vendor_id, status)
+
+    def count_vendors(self, status=None):
+        return self.vendors.count_documents({"status": status} if status else {})
+
+    def list_vendor_page(self, status=None, page=0, page_size=25):
+        """Returns one page of vendors (including vendor_id and status), oldest first."""
+        return list(
+            self.vendors.find({"status": status} if status else {}, {"_id": 0, "created_at": 0, "status_updated_at": 0, "status_ops": 0})
+            .sort([("created_at", 1), ("vendor_id", 1)])
+            .skip(page * page_size)
+            .limit(page_size)
+        )
+
+    # --- Incremental Statistics ---
+    # Counters live in `stats` ({_id: "resumes" | "vendors" | "jds:<owner>", total, by_status}) and
+    # daily rollups in `daily_rollups` ({submitted_date, status, applied_jd, count}). Every write
+    # above emits the matching $inc, so reading them never scans the resume or vendor collections.
+
+    RESUME_STATE_PROJECTION = {"_id": 0, "status": 1, "submitted_date": 1, "applied_jd": 1}
+    RESUME_STATE_PROJECTION_WITH_ID = {"_id": 1, "status": 1, "submitted_date": 1, "applied_jd": 1}
+
+    def _inc_stats(self, stats_id, inc, batch=None):
+        inc = {field: amount for field, amount in inc.items() if amount}
+        if inc:
+            self._write('stats', WriteOp("update_one", {"_id": stats_id}, {"$inc": inc}, upsert=True), batch)
+
+    def _track_resume_transition(self, before, after, batch=None):
+        """Moves one resume between counters; `before`/`after` are (status, submitted_date, applied_jd) or None."""
+        if before == after:
+            return
+
+        inc = {"total": (1 if after else 0) - (1 if before else 0)}
+        for state, amount in ((before, -1), (after, 1)):
+            if not state:
+                continue
+            inc[f"by_status.{state[0]}"] = inc.get(f"by_status.{state[0]}", 0) + amount
+            status, submitted_date, applied_jd = state
+            self._write('daily_rollups', WriteOp(
+                "update_one",
+                {"_id": f"{submitted_date}|{status}|{applied_jd}"},
+                {
+                    "$inc": {"count": amount},
+                    "$setOnInsert": {"submitted_date": submitted_date, "status": status, "applied_jd": applied_jd},
+                },
+                upsert=True
+            ), batch)
+        self._inc_stats("resumes", inc, batch)
+
+    def _track_vendor_transition(self, before_status, after_status, batch=None):
+        if before_status == after_status:
+            return
+        inc = {"total": (1 if after_status else 0) - (1 if before_status else 0)}
+        if before_status:
+            inc[f"by_status.{before_status}"] = -1
+        if after_status:
+            inc[f"by_status.{after_status}"] = inc.get(f"by_status.{after_status}", 0) + 1
+        self._inc_stats("vendors", inc, batch)
+
+    def rebuild_stats(self):
+        """Recomputes all counters and rollups from scratch (first start against an existing store)."""
+        self.stats.delete_many({})
+        self.daily_rollups.delete_many({})
+        with self.batch(flush_size=0, flush_interval=0) as batch:
+            for doc in self.resumes.find({}, self.RESUME_STATE_PROJECTION):
+                self._track_resume_transition(None, _resume_state(doc), batch)
+        for doc in self.vendors.find({}, {"status": 1}):
+            self._track_vendor_transition(None, doc.get('status', 'Pending Review'))
+        for owner in self.jds.distinct("owner"):
+            self._inc_stats(f"jds:{owner}", {"total": self.jds.count_documents({"owner": owner})})
+
+    def get_stats(self, owner=ADMIN_OWNER):
+        """Returns the maintained counters: {'resumes': {...}, 'vendors': {...}, 'jds': int}."""
+        counters = {doc['_id']: doc for doc in self.stats.find({"_id": {"$in": ["resumes", "vendors", f"jds:{owner}"]}})}
+        empty = {"total": 0, "by_status": {}}
+        return {
+            "resumes": {**empty, **counters.get("resumes", {})},
+            "vendors": {**empty, **counters.get("vendors", {})},
+            "jds": counters.get(f"jds:{owner}", {}).get("total", 0),
+        }
+
+    def list_daily_rollups(self, since=None):
+        """Returns non-empty (submitted_date, status, applied_jd, count) rollups, oldest first."""
+        query = {"count": {"$gt": 0}}
+        if since:
+            query["submitted_date"] = {"$gte": since}
+        return list(self.daily_rollups.find(query, {"_id": 0}).sort([("submitted_date", 1), ("status", 1)]))
+
+
+# --- Repository Access ---
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def _connect_mongo():
+    """Returns a pymongo Database, or None if pymongo/mongod is unavailable."""
+    try:
+        from pymongo import MongoClient
+        client = MongoClient(MONGODB_URI, serverSelectionTimeoutMS=MONGODB_TIMEOUT_MS)
+        client.admin.command('ping')
+        return client[MONGODB_DB]
+    except Exception as e:
+        logger.warning("MongoDB unavailable (%s); falling back to the in-memory store.", e)
+        return None
+
+
+def get_repository():
+    """Returns the process-wide repository, connecting to MongoDB on first use."""
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                db = _connect_mongo() if MONGODB_URI else None
+                if db is not None:
+                    _repository = PortalRepository(db, backend="mongodb")
+                else:
+                    _repository = PortalRepository(InMemoryDatabase(), backend="memory")
+    return _repository
+
+
+class PipelineView:
+    """
+    Process-wide, versioned cache of candidates per status shared by every session.
+    Entries are refreshed only when the store's pipeline version has moved on.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def candidates(self, repo, status):
+        version = repo.pipeline_version()
+        with self._lock:
+            cached = self._entries.get(status)
+            if cached and cached[0] == version:
+                return cached[1]
+
+        rows = repo.list_candidates_by_status(status)
+        with self._lock:
+            self._entries[status] = (version, rows)
+        return rows
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+
+pipeline_view = PipelineView()
+
+
+def get_approved_candidates(repo=None):
+    """Returns the approved candidates visible to every session, cached until the next status change."""
+    return pipeline_view.candidates(repo or get_repository(), "Approved")
+
+
+def load_session_data(repo, session_state, user_type, user_email=None):
+    """
+    Hydrates the session state keys of one role's dashboard from the store (called on login).
+    Admins get the admin keys, candidates only their own JDs; hiring managers read approved
+    candidates through get_approved_candidates, so nothing is copied for them. Resumes are not
+    loaded here: the approval tab pages them from the store and the analysis tab loads them on request.
+    """
+    if user_type == "admin":
+        session_state['admin_jd_list'] = repo.list_jds(ADMIN_OWNER)
+        session_state['resumes_to_analyze'] = []
+        session_state.pop('loaded_resume_hashes', None)
+        session_state['admin_match_results'] = repo.list_match_results(ADMIN_OWNER)
+        # Statuses are only shown next to match results
+        session_state['resume_statuses'] = repo.resume_statuses(
+            {item['resume_name'] for item in session_state['admin_match_results']}
+        )
+        session_state['vendors'] = repo.list_vendors()
+        session_state['vendor_statuses'] = repo.vendor_statuses()
+    elif user_type == "candidate" and user_email:
+        session_state['candidate_jd_list'] = repo.list_jds(user_email)
@@ -0,0 +1,223 @@
+"""
+Document text extraction and LLM parsing without Streamlit, so ZIP ingestion workers and
+the ingestion CLI can call them off the script thread. The dashboards wrap the LLM calls
+in st.cache_data.
+"""
+import os
+import re
+import json
+import threading
+from io import BytesIO
+from dotenv import load_dotenv
+
+# -------------------------
+# CONFIGURATION & API SETUP
+# -------------------------
+
+GROQ_MODEL = "llama-3.1-8b-instant"
+load_dotenv()
+GROQ_API_KEY = os.getenv('GROQ_API_KEY')
+
+
+class MockGroqClient:
+    def chat(self):
+        class Completions:
+            def create(self, **kwargs):
+                raise ValueError("GROQ_API_KEY not set. AI functions disabled.")
+        return Completions()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Returns the Groq client (or the mock without an API key), constructed on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if GROQ_API_KEY:
+                    # Imported here so the login page never pays for the groq/httpx import
+                    from groq import Groq
+                    _client = Groq(api_key=GROQ_API_KEY)
+                else:
+                    _client = MockGroqClient()
+    return _client
+
+
+# --- File Extraction ---
+
+def get_file_type(file_path):
+    """Identifies the file type based on its extension."""
+    ext = os.path.splitext(file_path)[1].lower().strip('.')
+    if ext == 'pdf': return 'pdf'
+    elif ext == 'docx': return 'docx'
+    elif ext == 'xlsx': return 'xlsx'
+    else: return 'txt' 
+
+def extract_content(file_type, file_path):
+    """
+    Extracts text content from various file types (Simplified for admin context).
+    file_path may also be a binary file-like object (e.g. a ZIP archive member).
+    """
+    text = ''
+    try:
+        # Parser libraries are imported on first use of each file type
+        if file_type == 'pdf':
+            import pdfplumber
+            with pdfplumber.open(file_path) as pdf:
+                for page in pdf.pages:
+                    page_text = page.extract_text()
+                    if page_text:
+                        text += page_text + '\n'
+        elif file_type == 'docx':
+            import docx
+            doc = docx.Document(file_path)
+            text = '\n'.join([para.text for para in doc.paragraphs])
+        elif file_type == 'xlsx':
+            import openpyxl
+            workbook = openpyxl.load_workbook(file_path)
+            # Simplified XLSX reading for content
+            for sheet in workbook.sheetnames:
+                ws = workbook[sheet]
+                for row in ws.iter_rows(values_only=True):
+                    row_text = ' | '.join([str(c) for c in row if c is not None])
+                    if row_text.strip():
+                        text += row_text + '\n'
+        elif hasattr(file_path, 'read'):
+            raw = file_path.read()
+            try:
+                text = raw.decode('utf-8')
+            except UnicodeDecodeError:
+                text = raw.decode('latin-1')
+        else:
+             with open(file_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+
+        if not text.strip():
+            return f"Error: {file_type.upper()} content extraction failed."
+        
+        return text
+    
+    except Exception as e:
+        return f"Fatal Extraction Error: Failed to read file content ({file_type}). Error: {e}"
+
+
+# --- LLM Parsing ---
+
+JD_METADATA_FALLBACK = {"role": "General Analyst (LLM Error)", "job_type": "Full-time (LLM Error)", "key_skills": ["LLM Error", "Fallback"]}
+
+
+def extract_jd_metadata(jd_text):
+    """Extracts structured metadata (Role, Job Type, Key Skills) from raw JD text."""
+    try:
+        return request_jd_metadata(jd_text)
+    except Exception:
+        return dict(JD_METADATA_FALLBACK, key_skills=list(JD_METADATA_FALLBACK['key_skills']))
+
+
+def request_jd_metadata(jd_text):
+    """
+    Same as extract_jd_metadata, but an LLM or JSON failure is raised instead of being replaced by
+    the fallback metadata, so callers can tell a rate limit (status code 429) from a bad reply.
+    """
+    if not GROQ_API_KEY:
+        return {"role": "N/A", "job_type": "N/A", "key_skills": []}
+
+    prompt = f"""Analyze the following Job Description and extract the key metadata.
+    
+    Job Description:
+    {jd_text}
+    
+    Provide the output strictly as a JSON object with the following three keys:
+    1.  **role**: The main job title (e.g., 'Data Scientist', 'Senior Software Engineer'). If not clear, default to 'General Analyst'.
+    2.  **job_type**: The employment type (e.g., 'Full-time', 'Contract', 'Internship', 'Remote'). If not clear, default to 'Full-time'.
+    3.  **key_skills**: A list of 5 to 10 most critical hard and soft skills required (e.g., ['Python', 'AWS', 'Teamwork', 'SQL']).
+    
+    Example Output: {{"role": "Software Engineer", "job_type": "Full-time", "key_skills": ["Python", "JavaScript", "React", "AWS", "Agile"]}}
+    """
+    response = get_client().chat.completions.create(
+        model=GROQ_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.0
+    )
+    content = response.choices[0].message.content.strip()
+
+    json_match = re.search(r'\{.*\}', content, re.DOTALL)
+    if json_match:
+        json_str = json_match.group(0).strip()
+        if json_str.startswith('```json'):
+            json_str = json_str[len('```json'):].strip()
+        if json_str.endswith('```'):
+            json_str = json_str[:-len('```')].strip()
+
+        parsed = json.loads(json_str)
+    else:
+        raise json.JSONDecodeError("Could not isolate a valid JSON structure from LLM response.", content, 0)
+
+    return {
+        "role": parsed.get("role", "General Analyst"),
+        "job_type": parsed.get("job_type", "Full-time"),
+        "key_skills": [s.strip() for s in parsed.get("key_skills", []) if isinstance(s, str)]
+    }
+
+
+def parse_with_llm(text, return_type='json'):
+    """Sends resume text to the LLM for structured information extraction (Simplified for admin context)."""
+    if text.startswith("Error") or not GROQ_API_KEY:
+        return {"error": "Parsing error or API key missing.", "raw_output": ""}
+
+    prompt = f"""Extract the following information from the resume in structured JSON.
+    - Name, - Email, - Phone, - Skills, - Education, 
+    - Experience, - Certifications, 
+    - Projects, - Strength, 
+    - Personal Details, - Github, - LinkedIn
+    
+    Also, provide a key called **'summary'** which is a single, brief paragraph (3-4 sentences max) summarizing the candidate's career highlights and most relevant skills.
+    
+    Resume Text: {text}
+    
+    Provide the output strictly as a JSON object.
+    """
+    content = ""
+    parsed = {}
+    try:
+        response = get_client().chat.completions.create(
+            model=GROQ_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2
+        )
+        content = response.choices[0].message.content.strip()
+        json_match = re.search(r'\{.*\}', content, re.DOTALL)
+        if json_match:
+            json_str = json_match.group(0).strip()
+            json_str = json_str.replace('```json', '').replace('```', '').strip()
+            parsed = json.loads(json_str)
+        else:
+            raise json.JSONDecodeError("Could not isolate a valid JSON structure.", content, 0)
+    except Exception as e:
+        parsed = {"error": f"LLM error: {e}", "raw_output": content}
+
+    return parsed
+
+
+def parse_resume_bytes(file_name, data):
+    """Parses a resume held in memory (e.g. a ZIP member or a file read by the CLI)."""
+    text = extract_content(get_file_type(file_name), BytesIO(data))
+
+    if text.startswith("Error") or text.startswith("Fatal"):
+        return {"error": text, "full_text": text, "name": file_name}
+
+    parsed = parse_with_llm(text, return_type='json')
+
+    if "error" in parsed:
+        return {"error": parsed.get('error', 'Unknown parsing error'), "full_text": text, "name": file_name}
+
+    fallback_name = os.path.splitext(os.path.basename(file_name))[0]
+    return {
+        "parsed": parsed,
+        "full_text": text,
+        "excel_data": None,
+        "name": parsed.get('name', fallback_name)
+    }
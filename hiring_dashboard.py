@@ -1,6 +1,7 @@
 import streamlit as st
 
 import streamlit as st
+from data_store import get_repository, get_approved_candidates, ADMIN_OWNER
 
 def hiring_dashboard(go_to_func):
     """
@@ -33,20 +34,20 @@ def hiring_dashboard(go_to_func):
 
     st.header("Candidate Review Pipeline")
     
-    # --- Check and Initialize necessary states if they somehow missed the global init ---
-    if 'resumes_to_analyze' not in st.session_state: st.session_state.resumes_to_analyze = []
-    if 'resume_statuses' not in st.session_state: st.session_state.resume_statuses = {}
-    if 'admin_jd_list' not in st.session_state: st.session_state.admin_jd_list = []
-    
-    # Example: Display candidates with 'Approved' status from admin's data
-    approved_candidates = [
-        r['name'] for r in st.session_state.resumes_to_analyze 
-        if st.session_state.resume_statuses.get(r['name']) == 'Approved'
-    ]
+    # Approvals come from the shared store, so decisions made in any Admin session show up here.
+    # The list is cached process-wide and only re-queried after a status change.
+    approved_candidates = get_approved_candidates()
     
     if approved_candidates:
         st.subheader(f"✅ Approved Candidates Ready for Interview ({len(approved_candidates)})")
-        st.dataframe({"Candidate Name": approved_candidates})
+        st.dataframe(
+            {
+                "Candidate Name": [c['name'] for c in approved_candidates],
+                "Applied JD": [c.get('applied_jd', 'N/A') for c in approved_candidates],
+                "Submitted Date": [c.get('submitted_date', 'N/A') for c in approved_candidates],
+            },
+            use_container_width=True
+        )
     else:
         st.info("No candidates have been approved by the Admin yet.")
 
@@ -54,10 +55,11 @@ def hiring_dashboard(go_to_func):
     
     st.header("Job Description Tracker")
     
-    if st.session_state.admin_jd_list:
+    admin_jd_names = get_repository().list_jd_names(ADMIN_OWNER)
+    if admin_jd_names:
         st.subheader("Active Job Descriptions")
-        # Extract name and clean the simulated prefix if present
-        jd_names = [item['name'].replace("--- Simulated JD for: ", "") for item in st.session_state.admin_jd_list]
+        # Clean the simulated prefix if present
+        jd_names = [name.replace("--- Simulated JD for: ", "") for name in admin_jd_names]
         st.dataframe({"Job Title": jd_names, "Status": ["Active"] * len(jd_names)}, use_container_width=True)
     else:
         st.warning("No Job Descriptions are currently loaded in the system.")
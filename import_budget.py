@@ -0,0 +1,117 @@
+"""
+Checks the cold-start import cost of the login page with `python -X importtime`.
+
+Usage:
+    python import_budget.py                  # fails (exit 1) when over budget
+    python import_budget.py --budget-ms 150 --top 15
+
+Streamlit itself is imported first and excluded: the budget covers only what `main_app`
+adds on top of it before the login page can render. The check also fails if any of the
+dashboards, the data store or their dependencies (pandas, pdfplumber, python-docx, openpyxl,
+groq, pymongo) is imported, since those should load at first use, not at startup.
+tests/test_import_budget.py runs the same check under pytest.
+
+Runs in a fresh interpreter each time so nothing is already cached in sys.modules; run it
+a few times (--repeat) and the median is compared, which smooths out a cold disk cache.
+"""
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+
+LOGIN_IMPORT_BUDGET_MS = float(os.getenv('PRAGYAN_LOGIN_IMPORT_BUDGET_MS', '250'))
+
+# Top-level package names that must not be imported before a dashboard is opened
+DEFERRED_MODULES = (
+    "admin_dashboard", "candidate_dashboard", "hiring_dashboard", "data_store",
+    "pandas", "pdfplumber", "docx", "openpyxl", "groq", "pymongo",
+)
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+ENTRY_SCRIPT = "import streamlit; import main_app"
+
+
+def measure_once():
+    """
+    Returns (main_app cumulative ms, [(module, self ms)] imported on behalf of main_app).
+    Raises RuntimeError if the import fails.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", ENTRY_SCRIPT],
+        cwd=here, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+
+    # Entries are printed children-first, so everything between the top-level `streamlit`
+    # line and the top-level `main_app` line was imported by main_app.
+    after_streamlit = False
+    imported, main_app_ms = [], None
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        is_top_level = len(indent) == 1
+        if is_top_level and module == "streamlit":
+            after_streamlit = True
+            continue
+        if not after_streamlit:
+            continue
+        if is_top_level and module == "main_app":
+            main_app_ms = int(cumulative_us) / 1000
+            break
+        imported.append((module, int(self_us) / 1000))
+
+    if main_app_ms is None:
+        raise RuntimeError("main_app did not appear in the -X importtime output")
+    return main_app_ms, imported
+
+
+def check_budget(budget_ms=LOGIN_IMPORT_BUDGET_MS, repeat=3):
+    """
+    Measures `repeat` fresh interpreters and returns (median ms, modules imported by main_app,
+    [failure messages]). Raises RuntimeError if main_app cannot be imported.
+    """
+    runs = [measure_once() for _ in range(max(1, repeat))]
+    median_ms = statistics.median(ms for ms, _ in runs)
+    imported = runs[-1][1]
+
+    failures = []
+    if median_ms > budget_ms:
+        failures.append(f"import time {median_ms:.1f} ms exceeds the {budget_ms:.0f} ms budget")
+    leaked = sorted({module.split('.')[0] for module, _ in imported} & set(DEFERRED_MODULES))
+    if leaked:
+        failures.append(f"dashboard-only modules imported at startup: {', '.join(leaked)}")
+    return median_ms, imported, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enforce the login page's cold-start import budget.")
+    parser.add_argument("--budget-ms", type=float, default=LOGIN_IMPORT_BUDGET_MS,
+                        help="Maximum import time of main_app on top of streamlit.")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters to measure (median is used).")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list.")
+    args = parser.parse_args(argv)
+
+    try:
+        median_ms, imported, failures = check_budget(args.budget_ms, args.repeat)
+    except RuntimeError as e:
+        print(f"Could not import main_app: {e}", file=sys.stderr)
+        return 2
+
+    print(f"main_app import (excluding streamlit): {median_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"{len(imported)} modules imported by main_app; slowest (self time):")
+    for module, ms in sorted(imported, key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {ms:>8.1f} ms  {module}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Headless bulk ingestion of resumes or JDs from a directory.
+
+Usage:
+    python ingest_cli.py resumes ./resume_dump --output parsed_resumes.jsonl
+    python ingest_cli.py jds ./jd_folder --output jds.jsonl --workers 2
+
+The output JSONL file doubles as the checkpoint: every completed file is appended (and
+flushed) as soon as it finishes, and files whose content hash is already in the output are
+skipped on the next run. A crash or a rate-limit stop therefore resumes where it left off.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+
+from resume_ingestion import (
+    iter_directory_files,
+    run_ingestion,
+    DEFAULT_MAX_WORKERS,
+    SUPPORTED_RESUME_EXTENSIONS,
+)
+
+JD_EXTENSIONS = ('.pdf', '.txt', '.docx')
+RATE_LIMIT_MARKERS = ('rate limit', 'rate_limit', '429', 'too many requests')
+
+
+# --- Utility Functions ---
+
+def estimate_tokens(text):
+    """Rough token estimate (~4 characters per token) used for throughput reporting."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def load_checkpoint(output_path):
+    """Reads the content hashes of already completed files from the output JSONL file."""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partially written last line from a crash; the file will be redone
+                continue
+            if record.get('content_hash'):
+                completed.add(record['content_hash'])
+    return completed
+
+
+def is_rate_limited(error_text):
+    """Checks whether an LLM error message indicates the API rate limit was hit."""
+    error_text = str(error_text).lower()
+    return any(marker in error_text for marker in RATE_LIMIT_MARKERS)
+
+
+def describe_llm_error(error):
+    """Error detail for a failed LLM call: the exception type, the HTTP status code if any, and its message."""
+    status_code = getattr(error, 'status_code', None)
+    status = f", HTTP {status_code}" if status_code else ""
+    return f"{type(error).__name__}{status}: {error}"
+
+
+def process_resume(file_name, data):
+    """Extracts and parses one resume with the admin pipeline."""
+    from document_extraction import parse_resume_bytes
+    return parse_resume_bytes(file_name, data)
+
+
+def process_jd(file_name, data):
+    """Extracts one JD and its metadata with the admin pipeline."""
+    from io import BytesIO
+    from document_extraction import extract_content, request_jd_metadata, get_file_type
+
+    jd_text = extract_content(get_file_type(file_name), BytesIO(data))
+    if jd_text.startswith("Error") or jd_text.startswith("Fatal"):
+        return {"error": jd_text, "name": file_name}
+
+    try:
+        metadata = request_jd_metadata(jd_text)
+    except Exception as e:
+        # The real error (e.g. "RateLimitError, HTTP 429: ...") decides whether the run stops
+        return {"error": f"JD metadata extraction failed ({describe_llm_error(e)})", "name": file_name}
+
+    return {"name": os.path.basename(file_name), "content": jd_text, **metadata}
+
+
+# --- CLI ---
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Bulk-load resumes or JDs from a directory without the Streamlit UI.")
+    parser.add_argument("kind", choices=["resumes", "jds"], help="What the directory contains.")
+    parser.add_argument("directory", help="Directory to walk recursively.")
+    parser.add_argument("--output", default=None, help="JSONL file for results and checkpointing (default: <kind>_ingested.jsonl).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Files processed concurrently.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"Error: '{args.directory}' is not a directory.", file=sys.stderr)
+        return 2
+
+    output_path = args.output or f"{args.kind}_ingested.jsonl"
+    completed = load_checkpoint(output_path)
+    if completed:
+        print(f"Resuming: {len(completed)} file(s) already processed in {output_path}.")
+
+    if args.kind == "resumes":
+        process_fn, extensions = process_resume, SUPPORTED_RESUME_EXTENSIONS
+    else:
+        process_fn, extensions = process_jd, JD_EXTENSIONS
+
+    stop_event = threading.Event()
+    counters = {"parsed": 0, "skipped": 0, "failed": 0, "tokens": 0}
+
+    with open(output_path, 'a', encoding='utf-8') as out:
+
+        def on_result(row, result):
+            if row['status'] != 'parsed':
+                if is_rate_limited(row['detail']):
+                    stop_event.set()
+                return
+
+            text = result.get('full_text') or result.get('content', '')
+            counters['tokens'] += estimate_tokens(text) + estimate_tokens(json.dumps(result.get('parsed', {})))
+
+            record = {"file": row['file'], "content_hash": row['content_hash'], **result}
+            out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
+
+        def on_progress(done, total, file_name):
+            print(f"[{done}] {file_name}", flush=True)
+
+        started = time.perf_counter()
+        try:
+            report, _ = run_ingestion(
+                iter_directory_files(args.directory, allowed_extensions=extensions),
+                process_fn,
+                seen_hashes=completed,
+                max_workers=max(1, args.workers),
+                on_progress=on_progress,
+                on_result=on_result,
+                should_stop=stop_event.is_set,
+                duplicate_detail="Already processed (checkpoint) or duplicate content.",
+            )
+        except KeyboardInterrupt:
+            print("\nInterrupted. Completed files are saved; re-run the same command to resume.", file=sys.stderr)
+            return 130
+        elapsed = time.perf_counter() - started
+
+    for row in report:
+        counters[row['status']] = counters.get(row['status'], 0) + 1
+        if row['status'] == 'failed':
+            print(f"FAILED {row['file']}: {row['detail']}", file=sys.stderr)
+
+    minutes = max(elapsed / 60, 1e-9)
+    print("---")
+    print(f"Parsed: {counters['parsed']} | Skipped: {counters['skipped']} | Failed: {counters['failed']} | Time: {elapsed:.1f}s")
+    print(f"Throughput: {counters['parsed'] / minutes:.1f} files/min | ~{counters['tokens'] / minutes:.0f} tokens/min (estimated)")
+    print(f"Results: {output_path}")
+
+    if stop_event.is_set():
+        print("Stopped early: the LLM API rate limit was hit. Re-run the same command later to resume.", file=sys.stderr)
+        return 75
+    return 1 if counters['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import os
+import re
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from resume_retrieval import get_resume_index, chunker_for, tokenize
+
+# -------------------------
+# INTERVIEW SCORING CONFIGURATION
+# -------------------------
+
+SCORING_MAX_WORKERS = int(os.getenv('PRAGYAN_SCORING_MAX_WORKERS', '4'))
+# Resume/JD excerpts sent with each question
+SCORING_CONTEXT_TOP_K = 2
+SCORING_CONTEXT_TOKEN_BUDGET = int(os.getenv('PRAGYAN_SCORING_CONTEXT_TOKENS', '300'))
+
+SCORE_PATTERN = re.compile(r"score\W{0,4}(\d+(?:\.\d+)?)\s*/\s*10", re.IGNORECASE)
+
+
+# --- Utility Functions ---
+
+def question_text(item):
+    return str(item['question'].replace(f"({item['level']})", '').strip())
+
+
+def answer_key(item, context):
+    """Identifies a scored answer, so unchanged answers are not re-scored on the next submit."""
+    raw = f"{item['question']}\n{item['answer']}\n{hashlib.sha256((context or '').encode('utf-8')).hexdigest()}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def relevant_context(item, context):
+    """
+    The resume/JD excerpts most relevant to one question and its answer. A JD has no '## ' sections,
+    so it is chunked by line and sentence instead of coming back whole as a single section.
+    """
+    if not (context or "").strip():
+        return []
+    query = f"{question_text(item)} {item['answer']}"
+    return get_resume_index(context, chunker_for(context)).select_context(query, top_k=SCORING_CONTEXT_TOP_K, token_budget=SCORING_CONTEXT_TOKEN_BUDGET)
+
+
+def build_scoring_prompt(number, item, excerpts):
+    context_block = "\n\n".join(excerpts) or "(no matching context)"
+    return f"""
+    You are an expert interviewer scoring ONE recorded interview answer.
+
+    --- Relevant Resume/JD Context ---
+    {context_block}
+
+    --- Question {number} ({item['level']}) ---
+    {question_text(item)}
+
+    --- Candidate Answer ---
+    {item['answer']}
+
+    Reply in exactly this format:
+    Score: X/10
+    Strengths: one sentence
+    Improvements: one or two specific, actionable sentences
+    """
+
+
+def parse_question_score(text):
+    """Returns the X of 'Score: X/10' (clamped to 0-10), or None if the reply has no score."""
+    match = SCORE_PATTERN.search(text or "")
+    return min(max(float(match.group(1)), 0.0), 10.0) if match else None
+
+
+def heuristic_feedback(item, excerpts):
+    """Offline scoring (mock client): rewards answers of reasonable length that use the context's terms."""
+    answer_terms = set(tokenize(item['answer']))
+    context_terms = set(tokenize(" ".join(excerpts))) | set(tokenize(question_text(item)))
+    words = len(item['answer'].split())
+    score = min(10.0, 2.0 + min(words, 120) / 20 + min(len(answer_terms & context_terms), 8) * 0.5)
+    return (
+        f"Score: {score:.0f}/10\n"
+        f"Strengths: The answer uses {len(answer_terms & context_terms)} terms from the question and context.\n"
+        f"Improvements: {'Add a concrete example with measurable results.' if words < 60 else 'Tighten the answer around the key result.'}"
+    )
+
+
+# --------------------------------------------------
+# CONCURRENT SCORING
+# --------------------------------------------------
+
+def score_answers(qa_list, context, score_fn, previous=None, max_workers=SCORING_MAX_WORKERS):
+    """
+    Scores each answer as its own job and yields results as they complete (not in question order).
+    score_fn(number, item, excerpts) returns the reply text. Answers found unchanged in `previous`
+    ({answer_key: result}) are yielded first without being re-scored.
+    Each result is {'index', 'key', 'question', 'level', 'score', 'feedback'}.
+    """
+    previous = previous or {}
+    pending = []
+    for i, item in enumerate(qa_list):
+        key = answer_key(item, context)
+        if key in previous:
+            yield {**previous[key], "index": i}
+        else:
+            pending.append((i, key, item))
+
+    def run(i, key, item):
+        try:
+            feedback = score_fn(i + 1, item, relevant_context(item, context))
+        except Exception as e:
+            feedback = f"Scoring Error: {e}"
+        return {
+            "index": i, "key": key, "question": question_text(item), "level": item['level'],
+            "score": parse_question_score(feedback), "feedback": feedback,
+        }
+
+    if not pending:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as pool:
+        futures = [pool.submit(run, i, key, item) for i, key, item in pending]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def aggregate_scores(results):
+    """Overall score, per-level averages and the strongest/weakest questions, computed locally."""
+    scored = [r for r in results if r['score'] is not None]
+    by_level = {}
+    for r in scored:
+        by_level.setdefault(r['level'], []).append(r['score'])
+    return {
+        "overall": round(sum(r['score'] for r in scored) / len(scored), 1) if scored else None,
+        "by_level": {level: round(sum(s) / len(s), 1) for level, s in by_level.items()},
+        "strongest": max(scored, key=lambda r: r['score']) if scored else None,
+        "weakest": min(scored, key=lambda r: r['score']) if scored else None,
+        "unscored": len(results) - len(scored),
+    }
+
+
+def format_question_feedback(result):
+    score = f"{result['score']:.0f}/10" if result['score'] is not None else "not scored"
+    return f"**Q{result['index'] + 1} Feedback** ({result['level']}, {score})\n\n*{result['question']}*\n\n{result['feedback']}"
+
+
+def format_summary(aggregate):
+    if aggregate['overall'] is None:
+        return "**Overall Score:** not available (no answer could be scored)."
+    lines = [f"**Overall Score: {aggregate['overall']}/10**", "", "**Summary**"]
+    lines += [f"- {level}: {score}/10" for level, score in aggregate['by_level'].items()]
+    lines.append(f"- Strongest answer: Q{aggregate['strongest']['index'] + 1} ({aggregate['strongest']['score']:.0f}/10)")
+    lines.append(f"- Needs the most work: Q{aggregate['weakest']['index'] + 1} ({aggregate['weakest']['score']:.0f}/10)")
+    if aggregate['unscored']:
+        lines.append(f"- {aggregate['unscored']} answer(s) could not be scored.")
+    return "\n".join(lines)
+
+
+def compose_report(results):
+    """Full markdown report: the locally aggregated summary, then feedback per question in order."""
+    ordered = sorted(results, key=lambda r: r['index'])
+    parts = [format_summary(aggregate_scores(ordered))]
+    parts += [format_question_feedback(r) for r in ordered]
+    return "\n\n---\n\n".join(parts)
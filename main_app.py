@@ -1,20 +1,21 @@
 # app.py
 import streamlit as st
-from admin_dashboard import admin_dashboard
-from candidate_dashboard import candidate_dashboard
-from hiring_dashboard import hiring_dashboard
-
-# --------------------------------------------------
-# 🔥 SET YOUR LOGO HERE (GitHub RAW IMAGE LINK)
-# --------------------------------------------------
-LOGO_URL = "https://raw.githubusercontent.com/vivekswamy021/Pragyan_AI_resume/main/pragyan_ai_school_cover.jpg"
+from static_assets import get_asset
 
+# The dashboards (and through them pandas, pdfplumber, python-docx, openpyxl and groq) and
+# the data store are imported where they are first needed, so the login page renders without
+# loading them. import_budget.py checks this.
 
 # --------------------------------------------------
 # 🔥 LOGO FUNCTION (used across all pages)
 # --------------------------------------------------
+# The logo is the local pragyan_ai_school_cover.jpg, resized once into width variants and
+# served from memory (see static_assets.py); it is only fetched from GitHub when the local
+# file is missing and PRAGYAN_OFFLINE_ASSETS=0.
 def show_logo(width=510):
-    st.image(LOGO_URL, width=width)
+    logo = get_asset("logo", width)
+    if logo is not None:
+        st.image(logo, width=width)
 
 
 # ------------------------------
@@ -30,6 +31,7 @@ def initialize_session_state():
 
     if 'logged_in' not in st.session_state: st.session_state.logged_in = False
     if 'user_type' not in st.session_state: st.session_state.user_type = None
+    if 'user_email' not in st.session_state: st.session_state.user_email = None
 
     # Admin Data
     if 'admin_jd_list' not in st.session_state: st.session_state.admin_jd_list = []
@@ -129,6 +131,12 @@ def login_page():
 
                     st.session_state.logged_in = True
                     st.session_state.user_type = user_role
+                    st.session_state.user_email = email.strip().lower()
+
+                    # Restore persisted JDs, resumes, results and statuses instead of re-parsing
+                    from data_store import get_repository, load_session_data
+                    load_session_data(get_repository(), st.session_state, user_role, st.session_state.user_email)
+
                     go_to(f"{user_role}_dashboard")
                     st.rerun()
 
@@ -194,14 +202,17 @@ if __name__ == '__main__':
 
     if st.session_state.logged_in:
         if st.session_state.user_type == "admin":
+            from admin_dashboard import admin_dashboard
             show_logo()  # 🔥 Logo on Admin Dashboard
             admin_dashboard(go_to)
 
         elif st.session_state.user_type == "candidate":
+            from candidate_dashboard import candidate_dashboard
             show_logo()  # 🔥 Logo on Candidate Dashboard
             candidate_dashboard(go_to)
 
         elif st.session_state.user_type == "hiring":
+            from hiring_dashboard import hiring_dashboard
             show_logo()  # 🔥 Logo on Hiring Dashboard
             hiring_dashboard(go_to)
 
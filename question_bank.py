@@ -0,0 +1,108 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# -------------------------
+# QUESTION BANK CONFIGURATION
+# -------------------------
+
+# Generate banks for every resume section and JD in the background as soon as they are loaded
+QUESTION_BANK_PREFETCH = os.getenv('PRAGYAN_QUESTION_BANK_PREFETCH', '1') == '1'
+QUESTION_BANK_WORKERS = int(os.getenv('PRAGYAN_QUESTION_BANK_WORKERS', '2'))
+QUESTION_BANK_MAX_ENTRIES = int(os.getenv('PRAGYAN_QUESTION_BANK_MAX_ENTRIES', '1000'))
+
+
+def question_bank_key(source_type, label, content):
+    """Banks are keyed by what the questions are generated from, so identical sections/JDs share one."""
+    digest = hashlib.sha256(f"{source_type}\n{label}\n{content}".encode('utf-8')).hexdigest()
+    return f"{source_type}:{digest}"
+
+
+# --------------------------------------------------
+# BACKGROUND QUESTION BANK
+# --------------------------------------------------
+
+class QuestionBank:
+    """
+    Process-wide cache of generated interview questions (raw LLM output), filled by a small
+    thread pool. Entries are {'status': 'pending' | 'ready' | 'error', 'raw', 'version'}, where
+    version changes whenever the bank for a key is regenerated.
+    """
+
+    def __init__(self, generate_fn, max_workers=QUESTION_BANK_WORKERS):
+        # generate_fn(source_type, label, content) -> raw question text; must not use st.* (runs off the script thread)
+        self.generate_fn = generate_fn
+        self._entries = OrderedDict()
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="question-bank")
+
+    def _run(self, key, source):
+        try:
+            raw = self.generate_fn(*source)
+            status = "error" if not raw or raw.startswith("Error") else "ready"
+        except Exception as e:
+            raw, status = f"Error generating questions: {e}", "error"
+
+        with self._lock:
+            self._entries[key] = {"status": status, "raw": raw, "version": time.time()}
+            self._entries.move_to_end(key)
+            self._futures.pop(key, None)
+            while len(self._entries) > QUESTION_BANK_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+        return self._entries.get(key)
+
+    def _submit(self, key, source):
+        """Schedules generation of one bank unless it is already queued. Caller holds the lock."""
+        if key in self._futures:
+            return self._futures[key]
+        self._entries[key] = {"status": "pending", "raw": "", "version": None}
+        future = self._futures[key] = self._executor.submit(self._run, key, source)
+        return future
+
+    def prefetch(self, sources):
+        """Queues generation for every (source_type, label, content) without a ready or pending bank."""
+        with self._lock:
+            for source in sources:
+                key = question_bank_key(*source)
+                entry = self._entries.get(key)
+                if entry is None or entry["status"] == "error":
+                    self._submit(key, source)
+
+    def lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry) if entry else None
+
+    def result(self, source, regenerate=False, timeout=None):
+        """
+        Returns the bank for a source, waiting for a queued generation or generating it now when
+        there is none. regenerate=True always asks for a fresh set of questions.
+        """
+        key = question_bank_key(*source)
+        with self._lock:
+            entry = self._entries.get(key)
+            future = self._futures.get(key)
+            if future is None and (regenerate or entry is None or entry["status"] == "error"):
+                future = self._submit(key, source)
+        if future is not None:
+            future.result(timeout=timeout)
+        return self.lookup(key)
+
+
+# --- Bank Access ---
+
+_question_bank = None
+_question_bank_lock = threading.Lock()
+
+
+def get_question_bank(generate_fn):
+    global _question_bank
+    if _question_bank is None:
+        with _question_bank_lock:
+            if _question_bank is None:
+                _question_bank = QuestionBank(generate_fn)
+    return _question_bank
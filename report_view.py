@@ -0,0 +1,52 @@
+import os
+import re
+import streamlit as st
+
+# -------------------------
+# MATCH REPORT RENDERING
+# -------------------------
+
+# Reports listed before "Show more"; each further click lists this many more
+REPORT_PAGE_SIZE = int(os.getenv('PRAGYAN_REPORT_PAGE_SIZE', '10'))
+REPORT_CACHE_ENTRIES = int(os.getenv('PRAGYAN_REPORT_CACHE_ENTRIES', '256'))
+
+
+@st.cache_data(show_spinner=False, max_entries=REPORT_CACHE_ENTRIES)
+def render_report_markdown(analysis):
+    """
+    Cleans an LLM analysis into the markdown shown in a report, cached on the text: blank-line
+    runs are collapsed.
+    """
+    return re.sub(r'\n{3,}', '\n\n', (analysis or "").strip())
+
+
+def _show_more_reports(shown_key, shown):
+    st.session_state[shown_key] = shown
+
+
+def match_report_list(results, key_prefix, title_fn, load_analysis_fn, summary_fn=None, item_key_fn=None):
+    """
+    Lists match reports as expanders: only the first REPORT_PAGE_SIZE are created, with a
+    "Show more" button for the rest. Expander bodies run even while collapsed, so a report's
+    body is loaded and rendered only once its "Show full report" toggle is switched on.
+    """
+    shown_key = f"{key_prefix}_reports_shown"
+    shown = st.session_state.get(shown_key, REPORT_PAGE_SIZE)
+
+    for idx, item in enumerate(results[:shown]):
+        item_key = item_key_fn(item) if item_key_fn else ""
+        with st.expander(title_fn(item)):
+            if summary_fn:
+                summary_fn(item)
+            if st.toggle("Show full report", key=f"{key_prefix}_report_{idx}_{item_key}"):
+                st.markdown(render_report_markdown(load_analysis_fn(item)))
+
+    remaining = len(results) - shown
+    if remaining > 0:
+        st.caption(f"Showing {shown} of {len(results)} reports.")
+        st.button(
+            f"Show {min(REPORT_PAGE_SIZE, remaining)} more",
+            key=f"{key_prefix}_reports_more",
+            on_click=_show_more_reports,
+            args=(shown_key, shown + REPORT_PAGE_SIZE)
+        )
@@ -0,0 +1,206 @@
+"""
+Measures dashboard rerun latency with Streamlit's headless AppTest runner.
+
+Usage:
+    python rerun_benchmark.py                       # all scenarios
+    python rerun_benchmark.py --scenario admin-approve-click --runs 20
+    python rerun_benchmark.py --resumes 1000 --vendors 200
+
+Each scenario renders its dashboard once to warm up, then times `--runs` further reruns
+(full script runs) and reports the median and p95 in milliseconds. Scenarios that name a
+fragment panel also report the median render time of that panel, recorded by
+rerun_timing.timed_fragment: in the browser, an interaction inside the panel reruns only
+the panel, so this is the latency the user sees for that interaction.
+
+The LLM client falls back to the mock when GROQ_API_KEY is not set, and the store falls
+back to the in-memory stand-in when MONGODB_URI is not set, so nothing leaves the process.
+"""
+import sys
+import time
+import argparse
+import statistics
+
+SAMPLE_PARSED_RESUME = {
+    "name": "Benchmark Candidate",
+    "email": "candidate@example.com",
+    "phone": "+91 90000 00000",
+    "summary": "Backend engineer with 6 years of Python, Kubernetes and AWS experience.",
+    "skills": ["Python", "Kubernetes", "AWS", "Docker", "PostgreSQL", "Kafka", "Terraform"],
+    "education": ["B.Tech Computer Science, Example University (2017)"],
+    "experience": [
+        "Senior Engineer, Acme Corp (2021-Present): Led migration to Kubernetes.",
+        "Engineer, Beta Ltd (2018-2021): Built data pipelines with Kafka.",
+    ],
+    "projects": ["Resume parser: LLM-based extraction pipeline."],
+    "certifications": ["AWS Solutions Architect Associate"],
+}
+
+SAMPLE_JD = {
+    "name": "Backend Engineer",
+    "content": "We need a backend engineer with Python, Kubernetes and AWS. 5+ years. " * 20,
+    "role": "Backend Engineer",
+    "job_type": "Full-time",
+    "key_skills": ["Python", "Kubernetes", "AWS"],
+}
+
+CANDIDATE_SCRIPT = """
+from candidate_dashboard import candidate_dashboard
+candidate_dashboard(lambda page: None)
+"""
+
+ADMIN_SCRIPT = """
+from admin_dashboard import admin_dashboard
+admin_dashboard(lambda page: None)
+"""
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+# --- Scenario Setup ---
+
+def candidate_session(nav_mode, active_view=None):
+    """Session state for a logged-in candidate with a parsed resume and one JD loaded."""
+    session = {
+        "logged_in": True,
+        "user_type": "candidate",
+        "user_email": "benchmark@example.com",
+        "candidate_nav_mode": nav_mode,
+        "parsed": dict(SAMPLE_PARSED_RESUME),
+        "current_parsing_source_name": "benchmark_resume.pdf",
+        "full_text": "\n".join(str(v) for v in SAMPLE_PARSED_RESUME.values()) * 20,
+        "candidate_jd_list": [dict(SAMPLE_JD)],
+        "resume_chatbot_history": [
+            {"role": "user" if i % 2 == 0 else "assistant", "content": f"Message {i} about the resume."}
+            for i in range(20)
+        ],
+    }
+    if active_view:
+        session["candidate_active_view"] = active_view
+    return session
+
+
+def seed_admin_store(resume_count, vendor_count):
+    """Fills the process-wide store with synthetic resumes, vendors and one admin JD (once)."""
+    from data_store import get_repository, ADMIN_OWNER
+
+    repo = get_repository()
+    if repo.count_resumes() >= resume_count:
+        return repo
+
+    with repo.batch() as batch:
+        for i in range(resume_count):
+            parsed = dict(SAMPLE_PARSED_RESUME, name=f"Candidate {i:05d}", email=f"candidate{i}@example.com")
+            repo.upsert_resume(
+                {
+                    "name": parsed["name"],
+                    "parsed": parsed,
+                    "full_text": str(parsed) * 5,
+                    "content_hash": f"benchmark-{i}",
+                    "applied_jd": SAMPLE_JD["name"],
+                    "submitted_date": f"2024-01-{i % 28 + 1:02d}",
+                },
+                batch=batch,
+            )
+    for i in range(vendor_count):
+        repo.add_vendor(f"Vendor {i:04d}", {"name": f"Vendor {i:04d}", "domain": "Recruitment"}, "Pending Review")
+    repo.add_jd(ADMIN_OWNER, dict(SAMPLE_JD))
+    return repo
+
+
+def admin_session(resume_count, vendor_count):
+    """Session state for a logged-in admin, hydrated from the seeded store like main_app does."""
+    from data_store import load_session_data
+
+    repo = seed_admin_store(resume_count, vendor_count)
+    session = {"logged_in": True, "user_type": "admin", "user_email": "admin@example.com"}
+    load_session_data(repo, session, "admin")
+    return session
+
+
+def first_approval_row_name():
+    from data_store import get_repository
+    return get_repository().list_resume_page(sort="Newest first", page=0, page_size=1)[0]['name']
+
+
+def click_first_approval(app, run_index):
+    """Alternates Approve/Pending on the first Candidate Approval row."""
+    action = "quick_approve" if run_index % 2 == 0 else "quick_pending"
+    app.button(key=f"{action}_{first_approval_row_name()}_0").click()
+
+
+# name: (script, session factory, fragment panel scope or None, interaction or None)
+def build_scenarios(args):
+    return {
+        "candidate-tabs": (CANDIDATE_SCRIPT, lambda: candidate_session("tabs"), None, None),
+        "candidate-lazy": (CANDIDATE_SCRIPT, lambda: candidate_session("lazy"), None, None),
+        "candidate-lazy-chat": (
+            CANDIDATE_SCRIPT, lambda: candidate_session("lazy", "🤖 Chatbot"), "candidate:resume_chat", None
+        ),
+        "admin-full": (
+            ADMIN_SCRIPT, lambda: admin_session(args.resumes, args.vendors), "admin:approval_row", None
+        ),
+        "admin-approve-click": (
+            ADMIN_SCRIPT, lambda: admin_session(args.resumes, args.vendors), "admin:approval_row", click_first_approval
+        ),
+    }
+
+
+# --- Runner ---
+
+def run_scenario(script, session, runs, panel_scope=None, interaction=None):
+    """Returns (full rerun times, panel render times) in milliseconds."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_string(script, default_timeout=120)
+    for key, value in session.items():
+        app.session_state[key] = value
+    app.run()
+    if app.exception:
+        raise RuntimeError(f"Warm-up run failed: {app.exception[0].message}")
+
+    full_timings = []
+    for run_index in range(runs):
+        if interaction:
+            interaction(app, run_index)
+        started = time.perf_counter()
+        app.run()
+        full_timings.append((time.perf_counter() - started) * 1000)
+
+    panel_timings = []
+    if panel_scope:
+        recorded = app.session_state['rerun_timings'] if 'rerun_timings' in app.session_state else []
+        panel_timings = [entry['ms'] for entry in recorded if entry['scope'] == panel_scope]
+    return full_timings, panel_timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dashboard rerun latency.")
+    parser.add_argument("--runs", type=int, default=10, help="Timed reruns per scenario.")
+    parser.add_argument("--resumes", type=int, default=200, help="Resumes seeded for the admin scenarios.")
+    parser.add_argument("--vendors", type=int, default=50, help="Vendors seeded for the admin scenarios.")
+    parser.add_argument("--scenario", action="append", help="Scenario(s) to run (default: all).")
+    args = parser.parse_args(argv)
+
+    scenarios = build_scenarios(args)
+    unknown = set(args.scenario or ()) - set(scenarios)
+    if unknown:
+        parser.error(f"Unknown scenario(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(scenarios)}")
+
+    print(f"{'scenario':<22} {'median ms':>10} {'p95 ms':>10} {'panel ms':>10} {'runs':>6}")
+    for name in args.scenario or list(scenarios):
+        script, make_session, panel_scope, interaction = scenarios[name]
+        try:
+            full, panel = run_scenario(script, make_session(), args.runs, panel_scope, interaction)
+        except Exception as e:
+            print(f"{name:<22} failed: {e}", file=sys.stderr)
+            continue
+        panel_text = f"{statistics.median(panel):.1f}" if panel else "-"
+        print(f"{name:<22} {statistics.median(full):>10.1f} {_percentile(full, 0.95):>10.1f} {panel_text:>10} {len(full):>6}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
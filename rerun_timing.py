@@ -0,0 +1,50 @@
+import os
+import time
+import functools
+import streamlit as st
+
+# -------------------------
+# RERUN TIMING
+# -------------------------
+
+SHOW_RERUN_TIMING = os.getenv('PRAGYAN_SHOW_RERUN_TIMING', '0') == '1'
+MAX_RERUN_TIMINGS = 50
+
+
+def record_timing(scope, seconds):
+    """Appends a render time to st.session_state.rerun_timings (last 50 kept) for before/after comparisons."""
+    timings = st.session_state.setdefault('rerun_timings', [])
+    timings.append({"scope": scope, "ms": round(seconds * 1000, 1)})
+    del timings[:-MAX_RERUN_TIMINGS]
+    if SHOW_RERUN_TIMING:
+        st.caption(f"⏱️ {scope} rendered in {seconds * 1000:.0f} ms.")
+
+
+def timed_fragment(scope):
+    """
+    Decorator turning a panel into an st.fragment whose (re)renders are timed under `scope`.
+    Interactions inside the panel rerun only the panel; call rerun_panel() after changing
+    state that only the panel shows.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            result = fn(*args, **kwargs)
+            # Not reached when the panel calls st.rerun(); that run is superseded anyway
+            record_timing(scope, time.perf_counter() - started)
+            return result
+        return st.fragment(timed)
+    return decorator
+
+
+def rerun_panel():
+    """
+    Reruns the current panel: st.rerun(scope="fragment") during a fragment rerun, otherwise a full
+    rerun. Streamlit rejects the fragment scope when the panel is running as part of a full run
+    (a click queued behind a full rerun, or AppTest, which always runs the whole script).
+    """
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    st.rerun(scope="fragment" if ctx is not None and ctx.fragment_ids_this_run else "app")
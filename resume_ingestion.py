@@ -0,0 +1,215 @@
+import os
+import hashlib
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# -------------------------
+# BULK INGESTION CONFIGURATION
+# -------------------------
+
+SUPPORTED_RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt', '.json', '.rtf')
+DEFAULT_MAX_WORKERS = 4
+# Archive members larger than this are skipped instead of being read into memory.
+MAX_MEMBER_BYTES = 10 * 1024 * 1024
+READ_CHUNK_BYTES = 256 * 1024
+
+
+# --- Utility Functions ---
+
+def content_hash(data):
+    """Returns the SHA-256 hex digest used to deduplicate file contents."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def _report_row(file_name, status, detail="", digest=None):
+    """Builds a single row of the per-file ingestion report."""
+    return {"file": file_name, "status": status, "detail": detail, "content_hash": digest}
+
+
+def read_limited(stream, max_bytes, chunk_size=READ_CHUNK_BYTES):
+    """
+    Reads a stream in chunks and returns its bytes, or None as soon as more than max_bytes have been
+    read. Sizes declared in a ZIP header are not trusted, so a crafted member or a zip bomb stops here.
+    """
+    chunks, total = [], 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return b"".join(chunks)
+        total += len(chunk)
+        if total > max_bytes:
+            return None
+        chunks.append(chunk)
+
+
+def iter_zip_members(archive, allowed_extensions=SUPPORTED_RESUME_EXTENSIONS, max_member_bytes=MAX_MEMBER_BYTES):
+    """
+    Lazily yields (member_name, data, skip_reason) for every file in an open ZipFile.
+    Only one member is held in memory at a time; nothing is unpacked to disk.
+    """
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+
+        member_name = info.filename
+        base_name = os.path.basename(member_name)
+        # Ignore OS metadata that archivers add to vendor dumps
+        if member_name.startswith('__MACOSX/') or base_name.startswith('.'):
+            continue
+
+        ext = os.path.splitext(base_name)[1].lower()
+        if ext not in allowed_extensions:
+            yield member_name, None, f"Unsupported file type '{ext or 'none'}'."
+            continue
+
+        too_large = f"File is larger than {max_member_bytes // (1024 * 1024)}MB."
+        if info.file_size > max_member_bytes:
+            yield member_name, None, too_large
+            continue
+
+        try:
+            with archive.open(info) as member:
+                data = read_limited(member, max_member_bytes)
+        except (zipfile.BadZipFile, RuntimeError, OSError, EOFError) as e:
+            # RuntimeError is raised for encrypted members
+            yield member_name, None, f"Could not read archive member: {e}"
+            continue
+
+        if data is None:
+            # The header understated the size
+            yield member_name, None, too_large
+            continue
+        yield member_name, data, None
+
+
+def count_zip_members(archive):
+    """Counts the members that iter_zip_members will report on (used for progress totals)."""
+    return sum(
+        1 for info in archive.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith('__MACOSX/')
+        and not os.path.basename(info.filename).startswith('.')
+    )
+
+
+def iter_directory_files(root_dir, allowed_extensions=SUPPORTED_RESUME_EXTENSIONS, max_member_bytes=MAX_MEMBER_BYTES):
+    """Walks a directory tree and lazily yields (relative_path, data, skip_reason) like iter_zip_members."""
+    for dir_path, dir_names, file_names in os.walk(root_dir):
+        dir_names[:] = sorted(d for d in dir_names if not d.startswith('.'))
+        for file_name in sorted(file_names):
+            if file_name.startswith('.'):
+                continue
+
+            full_path = os.path.join(dir_path, file_name)
+            rel_path = os.path.relpath(full_path, root_dir)
+            ext = os.path.splitext(file_name)[1].lower()
+
+            if ext not in allowed_extensions:
+                yield rel_path, None, f"Unsupported file type '{ext or 'none'}'."
+                continue
+
+            try:
+                if os.path.getsize(full_path) > max_member_bytes:
+                    yield rel_path, None, f"File is larger than {max_member_bytes // (1024 * 1024)}MB."
+                    continue
+                with open(full_path, 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                yield rel_path, None, f"Could not read file: {e}"
+                continue
+
+            yield rel_path, data, None
+
+
+def run_ingestion(members, process_fn, seen_hashes=None, max_workers=DEFAULT_MAX_WORKERS, on_progress=None, total=None,
+                  on_result=None, should_stop=None, duplicate_detail="Duplicate of an already loaded resume."):
+    """
+    Runs (name, data, skip_reason) members through dedup -> process_fn with bounded concurrency.
+
+    process_fn(name, data) must return a result dict; a result containing an "error" key is
+    reported as failed. At most 2 * max_workers members are held in memory at once.
+    on_progress(done, total, file_name) and on_result(row, result) are always called from the
+    calling thread. Once should_stop() returns True no new members are scheduled; work already
+    in flight is still collected.
+
+    Returns (report_rows, parsed_results) where parsed_results is a list of (row, result).
+    """
+    seen = set(seen_hashes or ())
+    report = []
+    parsed_results = []
+    in_flight = {}
+    done = 0
+
+    def record(row):
+        nonlocal done
+        report.append(row)
+        done += 1
+        if on_progress:
+            on_progress(done, total, row['file'])
+
+    def collect(futures):
+        for future in futures:
+            name, digest = in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"error": f"Unexpected processing error: {e}"}
+
+            if result.get('error'):
+                row = _report_row(name, "failed", str(result['error']), digest)
+            else:
+                result['content_hash'] = digest
+                row = _report_row(name, "parsed", result.get('name', ''), digest)
+                parsed_results.append((row, result))
+
+            if on_result:
+                on_result(row, result)
+            record(row)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for name, data, skip_reason in members:
+            if should_stop and should_stop():
+                break
+
+            if skip_reason:
+                record(_report_row(name, "skipped", skip_reason))
+                continue
+
+            digest = content_hash(data)
+            if digest in seen:
+                record(_report_row(name, "skipped", duplicate_detail, digest))
+                continue
+            seen.add(digest)
+
+            in_flight[pool.submit(process_fn, name, data)] = (name, digest)
+            del data
+
+            # Bound memory: wait for a slot before reading the next member
+            if len(in_flight) >= max_workers * 2:
+                finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                collect(finished)
+
+        while in_flight:
+            finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            collect(finished)
+
+    return report, parsed_results
+
+
+def ingest_zip_archive(zip_source, process_fn, seen_hashes=None, max_workers=DEFAULT_MAX_WORKERS, on_progress=None):
+    """Streams the members of a ZIP archive (path or file-like object) through run_ingestion."""
+    try:
+        with zipfile.ZipFile(zip_source) as archive:
+            return run_ingestion(
+                iter_zip_members(archive),
+                process_fn,
+                seen_hashes=seen_hashes,
+                max_workers=max_workers,
+                on_progress=on_progress,
+                total=count_zip_members(archive),
+            )
+    except zipfile.BadZipFile as e:
+        name = getattr(zip_source, 'name', str(zip_source))
+        return [_report_row(name, "failed", f"Invalid ZIP archive: {e}")], []
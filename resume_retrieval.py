@@ -0,0 +1,329 @@
+"""
+Per-resume chunk index (lexical BM25) so resume Q&A sends only the relevant excerpts.
+
+Usage:
+    python resume_retrieval.py resume.md                 # retrieval report on the fixed question set
+    python resume_retrieval.py resume.md --compare-llm   # also compare answers with the full-context
+                                                         # baseline (needs GROQ_API_KEY)
+
+The index is built when a resume is parsed and cached by the text's hash, so chat turns only
+score chunks. No embedding model is needed, which keeps it usable offline.
+"""
+import os
+import re
+import sys
+import math
+import hashlib
+import argparse
+import threading
+from collections import Counter, OrderedDict
+
+# -------------------------
+# RETRIEVAL CONFIGURATION
+# -------------------------
+
+CHUNK_MAX_CHARS = int(os.getenv('PRAGYAN_CHUNK_MAX_CHARS', '600'))
+# Plain-text contexts (job descriptions) have no sections, so they are cut into smaller chunks
+PLAIN_CHUNK_MAX_CHARS = int(os.getenv('PRAGYAN_PLAIN_CHUNK_MAX_CHARS', '300'))
+RETRIEVAL_TOP_K = int(os.getenv('PRAGYAN_RETRIEVAL_TOP_K', '4'))
+# Approximate prompt tokens allowed for resume excerpts per question
+RETRIEVAL_TOKEN_BUDGET = int(os.getenv('PRAGYAN_RETRIEVAL_TOKEN_BUDGET', '700'))
+RESUME_INDEX_CACHE_SIZE = 256
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "did", "do", "does", "for", "from", "has", "have",
+    "he", "her", "his", "how", "i", "in", "is", "it", "of", "on", "or", "she", "the", "their", "them",
+    "they", "this", "to", "was", "what", "when", "where", "which", "who", "with", "you", "your",
+    "candidate", "resume", "cv", "any", "me", "tell", "about", "list",
+}
+
+# Question words that should also match the resume's section headings
+QUERY_EXPANSIONS = {
+    "study": "education", "studied": "education", "degree": "education", "college": "education",
+    "university": "education", "graduate": "education", "graduated": "education", "school": "education",
+    "work": "experience", "worked": "experience", "job": "experience", "company": "experience",
+    "employer": "experience", "role": "experience", "years": "experience",
+    "know": "skills", "technologies": "skills", "tools": "skills", "languages": "skills", "stack": "skills",
+    "certified": "certifications", "certificate": "certifications", "certification": "certifications",
+    "built": "projects", "project": "projects",
+    "contact": "email phone", "reach": "email phone", "mail": "email", "number": "phone",
+}
+
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def tokenize(text):
+    tokens = []
+    for token in re.findall(r"[a-z0-9+#.]+", text.lower()):
+        token = token.strip('.')
+        if not token or token in STOPWORDS:
+            continue
+        # Light plural folding so "projects"/"project" and "skills"/"skill" match
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+# --- Chunking ---
+
+def _split_sections(full_text):
+    """Splits compiled resume text on '## Heading' lines into (heading, body) pairs."""
+    sections = []
+    heading, lines = "", []
+    for line in full_text.splitlines():
+        if line.startswith('## '):
+            if any(l.strip() for l in lines):
+                sections.append((heading, "\n".join(lines).strip()))
+            heading, lines = line[3:].strip(), []
+        else:
+            lines.append(line)
+    if any(l.strip() for l in lines):
+        sections.append((heading, "\n".join(lines).strip()))
+    return sections
+
+
+def _split_units(body, max_chars, pattern=r"\n(?=\* )|\n\s*\n"):
+    """Splits text into natural units (bullets/paragraphs); a long one is cut on sentence boundaries."""
+    units = []
+    for part in re.split(pattern, body):
+        part = part.strip()
+        while len(part) > max_chars:
+            cut = part.rfind('. ', 0, max_chars)
+            cut = cut + 1 if cut > max_chars // 2 else max_chars
+            units.append(part[:cut].strip())
+            part = part[cut:].strip()
+        if part:
+            units.append(part)
+    return units
+
+
+def _pack_units(units, max_chars, prefix=""):
+    """Greedily joins consecutive units into chunks of at most ~max_chars."""
+    chunks, current = [], ""
+    for unit in units:
+        if current and len(current) + len(unit) + 1 > max_chars:
+            chunks.append(prefix + current)
+            current = ""
+        current = f"{current}\n{unit}" if current else unit
+    if current:
+        chunks.append(prefix + current)
+    return chunks
+
+
+def chunk_resume(full_text, max_chars=CHUNK_MAX_CHARS):
+    """
+    Returns chunks of at most ~max_chars, each within one section and prefixed with its heading
+    so a chunk read on its own still says what it is (e.g. "Experience: ...").
+    """
+    chunks = []
+    for heading, body in _split_sections(full_text or ""):
+        prefix = f"{heading}:\n" if heading else ""
+        chunks.extend(_pack_units(_split_units(body, max_chars), max_chars, prefix))
+    return chunks
+
+
+def chunk_plain_text(text, max_chars=PLAIN_CHUNK_MAX_CHARS):
+    """
+    Chunks text without '## ' headings (e.g. a pasted job description): every line, bullet or
+    paragraph is a unit, long ones are cut into sentences, and units are packed into small chunks.
+    """
+    return _pack_units(_split_units(text or "", max_chars, pattern=r"\n+|(?<=[.!?])\s+(?=[A-Z])"), max_chars)
+
+
+def chunker_for(text):
+    """chunk_resume for compiled resume text ('## Section' headings), chunk_plain_text otherwise."""
+    return chunk_resume if re.search(r"^## ", text or "", re.MULTILINE) else chunk_plain_text
+
+
+# --------------------------------------------------
+# BM25 CHUNK INDEX
+# --------------------------------------------------
+
+class ResumeChunkIndex:
+    """BM25 index over the chunks of one resume (or, with chunk_plain_text, of any plain text)."""
+
+    def __init__(self, full_text, chunker=chunk_resume):
+        self.chunks = chunker(full_text)
+        self._term_counts = [Counter(tokenize(chunk)) for chunk in self.chunks]
+        self._lengths = [sum(counts.values()) for counts in self._term_counts]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0
+        document_frequency = Counter(term for counts in self._term_counts for term in counts)
+        n = len(self.chunks)
+        self._idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()
+        }
+
+    def _query_terms(self, question):
+        terms = tokenize(question)
+        for term in list(terms):
+            terms.extend(tokenize(QUERY_EXPANSIONS.get(term, "")))
+        return terms
+
+    def search(self, question, top_k=RETRIEVAL_TOP_K):
+        """Returns [(chunk index, score)] of the best-matching chunks, best first (scores > 0 only)."""
+        terms = self._query_terms(question)
+        scores = []
+        for i, counts in enumerate(self._term_counts):
+            score = 0.0
+            length_norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[i] / (self._avg_length or 1))
+            for term in terms:
+                tf = counts.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (BM25_K1 + 1) / (tf + length_norm)
+            if score > 0:
+                scores.append((i, score))
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores[:top_k]
+
+    def select_context(self, question, top_k=RETRIEVAL_TOP_K, token_budget=RETRIEVAL_TOKEN_BUDGET):
+        """
+        Returns the excerpts to send for a question, in resume order, within token_budget. When
+        nothing matches (e.g. "summarise this resume") the opening chunks are sent instead.
+        """
+        ranked = [i for i, _ in self.search(question, top_k)] or list(range(len(self.chunks)))
+        selected, used = [], 0
+        for i in ranked:
+            cost = estimate_tokens(self.chunks[i])
+            if selected and used + cost > token_budget:
+                continue
+            selected.append(i)
+            used += cost
+            if len(selected) >= top_k:
+                break
+        return [self.chunks[i] for i in sorted(selected)]
+
+
+# --- Index Cache ---
+
+_index_cache = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def get_resume_index(full_text, chunker=chunk_resume):
+    """Returns the chunk index of a text, building it once per distinct text and chunker (process-wide)."""
+    key = (hashlib.sha256((full_text or "").encode('utf-8')).hexdigest(), chunker.__name__)
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = ResumeChunkIndex(full_text, chunker)
+    with _index_cache_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > RESUME_INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+# --- Evaluation ---
+
+# (question, heading of the section that holds the answer)
+EVAL_QUESTIONS = [
+    ("What is the candidate's email address?", "Email"),
+    ("What is their phone number?", "Phone"),
+    ("Which programming languages and tools do they know?", "Skills"),
+    ("Where did they study?", "Education"),
+    ("Which companies have they worked at?", "Experience"),
+    ("What projects have they built?", "Projects"),
+    ("Do they hold any certifications?", "Certifications"),
+    ("Summarise the candidate's profile.", "Summary"),
+]
+
+
+def evaluate_retrieval(full_text, parsed_json, questions=EVAL_QUESTIONS, answer_fn=None):
+    """
+    Compares retrieval prompts with the full-context baseline (full text plus parsed JSON) on a
+    fixed question set. Each row has the tokens sent both ways, whether the expected section was
+    retrieved and, when answer_fn(context, question) is given, both answers and their word overlap.
+    """
+    import json
+
+    index = get_resume_index(full_text)
+    baseline_context = f"Resume Text: {full_text}\nParsed Resume Data (JSON): {json.dumps(parsed_json, indent=2)}"
+    rows = []
+    for question, expected_heading in questions:
+        excerpts = index.select_context(question)
+        context = "\n\n".join(excerpts)
+        has_section = any(h.lower() == expected_heading.lower() for h, _ in _split_sections(full_text))
+        row = {
+            "question": question,
+            "baseline_tokens": estimate_tokens(baseline_context),
+            "retrieval_tokens": estimate_tokens(context),
+            "section_retrieved": (
+                any(e.lower().startswith(expected_heading.lower() + ":") for e in excerpts) if has_section else None
+            ),
+        }
+        if answer_fn is not None:
+            baseline_answer = answer_fn(baseline_context, question)
+            retrieval_answer = answer_fn(context, question)
+            a, b = set(tokenize(baseline_answer)), set(tokenize(retrieval_answer))
+            row.update({
+                "baseline_answer": baseline_answer,
+                "retrieval_answer": retrieval_answer,
+                "answer_overlap": round(len(a & b) / len(a | b), 2) if a | b else 1.0,
+            })
+        rows.append(row)
+    return rows
+
+
+def _groq_answer_fn():
+    from groq import Groq
+
+    client = Groq(api_key=os.environ['GROQ_API_KEY'])
+    model = os.getenv('GROQ_MODEL', "llama-3.1-8b-instant")
+
+    def answer(context, question):
+        response = client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": f"Given the following resume information:\n{context}\n"
+                       f"Answer the following question about the resume concisely and directly.\nQuestion: {question}"}],
+            temperature=0,
+        )
+        return response.choices[0].message.content.strip()
+    return answer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate resume retrieval against the full-context baseline.")
+    parser.add_argument("resume", help="Compiled resume text (markdown with '## Section' headings).")
+    parser.add_argument("--parsed-json", help="Parsed resume JSON file (for the baseline prompt size).")
+    parser.add_argument("--compare-llm", action="store_true", help="Also answer each question both ways with Groq.")
+    args = parser.parse_args(argv)
+
+    import json
+
+    with open(args.resume, encoding='utf-8') as f:
+        full_text = f.read()
+    parsed_json = {}
+    if args.parsed_json:
+        with open(args.parsed_json, encoding='utf-8') as f:
+            parsed_json = json.load(f)
+
+    if args.compare_llm and not os.getenv('GROQ_API_KEY'):
+        parser.error("--compare-llm needs GROQ_API_KEY.")
+    rows = evaluate_retrieval(full_text, parsed_json, answer_fn=_groq_answer_fn() if args.compare_llm else None)
+
+    print(f"{'baseline':>9} {'retrieval':>9} {'section':>8}  question")
+    for row in rows:
+        found = {True: "yes", False: "MISSED", None: "-"}[row['section_retrieved']]
+        print(f"{row['baseline_tokens']:>9} {row['retrieval_tokens']:>9} {found:>8}  {row['question']}")
+        if 'answer_overlap' in row:
+            print(f"{'':>29}overlap {row['answer_overlap']:.2f}\n{'':>29}baseline:  {row['baseline_answer']}\n"
+                  f"{'':>29}retrieval: {row['retrieval_answer']}")
+
+    baseline = sum(r['baseline_tokens'] for r in rows)
+    retrieval = sum(r['retrieval_tokens'] for r in rows)
+    print(f"\nContext tokens: {retrieval} vs {baseline} baseline ({100 * (1 - retrieval / max(baseline, 1)):.0f}% fewer)")
+    return 1 if any(r['section_retrieved'] is False for r in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
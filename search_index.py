@@ -0,0 +1,223 @@
+import os
+import re
+import sqlite3
+import threading
+from blob_store import load_field
+
+# -------------------------
+# SEARCH INDEX CONFIGURATION
+# -------------------------
+
+SEARCH_INDEX_PATH = os.getenv('PRAGYAN_SEARCH_INDEX', os.path.join('.pragyan', 'search_index.db'))
+DEFAULT_RESULT_LIMIT = 25
+
+# Indexed columns, in bm25() weight order: matches in skills and the candidate name count the most
+SEARCH_COLUMNS = ("name", "skills", "experience", "education", "summary", "other_fields", "full_text")
+SEARCH_WEIGHTS = (8.0, 6.0, 3.0, 2.0, 3.0, 1.5, 1.0)
+SNIPPET_COLUMN = SEARCH_COLUMNS.index("full_text")
+
+
+# --- Utility Functions ---
+
+def _flatten(value):
+    """Turns a parsed resume field (str, list, dict or nested) into plain indexable text."""
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        return " ".join(_flatten(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return " ".join(_flatten(v) for v in value)
+    return str(value)
+
+
+def _document_key(resume):
+    return resume.get('content_hash') or resume['name']
+
+
+def build_match_query(user_query):
+    """
+    Converts free text like `Kubernetes + "5 years" python OR go` into an FTS5 MATCH expression.
+    Every term must match (AND) unless joined by OR; a trailing * keeps prefix matching.
+    """
+    parts = []
+    for token in re.findall(r'"[^"]+"|\S+', user_query):
+        if token in ('+', '&', 'AND', 'and'):
+            continue
+        if token in ('OR', 'or', '|'):
+            if parts and parts[-1] != 'OR':
+                parts.append('OR')
+            continue
+
+        is_prefix = token.endswith('*')
+        term = token.strip('"').rstrip('*').strip('+')
+        if not term:
+            continue
+        quoted = '"' + term.replace('"', '""') + '"'
+        parts.append(quoted + ('*' if is_prefix else ''))
+
+    while parts and parts[-1] == 'OR':
+        parts.pop()
+    return " ".join(parts)
+
+
+# --------------------------------------------------
+# FTS5 INDEX
+# --------------------------------------------------
+
+class SearchIndex:
+    """Full-text index of resumes (SQLite FTS5, bm25 ranking) maintained alongside the resume store."""
+
+    def __init__(self, path=SEARCH_INDEX_PATH):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS resume_docs (
+                id INTEGER PRIMARY KEY,
+                doc_key TEXT UNIQUE NOT NULL,
+                name TEXT NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5(
+                {", ".join(SEARCH_COLUMNS)},
+                tokenize = 'porter unicode61'
+            );
+            CREATE TABLE IF NOT EXISTS index_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def _row_values(self, resume):
+        parsed = load_field(resume, 'parsed') or {}
+        other = {k: v for k, v in parsed.items() if k not in ('name', 'skills', 'experience', 'education', 'summary')}
+        return (
+            resume['name'],
+            _flatten(parsed.get('skills')),
+            _flatten(parsed.get('experience')),
+            _flatten(parsed.get('education')),
+            _flatten(parsed.get('summary')),
+            _flatten(other),
+            load_field(resume, 'full_text') or "",
+        )
+
+    def add_resumes(self, resumes):
+        """Indexes (or re-indexes) parsed resumes in a single transaction."""
+        with self._lock, self._conn:
+            for resume in resumes:
+                key = _document_key(resume)
+                existing = self._conn.execute("SELECT id FROM resume_docs WHERE doc_key = ?", (key,)).fetchone()
+                if existing:
+                    self._conn.execute("DELETE FROM resume_fts WHERE rowid = ?", (existing[0],))
+                    self._conn.execute("UPDATE resume_docs SET name = ? WHERE id = ?", (resume['name'], existing[0]))
+                    doc_id = existing[0]
+                else:
+                    doc_id = self._conn.execute(
+                        "INSERT INTO resume_docs (doc_key, name) VALUES (?, ?)", (key, resume['name'])
+                    ).lastrowid
+                self._conn.execute(
+                    f"INSERT INTO resume_fts (rowid, {', '.join(SEARCH_COLUMNS)}) VALUES (?{', ?' * len(SEARCH_COLUMNS)})",
+                    (doc_id, *self._row_values(resume))
+                )
+
+    def add_resume(self, resume):
+        self.add_resumes([resume])
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM resume_fts")
+            self._conn.execute("DELETE FROM resume_docs")
+
+    def rebuild(self, resumes):
+        """Replaces the whole index with the given resumes (an iterable, consumed lazily)."""
+        self.clear()
+        batch = []
+        for resume in resumes:
+            batch.append(resume)
+            if len(batch) >= 500:
+                self.add_resumes(batch)
+                batch = []
+        self.add_resumes(batch)
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM resume_docs").fetchone()[0]
+
+    def synced_version(self):
+        """The store pipeline version the index was last rebuilt from, or None if never."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM index_meta WHERE key = 'store_version'").fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self, version):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO index_meta (key, value) VALUES ('store_version', ?)", (version,)
+            )
+
+    def search(self, user_query, limit=DEFAULT_RESULT_LIMIT):
+        """
+        Returns (results, error). Each result is {'name', 'doc_key', 'score', 'snippet'}, best match
+        first; the snippet marks matched terms with ** for markdown highlighting.
+        """
+        match_query = build_match_query(user_query or "")
+        if not match_query:
+            return [], None
+
+        weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+        sql = f"""
+            SELECT d.name, d.doc_key, bm25(resume_fts, {weights}) AS score,
+                   snippet(resume_fts, {SNIPPET_COLUMN}, '**', '**', ' … ', 24) AS text_snippet,
+                   snippet(resume_fts, -1, '**', '**', ' … ', 16) AS best_snippet
+            FROM resume_fts
+            JOIN resume_docs d ON d.id = resume_fts.rowid
+            WHERE resume_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+        """
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, (match_query, limit)).fetchall()
+        except sqlite3.OperationalError as e:
+            return [], f"Invalid search query: {e}"
+
+        return [
+            {
+                "name": name,
+                "doc_key": doc_key,
+                # bm25() is negative with better matches lower; flip it for display
+                "score": round(-score, 3),
+                "snippet": text_snippet if '**' in (text_snippet or '') else best_snippet,
+            }
+            for name, doc_key, score, text_snippet, best_snippet in rows
+        ], None
+
+
+# --- Index Access ---
+
+_search_index = None
+_search_index_lock = threading.Lock()
+
+
+def get_search_index(repo=None):
+    """
+    Returns the process-wide search index. On first use it is rebuilt from `repo` unless it was
+    last synced at the store's current pipeline version; a matching document count is not enough,
+    since replacing or deleting a resume and then adding another leaves the count unchanged.
+    """
+    global _search_index
+    if _search_index is None:
+        with _search_index_lock:
+            if _search_index is None:
+                index = SearchIndex()
+                if repo is not None:
+                    version = repo.pipeline_version()
+                    if index.synced_version() != version:
+                        index.rebuild(repo.iter_resumes_for_index())
+                        index.mark_synced(version)
+                _search_index = index
+    return _search_index
@@ -0,0 +1,407 @@
+import io
+import os
+import sys
+import time
+import uuid
+import shutil
+import pickle
+import hashlib
+import logging
+import threading
+import streamlit as st
+from streamlit.runtime.uploaded_file_manager import UploadedFile
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# UPLOAD MEMORY BUDGETS
+# -------------------------
+
+MAX_UPLOAD_FILE_BYTES = int(os.getenv('PRAGYAN_MAX_UPLOAD_MB', '10')) * 1024 * 1024
+SESSION_UPLOAD_BUDGET_BYTES = int(os.getenv('PRAGYAN_SESSION_UPLOAD_BUDGET_MB', '25')) * 1024 * 1024
+
+
+class MemoryviewReader(io.RawIOBase):
+    """Seekable read-only stream over a memoryview, so parsers can read uploads without copying them."""
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer)
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence value: {whence}")
+
+        if position < 0:
+            raise ValueError("Negative seek position.")
+        self._pos = position
+        return position
+
+    def readinto(self, target):
+        remaining = len(self._view) - self._pos
+        if remaining <= 0:
+            return 0
+        size = min(len(target), remaining)
+        target[:size] = self._view[self._pos:self._pos + size]
+        self._pos += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def open_buffer_stream(data):
+    """Returns a buffered binary stream over bytes or a memoryview without copying the payload."""
+    if isinstance(data, bytes):
+        # BytesIO shares the underlying bytes object until it is written to
+        return io.BytesIO(data)
+    return io.BufferedReader(MemoryviewReader(data))
+
+
+def buffer_to_text(data, encoding='utf-8'):
+    """Decodes bytes or a memoryview into text (str() accepts any buffer, so no intermediate bytes copy)."""
+    return str(data, encoding)
+
+
+# --- Upload Buffer Accounting ---
+
+def _held_upload_buffers():
+    if 'upload_buffer_bytes' not in st.session_state:
+        st.session_state.upload_buffer_bytes = {}
+    return st.session_state.upload_buffer_bytes
+
+
+def _upload_identity(uploaded_file):
+    return getattr(uploaded_file, 'file_id', None) or uploaded_file.name
+
+
+def retained_upload_bytes(exclude=None):
+    """
+    Bytes of uploads this session keeps alive: the files file_uploader widgets retain in session
+    state (they stay in memory until removed from the widget) plus buffers currently being read.
+    `exclude` is the identity of the file about to be charged, so it is not counted twice.
+    """
+    retained = {}
+    for value in list(st.session_state.values()):
+        files = value if isinstance(value, list) else [value]
+        for item in files:
+            if isinstance(item, UploadedFile):
+                retained[_upload_identity(item)] = item.size
+    for identity, size in _held_upload_buffers().items():
+        retained.setdefault(identity, size)
+    retained.pop(exclude, None)
+    return sum(retained.values())
+
+
+def acquire_upload_buffer(uploaded_file):
+    """
+    Returns (memoryview, error_message) for an UploadedFile without copying its contents.
+    Enforces the per-file limit and the per-session budget of upload bytes retained in session state.
+    """
+    size = uploaded_file.size
+    if size > MAX_UPLOAD_FILE_BYTES:
+        return None, f"'{uploaded_file.name}' is {format_bytes(size)}; the limit per file is {format_bytes(MAX_UPLOAD_FILE_BYTES)}."
+
+    identity = _upload_identity(uploaded_file)
+    retained_bytes = retained_upload_bytes(exclude=identity)
+    if retained_bytes + size > SESSION_UPLOAD_BUDGET_BYTES:
+        return None, (
+            f"Session upload budget exceeded: {format_bytes(retained_bytes)} of other uploads retained, "
+            f"{format_bytes(SESSION_UPLOAD_BUDGET_BYTES)} allowed. Remove some files and try again."
+        )
+
+    _held_upload_buffers()[identity] = size
+    st.session_state.upload_bytes_processed = st.session_state.get('upload_bytes_processed', 0) + size
+    return uploaded_file.getbuffer(), None
+
+
+def release_upload_buffer(uploaded_file, buffer):
+    """Releases an upload buffer once its text has been extracted."""
+    if buffer is not None:
+        buffer.release()
+    _held_upload_buffers().pop(_upload_identity(uploaded_file), None)
+
+
+# --- Session Memory Reporting ---
+
+def estimate_size(obj, _seen=None):
+    """Approximate deep size in bytes of a session state value."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, memoryview):
+        try:
+            return sys.getsizeof(obj) + obj.nbytes
+        except ValueError:
+            # Already released
+            return sys.getsizeof(obj)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in obj)
+    elif hasattr(obj, 'getbuffer'):
+        # UploadedFile / BytesIO payloads are not included in getsizeof
+        try:
+            with obj.getbuffer() as view:
+                size += view.nbytes
+        except (BufferError, ValueError, TypeError):
+            pass
+    return size
+
+
+def session_memory_report():
+    """
+    Returns {'total_bytes', 'spilled_bytes', 'by_key': [(key, bytes), ...]} for the current
+    session, largest first. Spilled values count towards spilled_bytes, not total_bytes.
+    """
+    entry = _registry_entry()
+    by_key = sorted(_measure_session_state(entry).items(), key=lambda item: item[1], reverse=True)
+    return {
+        "total_bytes": sum(size for _, size in by_key),
+        "spilled_bytes": sum(value.size for value in entry["spilled"].values()),
+        "by_key": by_key,
+    }
+
+
+def format_bytes(num_bytes):
+    """Formats a byte count for display."""
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f}{unit}" if unit == "B" else f"{num_bytes:.1f}{unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f}GB"
+
+
+# -------------------------
+# SESSION STATE SPILL
+# -------------------------
+
+# Live session state allowed per session before cold values are moved to disk
+SESSION_STATE_CAP_BYTES = int(os.getenv('PRAGYAN_SESSION_STATE_CAP_MB', '20')) * 1024 * 1024
+SPILL_DIR = os.getenv('PRAGYAN_SPILL_DIR', os.path.join('.pragyan', 'session_spill'))
+# Smaller values are not worth a disk round trip
+SPILL_MIN_BYTES = int(os.getenv('PRAGYAN_SPILL_MIN_KB', '64')) * 1024
+# Sessions not seen for this long are dropped from the registry together with their spill files
+SESSION_IDLE_TTL_S = int(os.getenv('PRAGYAN_SESSION_IDLE_TTL_S', '3600'))
+
+
+class SpilledValue:
+    """Placeholder left in session state for a value written to disk by enforce_session_cap."""
+    __slots__ = ("path", "size")
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+
+    def __repr__(self):
+        return f"<spilled to disk: {format_bytes(self.size)}>"
+
+
+# Process-wide, so ops can see every session: session id -> accounting entry
+_session_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _session_id():
+    if 'session_memory_id' not in st.session_state:
+        st.session_state.session_memory_id = uuid.uuid4().hex
+    return st.session_state.session_memory_id
+
+
+def _registry_entry():
+    session_id = _session_id()
+    with _registry_lock:
+        entry = _session_registry.get(session_id)
+        if entry is None:
+            entry = _session_registry[session_id] = {
+                "session_id": session_id,
+                # key -> ((id, len) of the value when measured, bytes); re-measured when either changes
+                "sizes": {},
+                "last_used": {},
+                "spilled": {},
+                "live_bytes": 0,
+                "heaviest_key": None,
+            }
+    entry["user"] = st.session_state.get('user_email')
+    entry["role"] = st.session_state.get('user_type')
+    entry["seen"] = time.time()
+    return entry
+
+
+def _measure_session_state(entry):
+    """Returns {key: bytes} for live session state, re-measuring only values that changed identity or length."""
+    sizes = {}
+    cached = entry["sizes"]
+    for key in list(st.session_state.keys()):
+        key = str(key)
+        try:
+            value = st.session_state[key]
+        except KeyError:
+            continue
+        if isinstance(value, SpilledValue):
+            continue
+        signature = (id(value), len(value) if hasattr(value, '__len__') else None)
+        if key in cached and cached[key][0] == signature:
+            sizes[key] = cached[key][1]
+            continue
+        try:
+            sizes[key] = estimate_size(value)
+        except Exception:
+            continue
+        cached[key] = (signature, sizes[key])
+
+    for key in set(cached) - set(sizes):
+        del cached[key]
+    return sizes
+
+
+def _drop_stale_spills(entry):
+    """Deletes spill files whose key was overwritten or removed since it was spilled."""
+    for key, placeholder in list(entry["spilled"].items()):
+        if st.session_state.get(key) is not placeholder:
+            del entry["spilled"][key]
+            if os.path.exists(placeholder.path):
+                os.remove(placeholder.path)
+
+
+def restore_session_keys(keys, touch=True):
+    """
+    Loads spilled values of `keys` back into session state. Call before code that reads them runs.
+    touch=False leaves the keys' recency (used to pick what to spill next) unchanged.
+    """
+    entry = _registry_entry()
+    _drop_stale_spills(entry)
+    now = time.time()
+    for key in keys:
+        if touch:
+            entry["last_used"][key] = now
+        placeholder = entry["spilled"].pop(key, None)
+        if placeholder is None:
+            continue
+        try:
+            with open(placeholder.path, 'rb') as f:
+                st.session_state[key] = pickle.load(f)
+            os.remove(placeholder.path)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            # The value is lost; remove the placeholder so the dashboard re-initialises it
+            logger.warning("Could not restore spilled session value '%s': %s", key, e)
+            st.warning(f"Part of your session ('{key}') could not be restored and has been reset.")
+            del st.session_state[key]
+
+
+def restore_spilled_values():
+    """
+    Loads every spilled value back into session state, so no code ever reads a SpilledValue.
+    Call once per run before any view renders; it does nothing while nothing is spilled.
+    """
+    entry = _registry_entry()
+    spilled = set(entry["spilled"]) | {
+        str(key) for key in list(st.session_state.keys()) if isinstance(st.session_state.get(key), SpilledValue)
+    }
+    if spilled:
+        restore_session_keys(sorted(spilled), touch=False)
+
+
+def _spill(entry, key):
+    value = st.session_state[key]
+    path = os.path.join(SPILL_DIR, entry["session_id"], hashlib.sha1(key.encode('utf-8')).hexdigest() + ".pkl")
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+        # The value simply stays in memory
+        logger.warning("Could not spill session value '%s': %s", key, e)
+        if os.path.exists(path):
+            os.remove(path)
+        return False
+
+    placeholder = SpilledValue(path, os.path.getsize(path))
+    st.session_state[key] = placeholder
+    entry["spilled"][key] = placeholder
+    return True
+
+
+def enforce_session_cap(spillable_keys=(), active_keys=()):
+    """
+    Updates this session's accounting and, while live state is over SESSION_STATE_CAP_BYTES,
+    spills `spillable_keys` that are not in `active_keys` to disk, least recently used (then
+    largest) first. Call it at the end of a run: spilled keys hold a SpilledValue until
+    restore_spilled_values (or restore_session_keys) runs at the start of the next one.
+    """
+    entry = _registry_entry()
+    _drop_stale_spills(entry)
+    now = time.time()
+    for key in active_keys:
+        entry["last_used"][key] = now
+
+    sizes = _measure_session_state(entry)
+    live_bytes = sum(sizes.values())
+    if live_bytes > SESSION_STATE_CAP_BYTES:
+        active = set(active_keys)
+        candidates = sorted(
+            (key for key in spillable_keys if key in sizes and key not in active and sizes[key] >= SPILL_MIN_BYTES),
+            key=lambda key: (entry["last_used"].get(key, 0), -sizes[key])
+        )
+        for key in candidates:
+            if live_bytes <= SESSION_STATE_CAP_BYTES:
+                break
+            if _spill(entry, key):
+                live_bytes -= sizes.pop(key)
+                entry["sizes"].pop(key, None)
+
+    entry["live_bytes"] = live_bytes
+    entry["heaviest_key"] = max(sizes, key=sizes.get) if sizes else None
+    _prune_idle_sessions()
+
+
+def _prune_idle_sessions():
+    cutoff = time.time() - SESSION_IDLE_TTL_S
+    with _registry_lock:
+        idle = [sid for sid, entry in _session_registry.items() if entry.get("seen", 0) < cutoff]
+        for session_id in idle:
+            del _session_registry[session_id]
+    for session_id in idle:
+        shutil.rmtree(os.path.join(SPILL_DIR, session_id), ignore_errors=True)
+
+
+def list_heaviest_sessions(limit=10):
+    """Rows for the ops view: live sessions in this process by live state size, largest first."""
+    with _registry_lock:
+        entries = list(_session_registry.values())
+    entries.sort(key=lambda entry: entry["live_bytes"], reverse=True)
+    return [
+        {
+            "Session": entry["session_id"][:8],
+            "User": entry.get("user") or "-",
+            "Role": entry.get("role") or "-",
+            "Live State": format_bytes(entry["live_bytes"]),
+            "Spilled": format_bytes(sum(value.size for value in entry["spilled"].values())),
+            "Heaviest Key": entry["heaviest_key"] or "-",
+            "Idle (s)": int(time.time() - entry.get("seen", 0)),
+        }
+        for entry in entries[:limit]
+    ]
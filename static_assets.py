@@ -0,0 +1,129 @@
+"""
+Local static assets (logo and images), resized into width variants once and served from memory.
+
+Usage:
+    python static_assets.py        # pre-build the variants (e.g. in a Docker build step)
+
+At runtime the variants are built on first use if the build step was skipped. Each is encoded
+once and its bytes are kept in memory, so rendering the logo costs no disk or network access.
+"""
+import os
+import io
+import sys
+import threading
+from functools import lru_cache
+
+# -------------------------
+# ASSET CONFIGURATION
+# -------------------------
+
+ASSET_SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_CACHE_DIR = os.getenv('PRAGYAN_ASSET_DIR', os.path.join('.pragyan', 'assets'))
+# Offline mode (the default) never fetches a remote URL, even when a local asset is missing
+ASSETS_OFFLINE = os.getenv('PRAGYAN_OFFLINE_ASSETS', '1') == '1'
+
+# name: (source file in the repo, remote fallback used only when not offline, widths to build)
+ASSETS = {
+    "logo": (
+        "pragyan_ai_school_cover.jpg",
+        "https://raw.githubusercontent.com/vivekswamy021/Pragyan_AI_resume/main/pragyan_ai_school_cover.jpg",
+        (320, 510, 1020),
+    ),
+}
+JPEG_QUALITY = 85
+
+_build_lock = threading.Lock()
+
+
+# --- Variant Building ---
+
+def _variant_path(name, width):
+    source_file = ASSETS[name][0]
+    stem, ext = os.path.splitext(source_file)
+    return os.path.join(ASSET_CACHE_DIR, f"{stem}-{width}w{ext}")
+
+
+def _is_stale(path, source_path):
+    return not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(source_path)
+
+
+def build_variants(name, force=False):
+    """
+    Writes the resized width variants of an asset that are missing or older than the source.
+    Returns the list of paths written. Without Pillow nothing is written and the original is served.
+    """
+    source_file, _, widths = ASSETS[name]
+    source_path = os.path.join(ASSET_SOURCE_DIR, source_file)
+    if not os.path.exists(source_path):
+        return []
+
+    with _build_lock:
+        pending = [w for w in widths if force or _is_stale(_variant_path(name, w), source_path)]
+        if not pending:
+            return []
+        try:
+            from PIL import Image
+        except ImportError:
+            return []
+
+        os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+        written = []
+        with Image.open(source_path) as original:
+            image_format = original.format or "JPEG"
+            rgb = original.convert("RGB")
+            for width in pending:
+                # Never upscale: a variant wider than the source is just the source re-encoded
+                target_width = min(width, original.width)
+                height = round(original.height * target_width / original.width)
+                resized = rgb.resize((target_width, height), Image.LANCZOS)
+
+                buffer = io.BytesIO()
+                resized.save(buffer, format=image_format, quality=JPEG_QUALITY, optimize=True, progressive=True)
+                path = _variant_path(name, width)
+                temp_path = f"{path}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(buffer.getvalue())
+                os.replace(temp_path, path)
+                written.append(path)
+        return written
+
+
+def build_all(force=False):
+    return {name: build_variants(name, force=force) for name in ASSETS}
+
+
+# --- Asset Access ---
+
+def pick_width(name, requested_width):
+    """Smallest built width that covers the requested display width (the largest otherwise)."""
+    widths = sorted(ASSETS[name][2])
+    return next((w for w in widths if w >= requested_width), widths[-1])
+
+
+@lru_cache(maxsize=32)
+def _load_bytes(name, width):
+    source_file = ASSETS[name][0]
+    source_path = os.path.join(ASSET_SOURCE_DIR, source_file)
+    build_variants(name)
+    for path in (_variant_path(name, width), source_path):
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read()
+    return None
+
+
+def get_asset(name, width):
+    """
+    Returns what to pass to st.image for an asset shown at `width` px: the encoded bytes of the
+    closest variant (cached in memory), the remote URL when the asset is missing and offline
+    mode is off, or None.
+    """
+    data = _load_bytes(name, pick_width(name, width))
+    if data is not None:
+        return data
+    return None if ASSETS_OFFLINE else ASSETS[name][1]
+
+
+if __name__ == '__main__':
+    for asset_name, paths in build_all(force='--force' in sys.argv).items():
+        print(f"{asset_name}: {len(paths)} variant(s) written to {ASSET_CACHE_DIR}")
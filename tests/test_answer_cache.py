@@ -0,0 +1,58 @@
+from answer_cache import AnswerCache, document_key, normalize_question
+from data_store import InMemoryDatabase, PortalRepository
+
+JD = document_key("jd", "Senior Data Engineer. Python, Spark. Remote friendly.")
+
+
+def test_normalize_question_ignores_wording_and_synonyms():
+    assert normalize_question("Salary?") == normalize_question("What is the salary")
+    assert normalize_question("how many yrs of python exp") == normalize_question("How many years of Python experience?")
+    assert normalize_question("Is working from home allowed?") == normalize_question("Is remote allowed")
+
+
+def test_rephrased_question_reuses_the_answer():
+    cache = AnswerCache()
+    cache.put(JD, "What is the salary?", "Not stated in the JD.")
+
+    assert cache.get(JD, "salary please") == "Not stated in the JD."
+    assert cache.get(JD, "What is the CTC?") == "Not stated in the JD."
+
+
+def test_near_duplicate_above_threshold_matches():
+    cache = AnswerCache()
+    cache.put(JD, "Which Python and Spark version is required?", "Python 3.10+, Spark 3.")
+
+    # One extra token out of five: Jaccard 0.8
+    assert cache.get(JD, "Which exact Python and Spark version is required?") == "Python 3.10+, Spark 3."
+
+
+def test_different_question_does_not_match():
+    cache = AnswerCache()
+    cache.put(JD, "What is the salary?", "Not stated in the JD.")
+
+    assert cache.get(JD, "What is the notice period?") is None
+    assert cache.get(JD, "What is the salary for the intern role?") is None
+
+
+def test_answers_are_per_document():
+    cache = AnswerCache()
+    cache.put(JD, "Is remote allowed?", "Yes.")
+
+    assert cache.get(document_key("jd", "Another JD"), "Is remote allowed?") is None
+
+
+def test_empty_questions_and_answers_are_not_cached():
+    cache = AnswerCache()
+    cache.put(JD, "?", "Anything")
+    cache.put(JD, "Is remote allowed?", "")
+
+    assert cache.get(JD, "?") is None
+    assert cache.get(JD, "Is remote allowed?") is None
+
+
+def test_answers_are_shared_through_the_store():
+    repo = PortalRepository(InMemoryDatabase())
+    AnswerCache(repo).put(JD, "Is working from home allowed?", "Yes, fully remote.")
+
+    # A fresh cache (another process, or after a restart) loads the stored answers
+    assert AnswerCache(repo).get(JD, "remote allowed?") == "Yes, fully remote."
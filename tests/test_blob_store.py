@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+import blob_store
+
+
+@pytest.fixture(autouse=True)
+def blob_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(blob_store, "BLOB_DIR", str(tmp_path))
+    blob_store.get_blob.cache_clear()
+    yield tmp_path
+    blob_store.get_blob.cache_clear()
+
+
+def test_offloaded_fields_round_trip():
+    doc = {"parsed": {"skills": ["python"] * 200}, "full_text": "x" * 2000, "name": "Alice"}
+    blob_store.offload_fields(doc, ["parsed", "full_text", "name"])
+    assert set(doc) == {"parsed_ref", "full_text_ref", "name"}
+    assert blob_store.load_field(doc, "parsed") == {"skills": ["python"] * 200}
+    assert blob_store.load_field(doc, "full_text") == "x" * 2000
+
+
+def test_corrupt_blob_falls_back_to_default(caplog):
+    # Valid compression around invalid JSON: the decode error must not escape load_field
+    key = blob_store.put_blob(b"{not json")
+    doc = {"parsed_ref": {"blob": key, "format": "json", "size": 9}}
+    assert blob_store.load_field(doc, "parsed", {}) == {}
+    assert "Could not load 'parsed'" in caplog.text
+
+
+def test_truncated_or_missing_blob_falls_back_to_default():
+    key = blob_store.put_blob(b"some resume text" * 100)
+    path = blob_store._blob_path(key)
+    with open(path, "r+b") as f:
+        f.truncate(10)
+    assert blob_store.load_field({"full_text_ref": {"blob": key, "format": "text"}}, "full_text", "") == ""
+
+    os.remove(path)
+    blob_store.get_blob.cache_clear()
+    assert blob_store.load_field({"full_text_ref": {"blob": key, "format": "text"}}, "full_text", "") == ""
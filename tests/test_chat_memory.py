@@ -0,0 +1,21 @@
+from chat_memory import CHAT_RECENT_TURNS, new_chat_memory, update_chat_memory
+
+
+def make_history(turns):
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"What about topic {i}?"})
+        history.append({"role": "assistant", "content": f"Topic {i} uses Python and SQL."})
+    return history
+
+
+def test_failed_summary_falls_back_to_extractive_and_logs(caplog):
+    history = make_history(3 * CHAT_RECENT_TURNS)
+
+    def failing_summary(previous, messages):
+        raise RuntimeError("rate limited")
+
+    memory = update_chat_memory(history, new_chat_memory(), failing_summary)
+    assert memory["summarized"] == len(history) - 2 * CHAT_RECENT_TURNS
+    assert "Q: What about topic 0?" in memory["summary"]
+    assert "Summary update failed" in caplog.text
@@ -0,0 +1,120 @@
+import pytest
+
+import course_plans
+from course_plans import (
+    CoursePlanCache,
+    extract_skill_gaps,
+    fragment_key,
+    get_gap_course_plan,
+    plan_key,
+)
+from data_store import InMemoryDatabase, PortalRepository
+
+ROLE = "Data Engineer"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    cache = CoursePlanCache()
+    monkeypatch.setattr(course_plans, "_course_plan_cache", cache)
+    return cache
+
+
+def fragment(skill, weeks=3):
+    return {"weeks": weeks, "topics": [f"{skill} basics"], "project": f"{skill} project", "certifications": []}
+
+
+class FragmentGenerator:
+    def __init__(self, leave_out=()):
+        self.calls = []
+        self.leave_out = set(leave_out)
+
+    def __call__(self, role, skills):
+        self.calls.append(tuple(skills))
+        return {skill: fragment(skill) for skill in skills if skill not in self.leave_out}
+
+
+def test_extract_skill_gaps_maps_aliases_to_canonical_skills():
+    assert extract_skill_gaps("No Amazon Web Services exposure; limited k8s.") == ("AWS", "Kubernetes")
+    assert extract_skill_gaps("lacks AWS") == ("AWS",)
+    assert extract_skill_gaps("Needs PySpark and Airflow") == ("Data Engineering", "Spark")
+
+
+def test_extract_skill_gaps_ignores_stated_strengths():
+    assert extract_skill_gaps("Strong Python but lacks AWS and Kubernetes experience.") == ("AWS", "Kubernetes")
+    assert extract_skill_gaps("Excellent SQL and Spark skills.") == ()
+
+
+def test_extract_skill_gaps_needs_whole_word_aliases():
+    # "go" and "ml" inside other words, and C#/C++, are not ontology skills
+    assert extract_skill_gaps("Lacks exposure to Django and HTML") == ()
+    assert extract_skill_gaps("No experience with C# or C++") == ()
+
+
+def test_cache_evicts_least_recently_used():
+    cache = CoursePlanCache(max_entries=2)
+    cache.put("plan|a|AWS", "A")
+    cache.put("plan|b|AWS", "B")
+    cache.get("plan|a|AWS")
+    cache.put("plan|c|AWS", "C")
+
+    assert cache.get("plan|a|AWS") == "A"
+    assert cache.get("plan|b|AWS") is None
+
+
+def test_cache_reads_through_the_store():
+    repo = PortalRepository(InMemoryDatabase())
+    CoursePlanCache(repo).put(plan_key(ROLE, ("AWS",)), "Stored plan", ROLE)
+
+    assert CoursePlanCache(repo).get(plan_key(ROLE, ("AWS",))) == "Stored plan"
+
+
+def test_same_gaps_in_other_words_reuse_the_plan():
+    generate = FragmentGenerator()
+
+    plan, source = get_gap_course_plan("No AWS or Kubernetes experience.", ROLE, generate)
+    again, again_source = get_gap_course_plan("Lacks Amazon Web Services and k8s", "data engineer", generate)
+
+    assert source == "generated"
+    assert (again, again_source) == (plan, "cached")
+    assert "AWS" in plan and "Kubernetes" in plan
+    assert generate.calls == [("AWS", "Kubernetes")]
+
+
+def test_new_gap_set_is_composed_from_cached_fragments():
+    generate = FragmentGenerator()
+    get_gap_course_plan("No AWS experience.", ROLE, generate)
+    get_gap_course_plan("Missing Kubernetes.", ROLE, generate)
+
+    plan, source = get_gap_course_plan("Lacks AWS and Kubernetes.", ROLE, generate)
+
+    assert source == "composed"
+    assert generate.calls == [("AWS",), ("Kubernetes",)]
+    assert "Phase 1: Cloud (3 Weeks)" in plan
+    assert "Phase 2: DevOps (3 Weeks)" in plan
+
+
+def test_templated_fragments_are_not_cached(fresh_cache):
+    generate = FragmentGenerator(leave_out={"Kubernetes"})
+
+    plan, _ = get_gap_course_plan("No AWS or Kubernetes experience.", ROLE, generate)
+
+    assert "Kubernetes fundamentals" in plan
+    assert fresh_cache.get(plan_key(ROLE, ("AWS", "Kubernetes"))) is None
+    assert fresh_cache.get(fragment_key(ROLE, "Kubernetes")) is None
+    assert fresh_cache.get(fragment_key(ROLE, "AWS")) == fragment("AWS")
+
+
+def test_gap_text_without_known_skills_is_planned_as_text():
+    calls = []
+
+    def generate_plan(gap_text):
+        calls.append(gap_text)
+        return "Free-form plan"
+
+    first = get_gap_course_plan("Needs better domain knowledge of insurance.", ROLE, generate_plan_fn=generate_plan)
+    second = get_gap_course_plan("needs better insurance domain knowledge", ROLE, generate_plan_fn=generate_plan)
+
+    assert first == ("Free-form plan", "generated")
+    assert second == ("Free-form plan", "cached")
+    assert len(calls) == 1
@@ -0,0 +1,110 @@
+import io
+import zipfile
+
+import pytest
+
+import cover_letters
+from cover_letters import (
+    CoverLetterCache,
+    build_letters_zip,
+    cover_letter_key,
+    generate_letters,
+    resume_digest,
+)
+
+PARSED = {"name": "Asha Rao", "email": "asha@example.com", "skills": ["Python", "Spark"], "experience": ["Acme, 3 years"]}
+JDS = [
+    {"name": "Data Engineer", "role": "Data Engineer", "content": "Python and Spark."},
+    {"name": "ML Engineer", "role": "ML Engineer", "content": "PyTorch."},
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(cover_letters, "_cover_letter_cache", CoverLetterCache())
+
+
+def render_html(letter, filename, title):
+    return f"<h1>{title}</h1><p>{letter}</p>".encode("utf-8")
+
+
+def test_cache_evicts_least_recently_used():
+    cache = CoverLetterCache(max_entries=2)
+    cache.put("a", "Letter A")
+    cache.put("b", "Letter B")
+    cache.get("a")
+    cache.put("c", "Letter C")
+
+    assert cache.get("a") == "Letter A"
+    assert cache.get("b") is None
+    assert cache.get("c") == "Letter C"
+
+
+def test_failed_letters_are_not_cached():
+    cache = CoverLetterCache()
+    cache.put("a", "AI Generation Error: timeout")
+    cache.put("b", "")
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+
+
+def test_cover_letter_key_separates_resume_jd_and_style():
+    digest = resume_digest(PARSED)
+    key = cover_letter_key(digest, "Python and Spark.", "Standard")
+
+    assert key == cover_letter_key(resume_digest(dict(PARSED)), "Python and Spark.", "Standard")
+    assert key != cover_letter_key(digest, "Python and Spark.", "Concise")
+    assert key != cover_letter_key(digest, "PyTorch.", "Standard")
+    assert key != cover_letter_key(resume_digest({**PARSED, "skills": ["Go"]}), "Python and Spark.", "Standard")
+
+
+def test_rerunning_a_batch_only_generates_new_combinations():
+    calls = []
+
+    def generate(jd_content, digest, role, style):
+        calls.append((role, style))
+        return f"Dear hiring manager, {role} ({style})"
+
+    digest = resume_digest(PARSED)
+    first = list(generate_letters(JDS[:1], ["Standard"], digest, generate))
+    second = list(generate_letters(JDS, ["Standard"], digest, generate))
+
+    assert [r["cached"] for r in first] == [False]
+    assert {r["jd_name"]: r["cached"] for r in second} == {"Data Engineer": True, "ML Engineer": False}
+    assert calls == [("Data Engineer", "Standard"), ("ML Engineer", "Standard")]
+
+
+def test_generation_errors_are_reported_per_letter():
+    def generate(jd_content, digest, role, style):
+        if role == "ML Engineer":
+            raise RuntimeError("quota exceeded")
+        return "Dear hiring manager"
+
+    results = {r["jd_name"]: r["letter"] for r in generate_letters(JDS, ["Standard"], resume_digest(PARSED), generate)}
+
+    assert results["Data Engineer"] == "Dear hiring manager"
+    assert results["ML Engineer"].startswith("AI Generation Error")
+
+
+def test_build_letters_zip_skips_failures_and_deduplicates_names():
+    results = [
+        {"jd_name": "Data Engineer", "role": "Data Engineer", "style": "Standard", "letter": "Letter one"},
+        {"jd_name": "Data Engineer", "role": "Data Engineer", "style": "Standard", "letter": "Letter two"},
+        {"jd_name": "ML/AI Engineer", "role": "ML Engineer", "style": "Concise", "letter": "Letter three"},
+        {"jd_name": "Analyst", "role": "Analyst", "style": "Standard", "letter": "AI Generation Error: timeout"},
+    ]
+
+    archive = zipfile.ZipFile(io.BytesIO(build_letters_zip(results, "Asha Rao", render_html)))
+    names = sorted(archive.namelist())
+
+    assert names == [
+        "Asha_Rao_CoverLetter_Data_Engineer_Standard.html",
+        "Asha_Rao_CoverLetter_Data_Engineer_Standard.txt",
+        "Asha_Rao_CoverLetter_Data_Engineer_Standard_2.html",
+        "Asha_Rao_CoverLetter_Data_Engineer_Standard_2.txt",
+        "Asha_Rao_CoverLetter_ML_AI_Engineer_Concise.html",
+        "Asha_Rao_CoverLetter_ML_AI_Engineer_Concise.txt",
+    ]
+    assert archive.read("Asha_Rao_CoverLetter_Data_Engineer_Standard_2.txt") == b"Letter two"
+    assert b"Cover Letter for ML Engineer" in archive.read("Asha_Rao_CoverLetter_ML_AI_Engineer_Concise.html")
@@ -0,0 +1,277 @@
+import pytest
+
+from data_store import (
+    InMemoryCollection,
+    InMemoryDatabase,
+    PortalRepository,
+    WriteOp,
+    get_approved_candidates,
+    pipeline_view,
+)
+
+
+@pytest.fixture
+def collection():
+    coll = InMemoryCollection("items")
+    coll.insert_many([
+        {"name": "a", "status": "Pending", "score": 3, "tags": ["python"]},
+        {"name": "b", "status": "Approved", "score": 7, "tags": ["sql", "python"]},
+        {"name": "c", "status": "Rejected", "score": 5, "tags": []},
+    ])
+    return coll
+
+
+@pytest.fixture
+def repo():
+    pipeline_view.invalidate()
+    return PortalRepository(InMemoryDatabase())
+
+
+def add_resume(repo, name, digest, status="Pending", submitted_date="2024-05-01"):
+    repo.upsert_resume({
+        "name": name,
+        "content_hash": digest,
+        "submitted_date": submitted_date,
+        "applied_jd": "Data Engineer",
+        "full_text": f"{name} resume text",
+        "parsed": {"name": name, "email": f"{digest}@example.com", "education": ["BSc"], "summary": "Engineer"},
+    }, status=status)
+
+
+# --- In-Memory Collection ---
+
+def test_find_filters_sorts_pages_and_projects(collection):
+    rows = list(collection.find({"score": {"$gte": 5}}, {"_id": 0, "name": 1}).sort("score", -1))
+    assert rows == [{"name": "b"}, {"name": "c"}]
+
+    assert [d["name"] for d in collection.find({"tags": "python"})] == ["a", "b"]
+    assert [d["name"] for d in collection.find({"status": {"$in": ["Pending", "Rejected"]}})] == ["a", "c"]
+    assert [d["name"] for d in collection.find({"name": {"$regex": "B", "$options": "i"}})] == ["b"]
+
+    page = list(collection.find({}, {"_id": 0, "name": 1}).sort("name", 1).skip(1).limit(1))
+    assert page == [{"name": "b"}]
+
+    excluded = collection.find_one({"name": "a"}, {"_id": 0, "tags": 0})
+    assert excluded == {"name": "a", "status": "Pending", "score": 3}
+
+
+def test_update_many_and_inc(collection):
+    result = collection.update_many({"tags": "python"}, {"$set": {"flag": True}, "$inc": {"score": 1}})
+    assert result.matched_count == 2
+    assert {d["name"]: d["score"] for d in collection.find({"flag": True})} == {"a": 4, "b": 8}
+
+    collection.update_one({"_id": "counter"}, {"$inc": {"n": 2, "by.x": 1}}, upsert=True)
+    collection.update_one({"_id": "counter"}, {"$inc": {"n": 3}}, upsert=True)
+    assert collection.find_one({"_id": "counter"}) == {"_id": "counter", "n": 5, "by": {"x": 1}}
+
+
+def test_bulk_write_applies_ops_in_order(collection):
+    collection.bulk_write([
+        WriteOp("insert_one", document={"name": "d", "score": 1}),
+        WriteOp("update_one", {"name": "d"}, {"$inc": {"score": 10}}),
+        WriteOp("update_many", {"score": {"$lt": 5}}, {"$set": {"low": True}}),
+        WriteOp("delete_many", {"status": "Rejected"}),
+    ])
+    assert collection.find_one({"name": "d"}, {"_id": 0}) == {"name": "d", "score": 11}
+    assert [d["name"] for d in collection.find({"low": True})] == ["a"]
+    assert collection.count_documents({}) == 3
+
+
+# --- Repository ---
+
+def test_resume_page_and_session_projections(repo):
+    add_resume(repo, "Alice", "h1")
+    add_resume(repo, "Bob", "h2", status="Approved")
+
+    rows = repo.list_resume_page(sort="Name (A-Z)", page=0, page_size=1)
+    assert len(rows) == 1
+    assert set(rows[0]) == {"_id", "name", "status", "applied_jd", "submitted_date", "row"}
+    assert rows[0]["name"] == "Alice"
+    assert rows[0]["row"]["email"] == "h1@example.com"
+    assert repo.list_resume_page(sort="Name (A-Z)", page=1, page_size=1)[0]["name"] == "Bob"
+    assert repo.count_resumes(status="Approved") == 1
+
+    session_rows = repo.list_resumes()
+    assert {"_id", "created_at", "status", "row"}.isdisjoint(session_rows[0])
+    assert session_rows[0]["full_text"] == "Alice resume text"
+
+    assert repo.get_resume_detail(rows[0]["_id"]) == {
+        "parsed": {"name": "Alice", "email": "h1@example.com", "education": ["BSc"], "summary": "Engineer"},
+        "full_text": "Alice resume text",
+    }
+
+
+def test_set_resume_status_only_updates_that_document(repo):
+    add_resume(repo, "Sam Lee", "h1")
+    add_resume(repo, "Sam Lee", "h2")
+    first, second = repo.list_resume_page(sort="Oldest first")
+
+    repo.set_resume_status(first["_id"], "Approved", submitted_date="2024-05-02")
+
+    statuses = {doc["content_hash"]: doc["status"] for doc in repo.resumes.find({}, {"content_hash": 1, "status": 1})}
+    assert statuses == {"h1": "Approved", "h2": "Pending"}
+    stats = repo.get_stats()["resumes"]
+    assert stats["total"] == 2
+    assert stats["by_status"] == {"Pending": 1, "Approved": 1}
+
+
+def test_set_resume_statuses_by_id(repo):
+    add_resume(repo, "Alice", "h1")
+    add_resume(repo, "Bob", "h2")
+    ids = [row["_id"] for row in repo.list_resume_page()]
+    repo.set_resume_statuses([(resume_id, "Rejected", None, None) for resume_id in ids])
+    assert repo.count_resumes(status="Rejected") == 2
+    assert repo.get_stats()["resumes"]["by_status"] == {"Pending": 0, "Rejected": 2}
+
+
+def test_get_approved_candidates_follows_status_changes(repo):
+    add_resume(repo, "Alice", "h1", status="Approved")
+    add_resume(repo, "Bob", "h2")
+    assert [c["name"] for c in get_approved_candidates(repo)] == ["Alice"]
+
+    bob = repo.list_resume_page(name_query="bob")[0]
+    repo.set_resume_status(bob["_id"], "Approved")
+    assert sorted(c["name"] for c in get_approved_candidates(repo)) == ["Alice", "Bob"]
+
+
+def test_unreachable_mongo_falls_back_with_a_warning(monkeypatch, caplog):
+    import data_store
+
+    monkeypatch.setattr(data_store, "MONGODB_URI", "mongodb://127.0.0.1:1")
+    monkeypatch.setattr(data_store, "MONGODB_TIMEOUT_MS", 50)
+    assert data_store._connect_mongo() is None
+    assert "falling back to the in-memory store" in caplog.text
+
+
+def test_load_session_data_hydrates_per_role(repo):
+    from data_store import ADMIN_OWNER, load_session_data
+
+    add_resume(repo, "Alice", "h1", status="Approved")
+    repo.add_jd(ADMIN_OWNER, {"name": "Admin JD", "content": "admin"})
+    repo.add_jd("cand@example.com", {"name": "My JD", "content": "mine"})
+    repo.add_vendor("V1", {"name": "V1"}, "Pending Review")
+    repo.replace_match_results(ADMIN_OWNER, [{"resume_name": "Alice", "jd_name": "Admin JD", "numeric_score": 7}])
+
+    admin = {}
+    load_session_data(repo, admin, "admin", "admin@example.com")
+    assert [jd["name"] for jd in admin["admin_jd_list"]] == ["Admin JD"]
+    assert admin["resumes_to_analyze"] == []
+    assert admin["resume_statuses"] == {"Alice": "Approved"}
+    assert len(admin["vendors"]) == 1
+
+    candidate = {}
+    load_session_data(repo, candidate, "candidate", "cand@example.com")
+    assert set(candidate) == {"candidate_jd_list"}
+    assert [jd["name"] for jd in candidate["candidate_jd_list"]] == ["My JD"]
+
+    hiring = {}
+    load_session_data(repo, hiring, "hiring", "boss@example.com")
+    assert hiring == {}
+
+
+class CallCounter:
+    def __init__(self, target, *names):
+        self.counts = {name: 0 for name in names}
+        for name in names:
+            original = getattr(target, name)
+
+            def counted(*args, _name=name, _original=original, **kwargs):
+                self.counts[_name] += 1
+                return _original(*args, **kwargs)
+            setattr(target, name, counted)
+
+
+def test_bulk_status_changes_read_prior_states_once(repo):
+    for i in range(5):
+        add_resume(repo, f"Candidate {i}", f"h{i}")
+        repo.add_vendor(f"V{i}", {"name": f"V{i}"}, "Pending Review")
+    ids = [row["_id"] for row in repo.list_resume_page()]
+
+    resume_calls = CallCounter(repo.resumes, "find", "find_one", "bulk_write")
+    repo.set_resume_statuses([(resume_id, "Approved", None, None) for resume_id in ids])
+    assert resume_calls.counts == {"find": 1, "find_one": 0, "bulk_write": 1}
+
+    vendor_calls = CallCounter(repo.vendors, "find", "find_one", "bulk_write")
+    repo.set_vendor_statuses({f"V{i}": "Approved" for i in range(5)})
+    assert vendor_calls.counts == {"find": 1, "find_one": 0, "bulk_write": 1}
+
+    stats = repo.get_stats()
+    assert stats["resumes"]["by_status"] == {"Pending": 0, "Approved": 5}
+    assert stats["vendors"]["by_status"] == {"Pending Review": 0, "Approved": 5}
+
+
+def resume_counts_from_docs(repo):
+    counts = {}
+    for doc in repo.resumes.find({}, {"status": 1}):
+        counts[doc["status"]] = counts.get(doc["status"], 0) + 1
+    return counts
+
+
+def test_stale_status_write_is_not_applied_or_counted(repo):
+    add_resume(repo, "Alice", "h1")
+    resume_id = repo.list_resume_page()[0]["_id"]
+    stale = repo.resumes.find_one({"_id": resume_id}, repo.RESUME_STATE_PROJECTION_WITH_ID)
+
+    # Another session approves the resume after `stale` was read
+    repo.set_resume_status(resume_id, "Approved")
+    assert repo._apply_resume_statuses([(stale, repo._resume_status_changes("Approved"))]) == []
+
+    stats = repo.get_stats()["resumes"]
+    assert {k: v for k, v in stats["by_status"].items() if v} == resume_counts_from_docs(repo) == {"Approved": 1}
+    rollups = {(r["status"], r["count"]) for r in repo.list_daily_rollups()}
+    assert rollups == {("Approved", 1)}
+
+
+def test_bulk_status_change_racing_another_session_keeps_counters_exact(repo, monkeypatch):
+    for i in range(3):
+        add_resume(repo, f"Candidate {i}", f"h{i}")
+    ids = [row["_id"] for row in repo.list_resume_page(sort="Oldest first")]
+
+    original_find = repo.resumes.find
+
+    def find_then_concurrent_change(*args, **kwargs):
+        cursor = list(original_find(*args, **kwargs))
+        # Lands between the bulk read and the bulk write
+        monkeypatch.setattr(repo.resumes, "find", original_find)
+        repo.set_resume_status(ids[0], "Rejected")
+        return cursor
+
+    monkeypatch.setattr(repo.resumes, "find", find_then_concurrent_change)
+    repo.set_resume_statuses([(resume_id, "Approved", None, None) for resume_id in ids])
+
+    # The racing resume is retried from its new state, so the last write wins and nothing is double counted
+    assert resume_counts_from_docs(repo) == {"Approved": 3}
+    stats = repo.get_stats()["resumes"]
+    assert stats["total"] == 3
+    assert {k: v for k, v in stats["by_status"].items() if v} == {"Approved": 3}
+    assert sum(r["count"] for r in repo.list_daily_rollups()) == 3
+
+
+def test_vendor_status_write_is_conditional(repo):
+    repo.add_vendor("V1", {"name": "V1"}, "Pending Review")
+    stale = repo.vendors.find_one({"vendor_id": "V1"}, {"_id": 0, "vendor_id": 1, "status": 1})
+    repo.set_vendor_status("V1", "Approved")
+    assert repo._apply_vendor_statuses([(stale, {"status": "Approved"})]) == []
+    assert repo.get_stats()["vendors"]["by_status"] == {"Pending Review": 0, "Approved": 1}
+    assert "status_ops" not in repo.list_vendors()[0]
+
+
+def test_upsert_with_precomputed_row_fields_does_not_read_blobs(repo, monkeypatch):
+    import data_store
+
+    resume = {"name": "Alice", "content_hash": "h1", "parsed_ref": {"blob": "offloaded", "format": "json"}}
+    row = {"email": "alice@example.com", "phone": "N/A", "education_head": "BSc", "summary": None}
+
+    def no_blob_reads(doc, field, default=None):
+        raise AssertionError("the offloaded parsed JSON was read back")
+
+    monkeypatch.setattr(data_store, "load_field", no_blob_reads)
+    repo.upsert_resume(resume, row_fields=row)
+    assert repo.list_resume_page()[0]["row"] == row
+
+
+def test_resume_hashes(repo):
+    add_resume(repo, "Alice", "h1")
+    add_resume(repo, "Bob", "h2")
+    repo.upsert_resume({"name": "No Hash", "parsed": {}})
+    assert repo.resume_hashes() == {"h1", "h2"}
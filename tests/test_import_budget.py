@@ -0,0 +1,16 @@
+import pytest
+
+pytest.importorskip("streamlit")
+
+import import_budget
+
+
+def test_main_app_cold_import_within_budget():
+    median_ms, _, failures = import_budget.check_budget(repeat=3)
+    assert not [f for f in failures if f.startswith("import time")], f"main_app took {median_ms:.1f} ms"
+
+
+def test_login_page_defers_dashboards_and_heavy_dependencies():
+    _, imported, _ = import_budget.check_budget(repeat=1)
+    loaded = {module.split('.')[0] for module, _ in imported}
+    assert not loaded & set(import_budget.DEFERRED_MODULES)
@@ -0,0 +1,88 @@
+import document_extraction
+import ingest_cli
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def failing_metadata(error):
+    def request(jd_text):
+        raise error
+    return request
+
+
+def test_jd_metadata_parse_failure_is_not_a_rate_limit(monkeypatch):
+    monkeypatch.setattr(document_extraction, "request_jd_metadata", failing_metadata(ValueError("no JSON in reply")))
+    result = ingest_cli.process_jd("jd.txt", b"Senior Data Engineer. Python and SQL.")
+    assert "ValueError" in result["error"]
+    assert not ingest_cli.is_rate_limited(result["error"])
+
+
+def test_jd_metadata_rate_limit_is_detected(monkeypatch):
+    monkeypatch.setattr(document_extraction, "request_jd_metadata", failing_metadata(RateLimitError("slow down")))
+    result = ingest_cli.process_jd("jd.txt", b"Senior Data Engineer. Python and SQL.")
+    assert "HTTP 429" in result["error"]
+    assert ingest_cli.is_rate_limited(result["error"])
+
+
+def write_files(directory, contents):
+    for name, text in contents.items():
+        (directory / name).write_text(text)
+
+
+def stub_resume_parser(monkeypatch, fail=()):
+    """Replaces the LLM resume pipeline; returns the list of files it was called with."""
+    calls = []
+
+    def process(file_name, data):
+        calls.append(file_name)
+        if file_name in fail:
+            return {"error": fail[file_name], "name": file_name}
+        return {"name": file_name, "full_text": data.decode(), "parsed": {"name": file_name}}
+
+    monkeypatch.setattr(ingest_cli, "process_resume", process)
+    return calls
+
+
+def test_restart_skips_checkpointed_files(tmp_path, monkeypatch):
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    write_files(resumes, {"a.txt": "Asha, Python", "b.txt": "Ben, SQL"})
+    output = str(tmp_path / "out.jsonl")
+
+    calls = stub_resume_parser(monkeypatch)
+    assert ingest_cli.main(["resumes", str(resumes), "--output", output]) == 0
+    assert sorted(calls) == ["a.txt", "b.txt"]
+    assert len(ingest_cli.load_checkpoint(output)) == 2
+
+    write_files(resumes, {"c.txt": "Chen, Go"})
+    calls = stub_resume_parser(monkeypatch)
+    assert ingest_cli.main(["resumes", str(resumes), "--output", output]) == 0
+    assert calls == ["c.txt"]
+
+
+def test_failed_files_are_retried_on_the_next_run(tmp_path, monkeypatch):
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    write_files(resumes, {"a.txt": "Asha, Python", "b.txt": "Ben, SQL"})
+    output = str(tmp_path / "out.jsonl")
+
+    stub_resume_parser(monkeypatch, fail={"b.txt": "Could not parse the LLM reply"})
+    assert ingest_cli.main(["resumes", str(resumes), "--output", output]) == 1
+
+    calls = stub_resume_parser(monkeypatch)
+    assert ingest_cli.main(["resumes", str(resumes), "--output", output]) == 0
+    assert calls == ["b.txt"]
+
+
+def test_rate_limit_stops_the_run_with_exit_code_75(tmp_path, monkeypatch):
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    write_files(resumes, {f"{i:02d}.txt": f"Candidate {i}" for i in range(20)})
+    output = str(tmp_path / "out.jsonl")
+
+    calls = stub_resume_parser(monkeypatch, fail={"00.txt": "RateLimitError, HTTP 429: slow down"})
+    assert ingest_cli.main(["resumes", str(resumes), "--output", output, "--workers", "1"]) == 75
+    # Only the members already scheduled when the limit was hit are processed
+    assert len(calls) < 20
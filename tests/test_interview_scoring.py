@@ -0,0 +1,33 @@
+from resume_retrieval import chunk_plain_text, chunk_resume, chunker_for
+from interview_scoring import relevant_context
+
+JD = (
+    "Senior Data Engineer\n"
+    "We are a fintech company building real-time payment infrastructure. Our team moves billions of events a day.\n"
+    "Responsibilities:\n"
+    "- Design and operate Kafka streaming pipelines feeding the fraud detection models.\n"
+    "- Own the Airflow batch jobs that load the Snowflake warehouse every night.\n"
+    "- Mentor junior engineers and review their code.\n"
+    "Requirements:\n"
+    "- Five years of Python and SQL in production.\n"
+    "- Experience with Terraform and AWS networking.\n"
+    "Benefits include remote work, a learning budget and private health insurance for the whole family."
+)
+
+
+def test_plain_text_is_chunked_below_section_level():
+    assert chunker_for(JD) is chunk_plain_text
+    chunks = chunk_plain_text(JD, max_chars=120)
+    assert len(chunks) > 3
+    assert all(len(c) <= 200 for c in chunks)
+    assert chunker_for("## Skills\nPython") is chunk_resume
+
+
+def test_relevant_context_returns_matching_jd_excerpt_not_whole_jd():
+    item = {"question": "(Hard) How would you build the Kafka streaming pipeline?", "level": "Hard",
+            "answer": "I would partition Kafka topics by account and consume them with Flink."}
+    excerpts = relevant_context(item, JD)
+    joined = "\n".join(excerpts)
+    assert "Kafka" in joined
+    assert len(joined) < len(JD)
+    assert "health insurance" not in joined
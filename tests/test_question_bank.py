@@ -0,0 +1,84 @@
+import threading
+
+from question_bank import QuestionBank, question_bank_key
+
+SECTION = ("resume", "Experience", "Built Spark pipelines at Acme.")
+JD = ("jd", "Data Engineer", "Python, Spark, Airflow.")
+
+
+class CountingGenerator:
+    def __init__(self, reply="1. Question?", gate=None):
+        self.calls = []
+        self.reply = reply
+        self.gate = gate
+        self._lock = threading.Lock()
+
+    def __call__(self, source_type, label, content):
+        with self._lock:
+            self.calls.append((source_type, label, content))
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        reply = self.reply
+        if isinstance(reply, Exception):
+            raise reply
+        return f"{reply} ({label}, call {len(self.calls)})"
+
+
+def test_question_bank_key_depends_on_the_content():
+    assert question_bank_key(*SECTION) == question_bank_key(*SECTION)
+    assert question_bank_key(*SECTION) != question_bank_key("resume", "Experience", "Different text.")
+    assert question_bank_key(*SECTION).startswith("resume:")
+
+
+def test_result_generates_on_demand_and_is_then_cached():
+    generate = CountingGenerator()
+    bank = QuestionBank(generate)
+
+    first = bank.result(SECTION, timeout=5)
+    second = bank.result(SECTION, timeout=5)
+
+    assert first["status"] == "ready"
+    assert second == first
+    assert generate.calls == [SECTION]
+
+
+def test_prefetch_queues_each_source_once():
+    gate = threading.Event()
+    generate = CountingGenerator(gate=gate)
+    bank = QuestionBank(generate)
+
+    bank.prefetch([SECTION, JD, SECTION])
+    bank.prefetch([SECTION, JD])
+    assert bank.lookup(question_bank_key(*JD))["status"] == "pending"
+
+    gate.set()
+    assert bank.result(SECTION, timeout=5)["status"] == "ready"
+    assert bank.result(JD, timeout=5)["status"] == "ready"
+    assert sorted(generate.calls) == sorted([SECTION, JD])
+
+
+def test_errors_are_reported_and_retried():
+    generate = CountingGenerator(reply="Error: model unavailable")
+    bank = QuestionBank(generate)
+    assert bank.result(SECTION, timeout=5)["status"] == "error"
+
+    generate.reply = RuntimeError("connection reset")
+    failed = bank.result(SECTION, timeout=5)
+    assert failed["status"] == "error"
+    assert "connection reset" in failed["raw"]
+
+    generate.reply = "1. Question?"
+    assert bank.result(SECTION, timeout=5)["status"] == "ready"
+    assert len(generate.calls) == 3
+
+
+def test_regenerate_replaces_the_bank():
+    generate = CountingGenerator()
+    bank = QuestionBank(generate)
+    first = bank.result(SECTION, timeout=5)
+
+    fresh = bank.result(SECTION, regenerate=True, timeout=5)
+
+    assert fresh["raw"] != first["raw"]
+    assert fresh["version"] != first["version"]
+    assert len(generate.calls) == 2
@@ -0,0 +1,82 @@
+import io
+import threading
+import time
+import zipfile
+
+from resume_ingestion import iter_zip_members, read_limited, run_ingestion
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def test_read_limited_stops_past_the_cap():
+    assert read_limited(io.BytesIO(b"x" * 100), 100, chunk_size=7) == b"x" * 100
+    assert read_limited(io.BytesIO(b"x" * 101), 100, chunk_size=7) is None
+
+
+def test_member_with_understated_header_size_is_not_read_whole():
+    with zipfile.ZipFile(make_zip({"bomb.txt": b"0" * 50_000, "ok.txt": b"fine"})) as archive:
+        # A crafted header claims the member is tiny
+        archive.getinfo("bomb.txt").file_size = 10
+        rows = {name: (data, reason) for name, data, reason in iter_zip_members(archive, max_member_bytes=1000)}
+    assert rows["bomb.txt"][0] is None and rows["bomb.txt"][1]
+    assert rows["ok.txt"] == (b"fine", None)
+
+
+def test_oversized_member_is_skipped():
+    with zipfile.ZipFile(make_zip({"big.txt": b"0" * 5000})) as archive:
+        [(name, data, reason)] = list(iter_zip_members(archive, max_member_bytes=1000))
+    assert data is None and "larger than" in reason
+
+
+def test_known_hashes_are_skipped_before_processing():
+    from resume_ingestion import content_hash
+
+    members = [("a.txt", b"alice", None), ("b.txt", b"bob", None), ("c.txt", b"alice", None)]
+    processed = []
+
+    def process(name, data):
+        processed.append(name)
+        return {"name": name}
+
+    report, parsed = run_ingestion(iter(members), process, seen_hashes={content_hash(b"bob")}, max_workers=2)
+    assert processed == ["a.txt"]
+    assert {row["file"]: row["status"] for row in report} == {"a.txt": "parsed", "b.txt": "skipped", "c.txt": "skipped"}
+
+
+def test_concurrency_and_buffered_members_are_bounded():
+    lock = threading.Lock()
+    active, peak_active, peak_buffered = 0, 0, 0
+    read, finished = 0, 0
+
+    def members():
+        nonlocal read, peak_buffered
+        for i in range(24):
+            with lock:
+                read += 1
+                peak_buffered = max(peak_buffered, read - finished)
+            yield f"{i}.txt", f"resume {i}".encode(), None
+
+    def process(name, data):
+        nonlocal active, peak_active, finished
+        with lock:
+            active += 1
+            peak_active = max(peak_active, active)
+        time.sleep(0.005)
+        with lock:
+            active -= 1
+            finished += 1
+        return {"name": name}
+
+    report, parsed = run_ingestion(members(), process, max_workers=2)
+
+    assert len(parsed) == 24
+    assert peak_active <= 2
+    # At most 2 * max_workers members in flight, plus the one just read
+    assert peak_buffered <= 2 * 2 + 1
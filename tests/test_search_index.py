@@ -0,0 +1,111 @@
+import functools
+
+import pytest
+
+import search_index
+from data_store import InMemoryDatabase, PortalRepository
+from search_index import SearchIndex, build_match_query, get_search_index
+
+
+def resume(name, digest, skills, summary="", full_text=""):
+    return {
+        "name": name,
+        "content_hash": digest,
+        "full_text": full_text or f"{name} {' '.join(skills)} {summary}",
+        "parsed": {"name": name, "skills": skills, "summary": summary},
+    }
+
+
+@pytest.fixture
+def index():
+    return SearchIndex(':memory:')
+
+
+@pytest.fixture
+def fresh_index(tmp_path, monkeypatch):
+    """Points get_search_index at an on-disk file and resets the process-wide singleton."""
+    path = str(tmp_path / "search_index.db")
+    monkeypatch.setattr(search_index, "_search_index", None)
+    monkeypatch.setattr(search_index, "SearchIndex", functools.partial(SearchIndex, path))
+    return path
+
+
+def test_build_match_query_ands_terms_and_keeps_phrases():
+    assert build_match_query('Kubernetes + "5 years" python') == '"Kubernetes" "5 years" "python"'
+
+
+def test_build_match_query_or_and_prefix():
+    assert build_match_query("python OR go | rust*") == '"python" OR "go" OR "rust"*'
+
+
+def test_build_match_query_drops_dangling_operators_and_escapes_quotes():
+    assert build_match_query("OR python OR") == '"python"'
+    assert build_match_query('AND + &') == ""
+    assert build_match_query('c"sharp') == '"c""sharp"'
+
+
+def test_search_ranks_skill_matches_above_full_text_mentions(index):
+    index.add_resumes([
+        resume("Asha", "h1", ["Python", "Kubernetes"]),
+        resume("Ben", "h2", ["Excel"], full_text="Ben once attended a Kubernetes meetup"),
+        # Non-matching documents give the term a meaningful bm25 IDF
+        *(resume(f"Other {i}", f"o{i}", ["Accounting"]) for i in range(5)),
+    ])
+
+    results, error = index.search("kubernetes")
+
+    assert error is None
+    assert [r["name"] for r in results] == ["Asha", "Ben"]
+    assert results[0]["score"] > results[1]["score"]
+    assert "**" in results[0]["snippet"]
+
+
+def test_search_requires_every_term(index):
+    index.add_resumes([
+        resume("Asha", "h1", ["Python", "Kubernetes"]),
+        resume("Ben", "h2", ["Python"]),
+    ])
+
+    results, _ = index.search("python kubernetes")
+
+    assert [r["name"] for r in results] == ["Asha"]
+
+
+def test_readding_a_resume_replaces_its_document(index):
+    index.add_resume(resume("Asha", "h1", ["Java"]))
+    index.add_resume(resume("Asha Rao", "h1", ["Go"]))
+
+    assert index.count() == 1
+    assert index.search("java")[0] == []
+    assert [r["name"] for r in index.search("go")[0]] == ["Asha Rao"]
+
+
+def test_get_search_index_rebuilds_when_store_changed_at_same_count(fresh_index):
+    repo = PortalRepository(InMemoryDatabase())
+    repo.upsert_resume(resume("Asha", "h1", ["Java"]))
+    index = get_search_index(repo)
+    assert index.synced_version() == repo.pipeline_version()
+
+    # Replace the only resume: the document count stays at one
+    repo.clear_resumes()
+    repo.upsert_resume(resume("Ben", "h2", ["Rust"]))
+    assert index.count() == repo.count_resumes()
+
+    search_index._search_index = None
+    reopened = get_search_index(repo)
+
+    assert [r["name"] for r in reopened.search("rust")[0]] == ["Ben"]
+    assert reopened.search("java")[0] == []
+    assert reopened.synced_version() == repo.pipeline_version()
+
+
+def test_get_search_index_skips_rebuild_when_version_unchanged(fresh_index, monkeypatch):
+    repo = PortalRepository(InMemoryDatabase())
+    repo.upsert_resume(resume("Asha", "h1", ["Java"]))
+    get_search_index(repo)
+
+    search_index._search_index = None
+    monkeypatch.setattr(SearchIndex, "rebuild", lambda self, resumes: pytest.fail("unexpected rebuild"))
+    reopened = get_search_index(repo)
+
+    assert reopened.count() == 1
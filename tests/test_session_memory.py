@@ -0,0 +1,68 @@
+import pytest
+
+st = pytest.importorskip("streamlit")
+from streamlit.runtime.uploaded_file_manager import UploadedFile, UploadedFileRec
+
+import session_memory
+
+
+def make_upload(file_id, size):
+    rec = UploadedFileRec(file_id=file_id, name=f"{file_id}.txt", type="text/plain", data=b"x" * size)
+    return UploadedFile(rec, None)
+
+
+@pytest.fixture(autouse=True)
+def clean_session_state(monkeypatch):
+    monkeypatch.setattr(session_memory, "SESSION_UPLOAD_BUDGET_BYTES", 25)
+    monkeypatch.setattr(session_memory, "MAX_UPLOAD_FILE_BYTES", 20)
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    yield
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
+
+def test_budget_charges_uploads_retained_by_widgets():
+    files = [make_upload("a", 10), make_upload("b", 10), make_upload("c", 10)]
+    st.session_state.jd_file_uploader_candidate = files
+
+    buffer, error = session_memory.acquire_upload_buffer(files[0])
+    assert buffer is None
+    assert "budget exceeded" in error
+
+
+def test_budget_allows_uploads_within_budget_and_releases():
+    files = [make_upload("a", 10), make_upload("b", 10)]
+    st.session_state.jd_file_uploader_candidate = files
+
+    for upload in files:
+        buffer, error = session_memory.acquire_upload_buffer(upload)
+        assert error is None
+        assert bytes(buffer) == b"x" * 10
+        session_memory.release_upload_buffer(upload, buffer)
+
+    assert st.session_state.upload_buffer_bytes == {}
+    assert st.session_state.upload_bytes_processed == 20
+
+
+def test_per_file_limit():
+    buffer, error = session_memory.acquire_upload_buffer(make_upload("big", 21))
+    assert buffer is None
+    assert "limit per file" in error
+
+
+def test_spilled_values_are_restored_and_corrupt_spills_reset(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_memory, "SPILL_DIR", str(tmp_path))
+    st.session_state.full_text = "resume text " * 100
+    st.session_state.chat_history = [{"q": "hi", "a": "hello"}]
+    entry = session_memory._registry_entry()
+    assert session_memory._spill(entry, "full_text")
+    assert session_memory._spill(entry, "chat_history")
+    assert isinstance(st.session_state.full_text, session_memory.SpilledValue)
+
+    with open(st.session_state.chat_history.path, "wb") as f:
+        f.write(b"\x80")  # truncated pickle
+
+    session_memory.restore_spilled_values()
+    assert st.session_state.full_text == "resume text " * 100
+    assert "chat_history" not in st.session_state